@@ -0,0 +1,862 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks for `pynock` load/save paths, using `dat/recipes.parq`
+scaled up by replicating its rows under distinct node names.
+"""
+
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import cloudpathlib
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import rich.progress
+import typer
+
+from pynock import CompactPartition, GraphRow, ParquetOptions, Partition, PartitionView, ScanOptions, \
+    compact_deltas, load_merged, sort_file_parquet, write_delta
+
+APP = typer.Typer()
+
+
+def scale_table (
+    load_parq: str,
+    scale: int,
+    ) -> pa.Table:
+    """
+Replicate the rows of a NOCK Parquet file `scale` times, suffixing the
+node names in each copy so that the copies remain distinct nodes.
+    """
+    table: pa.Table = pq.read_table(load_parq)
+    copies: typing.List[pa.Table] = []
+
+    for i in range(scale):
+        suffix: pa.Scalar = pa.scalar(f"#{ i }")
+        copy: pa.Table = table
+
+        for col_name in [ "src_name", "dst_name" ]:
+            col_idx: int = copy.schema.get_field_index(col_name)
+
+            copy = copy.set_column(
+                col_idx,
+                col_name,
+                pc.binary_join_element_wise(copy[col_name], suffix, ""),
+            )
+
+        copies.append(copy)
+
+    return pa.concat_tables(copies)
+
+
+def report (
+    label: str,
+    num_rows: int,
+    elapsed: float,
+    ) -> None:
+    """
+Print the throughput for one benchmark run.
+    """
+    print(f"{ label:<32} { num_rows:>10} rows { elapsed:8.3f} sec { num_rows / elapsed:12.0f} rows/sec")
+
+
+def measure (
+    label: str,
+    num_rows: int,
+    func: typing.Callable[[], typing.Any],
+    ) -> None:
+    """
+Report the throughput of a function, then run it again with `tracemalloc`
+to report its peak memory, since tracing slows down allocations.
+    """
+    start: float = time.perf_counter()
+    func()
+    report(label, num_rows, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{ label:<32} { peak / 2**20:10.1f} MB peak")
+
+
+def iter_load_parquet_cells (
+    parq_file: pq.ParquetFile,
+    ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+    """
+The previous per-cell `as_py()` load path, kept as a baseline.
+    """
+    row_num: int = 0
+
+    for batch in range(parq_file.num_row_groups):
+        row_group: pa.Table = parq_file.read_row_group(batch)
+
+        for r_idx in range(row_group.num_rows):
+            row: GraphRow = {}
+
+            for c_idx in range(row_group.num_columns):
+                row[row_group.column_names[c_idx]] = row_group.column(c_idx)[r_idx].as_py()
+
+            yield row_num, row
+            row_num += 1
+
+
+def iter_table_batches (
+    table: pa.Table,
+    ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
+    """
+Iterate through the record batches in a table, along with the row
+number of each batch's first row.
+    """
+    row_num: int = 0
+
+    for batch in table.to_batches():
+        yield row_num, batch
+        row_num += batch.num_rows
+
+
+@APP.command("load-parq")
+def bench_load_parq (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    row_group_size: int = typer.Option(65536, "--row-group-size", help="rows per row group"),
+    ) -> None:
+    """
+Compare the per-cell and columnar Parquet load paths.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+        pq.write_table(table, tmp_parq.name, row_group_size=row_group_size)
+        parq_file: pq.ParquetFile = pq.ParquetFile(tmp_parq.name)
+
+        start: float = time.perf_counter()
+        num_rows: int = sum(1 for _ in iter_load_parquet_cells(parq_file))
+        report("read, per-cell", num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        num_rows = sum(1 for _ in Partition.iter_load_parquet(parq_file))
+        report("read, columnar", num_rows, time.perf_counter() - start)
+
+        part: Partition = Partition(part_id = 0)
+        start = time.perf_counter()
+        part.parse_rows(iter_load_parquet_cells(parq_file))
+        report("parse, per-cell", num_rows, time.perf_counter() - start)
+
+        part = Partition(part_id = 0)
+        start = time.perf_counter()
+        part.parse_batches(part.iter_batch_parquet(parq_file))
+        report("parse, columnar", num_rows, time.perf_counter() - start)
+
+
+@APP.command("from-arrow")
+def bench_from_arrow (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the row-by-row `parse_rows()` builder with the vectorized
+`Partition.from_arrow()` bulk builder.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    part: Partition = Partition(part_id = 0)
+    start: float = time.perf_counter()
+    part.parse_batches(iter_table_batches(table))
+    report("parse_batches", table.num_rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Partition.from_arrow(table, part_id = 0)
+    report("from_arrow", table.num_rows, time.perf_counter() - start)
+
+
+@APP.command("compact")
+def bench_compact (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the memory used by object and compact partitions.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    for part_class in [ Partition, CompactPartition ]:
+        measure(
+            part_class.__name__,
+            table.num_rows,
+            lambda: part_class.from_arrow(table, part_id = 0),  # pylint: disable=W0640
+        )
+
+
+class ListRelPartition (Partition):  # pylint: disable=R0903
+    """
+The previous relation lookup, which scanned the `edge_rels` list, kept
+as a baseline.
+    """
+
+    def get_edge_rel (
+        self,
+        rel_name: str,
+        *,
+        create: bool = False,
+        debug: bool = False,
+        ) -> int:
+        if rel_name not in self.edge_rels:
+            if create:
+                self.edge_rels.append(rel_name)
+            else:
+                return -1
+
+        return self.edge_rels.index(rel_name)
+
+
+@APP.command("load-csv")
+def bench_load_csv (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the `csv` module and `pyarrow.csv` engines for loading CSV.
+    """
+    part: Partition = CompactPartition.from_arrow(scale_table(load_parq, scale), part_id = 0)
+
+    with tempfile.NamedTemporaryFile(suffix=".csv") as tmp_csv:
+        csv_path = cloudpathlib.AnyPath(tmp_csv.name)
+        part.save_file_csv(csv_path)
+        num_rows: int = part.next_node + part.num_edges  # type: ignore
+
+        start: float = time.perf_counter()
+        num_rows = sum(1 for _ in part.iter_load_csv(csv_path))
+        report("read, csv module", num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        sum(batch.num_rows for _, batch in Partition.iter_batch_csv(csv_path))
+        report("read, pyarrow.csv", num_rows, time.perf_counter() - start)
+
+        load_part: Partition = Partition(part_id = 0)
+        start = time.perf_counter()
+        load_part.parse_rows(load_part.iter_load_csv(csv_path))
+        report("parse_rows, csv module", num_rows, time.perf_counter() - start)
+
+        load_part = Partition(part_id = 0)
+        start = time.perf_counter()
+        load_part.parse_batches(load_part.iter_batch_csv(csv_path))
+        report("parse_batches, pyarrow.csv", num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        Partition.from_arrow([ batch for _, batch in Partition.iter_batch_csv(csv_path) ], part_id = 0)
+        report("from_arrow, pyarrow.csv", num_rows, time.perf_counter() - start)
+
+
+@APP.command("edge-rels")
+def bench_edge_rels (
+    *,
+    num_rels: int = typer.Option(5000, "--rels", help="size of the predicate vocabulary"),
+    num_edges: int = typer.Option(200000, "--edges", help="number of edges to create"),
+    ) -> None:
+    """
+Compare list-based and interned relation lookup in `create_edge()`, over
+an ontology-sized predicate vocabulary.
+    """
+    rel_names: typing.List[str] = [
+        f"http://example.org/ontology#pred{ i }"
+        for i in range(num_rels)
+    ]
+
+    for part_class in [ ListRelPartition, Partition ]:
+        part: Partition = part_class(part_id = 0)
+        src_node = part.find_or_create_node("src")
+        dst_node = part.find_or_create_node("dst")
+
+        start: float = time.perf_counter()
+
+        for i in range(num_edges):
+            part.create_edge(src_node, rel_names[i % num_rels], dst_node)
+
+        report(part_class.__name__, num_edges, time.perf_counter() - start)
+
+
+def save_file_parquet_df (
+    part: Partition,
+    save_parq: str,
+    ) -> None:
+    """
+The previous DataFrame-based Parquet save path, kept as a baseline.
+    """
+    table: pa.Table = pa.Table.from_pandas(part.to_df())
+
+    writer = pq.ParquetWriter(save_parq, table.schema)
+    writer.write_table(table)
+    writer.close()
+
+
+@APP.command("save-parq")
+def bench_save_parq (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    batch_size: int = typer.Option(8192, "--batch-size", help="rows per record batch"),
+    ) -> None:
+    """
+Compare the peak memory and throughput of the DataFrame-based and
+streaming Parquet save paths.
+    """
+    part: Partition = CompactPartition.from_arrow(scale_table(load_parq, scale), part_id = 0)
+    num_rows: int = part.next_node + part.num_edges  # type: ignore
+
+    with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+        measure(
+            "save, DataFrame",
+            num_rows,
+            lambda: save_file_parquet_df(part, tmp_parq.name),
+        )
+
+        measure(
+            "save, streaming",
+            num_rows,
+            lambda: part.save_file_parquet(cloudpathlib.AnyPath(tmp_parq.name), batch_size=batch_size),
+        )
+
+
+def save_file_csv_df (
+    part: Partition,
+    save_csv: str,
+    ) -> None:
+    """
+The previous DataFrame-based CSV save path, kept as a baseline.
+    """
+    part.to_df().to_csv(
+        save_csv,
+        index = False,
+        header = True,
+        quoting = csv.QUOTE_NONNUMERIC,
+    )
+
+
+@APP.command("save-csv")
+def bench_save_csv (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the peak memory and throughput of the DataFrame-based and
+streaming CSV save paths.
+    """
+    part: Partition = CompactPartition.from_arrow(scale_table(load_parq, scale), part_id = 0)
+    num_rows: int = part.next_node + part.num_edges  # type: ignore
+
+    with tempfile.NamedTemporaryFile(suffix=".csv") as tmp_csv:
+        measure(
+            "save, DataFrame",
+            num_rows,
+            lambda: save_file_csv_df(part, tmp_csv.name),
+        )
+
+        measure(
+            "save, streaming",
+            num_rows,
+            lambda: part.save_file_csv(cloudpathlib.AnyPath(tmp_csv.name), chunk_size=8192),
+        )
+
+
+@APP.command("to-df")
+def bench_to_df (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare building a DataFrame from a list of row dicts with converting
+through `Partition.to_arrow()`.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    for part_class in [ Partition, CompactPartition ]:
+        part: Partition = part_class.from_arrow(table, part_id = 0)
+        label: str = part_class.__name__
+
+        measure(
+            f"{ label }, row dicts",
+            table.num_rows,
+            lambda: pd.DataFrame(list(part.iter_gen_rows())),  # pylint: disable=W0640
+        )
+
+        measure(
+            f"{ label }, to_arrow",
+            table.num_rows,
+            part.to_arrow,
+        )
+
+        measure(
+            f"{ label }, to_df",
+            table.num_rows,
+            part.to_df,
+        )
+
+
+@APP.command("codecs")
+def bench_codecs (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the file size and read speed of the DataFrame-inferred schema
+with the explicit NOCK schema under different compression codecs.
+    """
+    part: Partition = CompactPartition.from_arrow(scale_table(load_parq, scale), part_id = 0)
+
+    writers: typing.Dict[str, typing.Callable[[str], None]] = {
+        "DataFrame, snappy": lambda path: save_file_parquet_df(part, path),
+    }
+
+    for compression, compression_level in [ ( "snappy", None ), ( "zstd", None ), ( "zstd", 9 ), ( "gzip", None ) ]:
+        options: ParquetOptions = ParquetOptions(
+            compression = compression,
+            compression_level = compression_level,
+        )
+
+        writers[f"NOCK, { compression } { compression_level or '' }"] = \
+            lambda path, options=options: part.save_file_parquet(cloudpathlib.AnyPath(path), options=options)  # type: ignore
+
+    for label, writer in writers.items():
+        with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+            writer(tmp_parq.name)
+            size: int = os.path.getsize(tmp_parq.name)
+
+            start: float = time.perf_counter()
+            num_rows: int = pq.read_table(tmp_parq.name).num_rows
+            elapsed: float = time.perf_counter() - start
+
+            print(f"{ label:<32} { size:>10} bytes { elapsed * 1000.0:8.2f} ms read { num_rows / elapsed:12.0f} rows/sec")
+
+
+@APP.command("nested")
+def bench_nested (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the file size and load speed of the flat and nested row layouts.
+    """
+    part: Partition = CompactPartition.from_arrow(scale_table(load_parq, scale), part_id = 0)
+    num_rows: int = part.next_node + part.num_edges  # type: ignore
+
+    for nested in [ False, True ]:
+        label: str = "nested" if nested else "flat"
+
+        with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+            part.save_file_parquet(cloudpathlib.AnyPath(tmp_parq.name), nested=nested)
+            print(f"{ label:<32} { os.path.getsize(tmp_parq.name):>10} bytes")
+
+            start: float = time.perf_counter()
+            pq.read_table(tmp_parq.name)
+            report(f"read, { label }", num_rows, time.perf_counter() - start)
+
+            load_part: Partition = Partition(part_id = 0)
+            start = time.perf_counter()
+            load_part.parse_batches(load_part.iter_batch_parquet(pq.ParquetFile(tmp_parq.name)))
+            report(f"parse_batches, { label }", num_rows, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Partition.from_arrow(pq.read_table(tmp_parq.name), part_id = 0)
+            report(f"from_arrow, { label }", num_rows, time.perf_counter() - start)
+
+
+@APP.command("props")
+def bench_props (
+    *,
+    num_nodes: int = typer.Option(100000, "--nodes", help="number of nodes"),
+    num_props: int = typer.Option(8, "--props", help="number of properties per node"),
+    ) -> None:
+    """
+Compare loading node properties stored as JSON strings versus Parquet
+maps, on a property-heavy graph.
+    """
+    part: Partition = Partition(part_id = 0)
+
+    for i in range(num_nodes):
+        node = part.find_or_create_node(f"node{ i }")
+        node.prop_map = {
+            f"key{ j }": [ i, f"val{ i }", i / 3.0, i % 2 == 0 ][j % 4]
+            for j in range(num_props)
+        }
+
+    for props_map in [ False, True ]:
+        label: str = "map" if props_map else "JSON"
+
+        with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+            part.save_file_parquet(cloudpathlib.AnyPath(tmp_parq.name), props_map=props_map)
+            table: pa.Table = pq.read_table(tmp_parq.name)
+            print(f"{ label:<32} { os.path.getsize(tmp_parq.name):>10} bytes")
+
+            start: float = time.perf_counter()
+            Partition.decode_props(table["props"])
+            report(f"decode props, { label }", num_nodes, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Partition.from_arrow(table, part_id = 0)
+            report(f"from_arrow, { label }", num_nodes, time.perf_counter() - start)
+
+
+def sort_edges_by_name (
+    part: Partition,
+    ) -> int:
+    """
+The previous sort in `iter_gen_rows(sort=True)`, which looks up and
+compares the dst node name per edge, kept as a baseline.
+    """
+    num_edges: int = 0
+
+    for _, node_id in sorted(part.node_names.items()):
+        for _, edge_list in sorted(part.nodes[node_id].edge_map.items()):
+            num_edges += len(sorted(edge_list, key=lambda e: part.nodes[e.node_id].name))  # pylint: disable=W0640
+
+    return num_edges
+
+
+def sort_edges_by_rank (
+    part: Partition,
+    ) -> int:
+    """
+The sort in `iter_gen_rows(sort=True)`, which ranks the node names once
+then compares integer ranks per edge.
+    """
+    num_edges: int = 0
+    node_iter, node_rank = part._rank_nodes()  # pylint: disable=W0212
+
+    for _, node_id in node_iter:
+        for _, edge_list in sorted(part.nodes[node_id].edge_map.items()):
+            num_edges += len(sorted(edge_list, key=lambda e: node_rank[e.node_id]))  # pylint: disable=W0640
+
+    return num_edges
+
+
+@APP.command("sort")
+def bench_sort (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    run_size: int = typer.Option(10000, "--run-size", help="rows per sorted run, for the external sort"),
+    ) -> None:
+    """
+Compare sorting the generated rows by dst name lookups with sorting by
+node name ranks, then the in-memory and external merge sorts of a file.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+    part: Partition = Partition.from_arrow(table, part_id = 0)
+
+    measure(
+        "sort by name lookups",
+        table.num_rows,
+        lambda: sort_edges_by_name(part),
+    )
+
+    measure(
+        "sort by rank",
+        table.num_rows,
+        lambda: sort_edges_by_rank(part),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "load.parq"
+        save_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "save.parq"
+        pq.write_table(table, load_path.as_posix())
+
+        measure(
+            "iter_gen_rows(sort)",
+            table.num_rows,
+            lambda: sum(1 for _ in part.iter_gen_rows(sort=True)),
+        )
+
+        measure(
+            "load, save_file_parquet(sort)",
+            table.num_rows,
+            lambda: Partition.from_arrow(pq.read_table(load_path.as_posix())).save_file_parquet(save_path, sort=True),
+        )
+
+        measure(
+            "sort_file_parquet, in memory",
+            table.num_rows,
+            lambda: sort_file_parquet([ load_path ], save_path, run_size=table.num_rows + 1),
+        )
+
+        measure(
+            f"sort_file_parquet, { run_size } runs",
+            table.num_rows,
+            lambda: sort_file_parquet([ load_path ], save_path, run_size=run_size),
+        )
+
+
+@APP.command("trusted")
+def bench_trusted (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare loading with pydantic validation of each node and edge, versus
+the trusted-input fast path.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+        pq.write_table(table, tmp_parq.name)
+
+        for trusted in [ False, True ]:
+            label: str = "trusted" if trusted else "validated"
+
+            def _parse_batches (trusted: bool = trusted) -> None:
+                part: Partition = Partition(part_id = 0, trusted = trusted)
+                part.parse_batches(part.iter_batch_parquet(pq.ParquetFile(tmp_parq.name)))
+
+            measure(
+                f"parse_batches, { label }",
+                table.num_rows,
+                _parse_batches,
+            )
+
+            measure(
+                f"from_arrow, { label }",
+                table.num_rows,
+                lambda trusted=trusted: Partition.from_arrow(table, part_id = 0, trusted = trusted),  # type: ignore
+            )
+
+
+@APP.command("progress")
+def bench_progress (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare the overhead of the progress hooks on `parse_rows()`, with the
+previous per-row `rich.progress.track` wrapper as a baseline.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+    rows: typing.List[typing.Tuple[int, GraphRow]] = list(enumerate(table.to_pylist()))
+
+    def _parse (progress: typing.Any) -> None:
+        part: Partition = Partition(part_id = 0, trusted = True)
+        part.parse_rows(iter(rows), progress=progress)
+
+    def _parse_track () -> None:
+        part: Partition = Partition(part_id = 0, trusted = True)
+        part.parse_rows(rich.progress.track(rows, description="parse rows"), progress="off")
+
+    hooks: typing.Dict[str, typing.Callable[[], None]] = {
+        "track per row": _parse_track,
+        "off": lambda: _parse("off"),
+        "rich": lambda: _parse("rich"),
+        "callback": lambda: _parse(lambda metrics: None),
+    }
+
+    for label, func in hooks.items():
+        start: float = time.perf_counter()
+        func()
+        report(f"progress { label }", len(rows), time.perf_counter() - start)
+
+
+@APP.command("row-groups")
+def bench_row_groups (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    row_group_size: int = typer.Option(4096, "--row-group-size", help="rows per row group"),
+    ) -> None:
+    """
+Compare decoding the row groups of one Parquet file sequentially with
+decoding them in a thread pool at 1, 4, and 16 threads, both alone and
+followed by building the partition. The labels show how many threads
+the pool used after capping at the CPU count.
+
+Then append one delta file and repeat at 4 threads, where the merge
+runs on the caller's thread instead of the pool.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+    num_cpus: int = os.cpu_count() or 1
+    print(f"{ num_cpus } CPUs")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part: Partition = CompactPartition.from_arrow(table, part_id = 0)
+        part.save_file_parquet(load_path, batch_size=row_group_size)
+
+        start: float = time.perf_counter()
+
+        for _ in Partition.iter_batch_parquet(pq.ParquetFile(load_path.as_posix())):
+            pass
+
+        report("decode, sequential", table.num_rows, time.perf_counter() - start)
+
+        for max_threads in [ 1, 4, 16 ]:
+            label: str = f"{ max_threads } threads ({ min(max_threads, num_cpus) } used)"
+            start = time.perf_counter()
+
+            for _ in Partition.iter_row_groups(load_path, max_threads=max_threads):
+                pass
+
+            report(f"decode, { label }", table.num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        Partition.from_arrow(pq.read_table(load_path.as_posix(), use_threads=False), part_id = 0)
+        report("load, sequential", table.num_rows, time.perf_counter() - start)
+
+        for max_threads in [ 1, 4, 16 ]:
+            label = f"{ max_threads } threads ({ min(max_threads, num_cpus) } used)"
+            start = time.perf_counter()
+            Partition.load_file_parquet(load_path, max_threads=max_threads, part_id = 0)
+            report(f"load, { label }", table.num_rows, time.perf_counter() - start)
+
+        updates: Partition = Partition(part_id = 0)
+        updates.find_or_create_node(table["src_name"][0].as_py()).prop_map = { "updated": True }
+        write_delta(load_path, updates)
+
+        start = time.perf_counter()
+
+        for _ in Partition.iter_row_groups(load_path, max_threads=4):
+            pass
+
+        report("decode, 1 delta, merged serially", table.num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        Partition.load_file_parquet(load_path, max_threads=4, part_id = 0)
+        report("load, 1 delta, merged serially", table.num_rows, time.perf_counter() - start)
+
+
+@APP.command("scan")
+def bench_scan (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    ) -> None:
+    """
+Compare reading and loading all of the columns with pushing down the
+projection of the topology columns, or a predicate on the node names.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+        part: Partition = CompactPartition.from_arrow(table, part_id = 0)
+        part.save_file_parquet(cloudpathlib.AnyPath(tmp_parq.name))
+        load_paths: typing.List[cloudpathlib.AnyPath] = [ cloudpathlib.AnyPath(tmp_parq.name) ]
+
+        scans: typing.Dict[str, ScanOptions] = {
+            "all columns": ScanOptions(),
+            "topology": ScanOptions(columns=[]),
+            "name prefix": ScanOptions(name_prefix="1"),
+        }
+
+        for label, scan in scans.items():
+            start: float = time.perf_counter()
+            num_rows: int = sum(batch.num_rows for _, batch in Partition.iter_batch_dataset(load_paths, scan=scan))
+            report(f"read, { label }", num_rows, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Partition.load_dataset(load_paths, scan=scan)
+            report(f"load, { label }", num_rows, time.perf_counter() - start)
+
+
+@APP.command("view")
+def bench_view (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    num_lookups: int = typer.Option(1000, "--lookups", help="number of node lookups"),
+    ) -> None:
+    """
+Compare the startup time and memory of a full load with opening a
+memory-mapped `PartitionView`, with or without its sidecar index, then
+the cost of node lookups in a view.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    with tempfile.NamedTemporaryFile(suffix=".parq") as tmp_parq:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_parq.name)
+        CompactPartition.from_arrow(table, part_id = 0).save_file_parquet(load_path, index = True)
+
+        measure("full load", table.num_rows, lambda: Partition.load_file_parquet(load_path, part_id = 0))
+        measure("open view", table.num_rows, lambda: PartitionView(load_path, part_id = 0, index = False))
+        measure("open view, sidecar index", table.num_rows, lambda: PartitionView(load_path, part_id = 0))
+
+        view: PartitionView = PartitionView(load_path, part_id = 0, index = False)
+        stride: int = max(1, view.num_nodes // num_lookups)
+        names: typing.List[str] = view.names[:view.num_nodes:stride][:num_lookups]
+
+        for label in [ "lookup, cold", "lookup, cached" ]:
+            start: float = time.perf_counter()
+
+            for name in names:
+                view.lookup_node(name)
+
+            report(label, len(names), time.perf_counter() - start)
+
+
+@APP.command("delta")
+def bench_delta (
+    *,
+    load_parq: str = typer.Option("dat/recipes.parq", "--file", "-f", help="input Parquet file"),
+    scale: int = typer.Option(100, "--scale", help="number of copies of the input rows"),
+    num_updates: int = typer.Option(1000, "--updates", help="number of nodes to change"),
+    ) -> None:
+    """
+Compare updating a few nodes by a full load-and-save cycle with
+appending a delta file, then the cost of merging on load and of
+compacting the delta.
+    """
+    table: pa.Table = scale_table(load_parq, scale)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        Partition.from_arrow(table, part_id = 0).save_file_parquet(base_path)
+
+        updates: Partition = Partition(part_id = 0)
+
+        for name in pc.unique(table["src_name"]).to_pylist()[:num_updates]:
+            updates.find_or_create_node(name).prop_map = { "updated": True }
+
+        def _rewrite () -> None:
+            part: Partition = Partition.load_file_parquet(base_path, part_id = 0)
+
+            for node in updates.nodes.values():
+                part.lookup_node(node.name).prop_map = node.prop_map  # type: ignore
+
+            part.save_file_parquet(base_path)
+
+        start: float = time.perf_counter()
+        _rewrite()
+        report("load and save", table.num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        write_delta(base_path, updates)
+        report("append delta", num_updates, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        Partition.load_file_parquet(base_path, part_id = 0)
+        report("load, base only", table.num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        load_merged(base_path, part_id = 0)
+        report("load, merged", table.num_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        compact_deltas(base_path)
+        report("compact", table.num_rows, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    APP()
@@ -10,7 +10,8 @@ import cloudpathlib
 import pyarrow.parquet as pq  # type: ignore
 import typer
 
-from pynock import Partition
+from pynock import Graph, Partition, ValidationReport, compact_deltas, list_deltas, load_partition_file, \
+    repartition_files, sort_file_parquet, write_delta
 
 APP = typer.Typer()
 
@@ -25,28 +26,47 @@ def cli_load_parq (
     encoding: str = typer.Option("utf-8", "--encoding", help="output encoding"),
     dump: bool = typer.Option(False, "--dump", help="dump the data, only"),
     sort: bool = typer.Option(False, "--sort", help="sort the output"),
+    trusted: bool = typer.Option(False, "--trusted", help="skip validation, for files already validated"),
+    threads: int = typer.Option(None, "--threads", help="decode the row groups using a pool of threads, capped at the CPU count"),
     debug: bool = False,
     ) -> None:
     """
-Load a Parquet file into a graph partition, optionally converting and
-saving to different formats.
+Load a Parquet file into a graph partition, merging any delta files,
+optionally converting and saving to different formats.
     """
     part: Partition = Partition(
         part_id = 0,
+        trusted = trusted,
     )
 
     parq_file: pq.ParquetFile = pq.ParquetFile(load_parq)
+    load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(load_parq)
 
     # in this case, only print what Parquet has parsed then quit
     if dump:
         part.dump_parquet(parq_file)
+        num_deltas: int = len(list_deltas(load_path))
+
+        if num_deltas > 0:
+            print(f"{ load_parq }: { num_deltas } delta files not shown")
+
         return
 
-    part.parse_rows(
-        part.iter_load_parquet(
+    # iterating by row groups also merges any delta files
+    if threads is not None or len(list_deltas(load_path)) > 0:
+        iter_batch = part.iter_row_groups(
+            load_path,
+            max_threads = threads or 1,
+            debug = debug,
+        )
+    else:
+        iter_batch = part.iter_batch_parquet(
             parq_file,
             debug = debug,
-        ),
+        )
+
+    part.parse_batches(
+        iter_batch,
         debug = debug,
     )
 
@@ -72,6 +92,199 @@ saving to different formats.
         )
 
 
+@APP.command("convert-parq")
+def cli_convert_parq (
+    *,
+    load_parq: str = typer.Option(..., "--file", "-f", help="input Parquet file"),
+    save_parq: str = typer.Option(..., "--save-parq", help="output Parquet file"),
+    flat: bool = typer.Option(False, "--flat", help="convert to the flat layout, instead of nested"),
+    props_map: bool = typer.Option(False, "--props-map", help="store properties as Parquet maps, instead of JSON"),
+    debug: bool = False,
+    ) -> None:
+    """
+Convert a Parquet file between the flat and nested row layouts, and
+between JSON and Parquet map properties. A base file which has delta
+files must get compacted first.
+    """
+    num_deltas: int = len(list_deltas(cloudpathlib.AnyPath(load_parq)))
+
+    if num_deltas > 0:
+        print(f"{ load_parq }: { num_deltas } delta files, run compact-deltas first")
+        raise typer.Exit(code=1)
+
+    Partition.convert_file_parquet(
+        pq.ParquetFile(load_parq),
+        cloudpathlib.AnyPath(save_parq),
+        nested = not flat,
+        props_map = props_map,
+        debug = debug,
+    )
+
+
+@APP.command("load-dir")
+def cli_load_dir (
+    *,
+    load_dir: str = typer.Option(..., "--dir", "-d", help="input directory of partition files"),
+    workers: int = typer.Option(None, "--workers", help="number of worker processes, defaults to all cores"),
+    lookup: str = typer.Option(None, "--lookup", help="lookup a node by name"),
+    trusted: bool = typer.Option(False, "--trusted", help="skip validation, for files already validated"),
+    debug: bool = False,
+    ) -> None:
+    """
+Load a directory of partition files concurrently into a graph, then
+report on its partitions.
+    """
+    graph: Graph = Graph.load_dir(
+        cloudpathlib.AnyPath(load_dir),
+        max_workers = workers,
+        trusted = trusted,
+        debug = debug,
+    )
+
+    for part_id, part in sorted(graph.partitions.items()):
+        print(f"partition { part_id }: { len(part.node_names) } nodes")
+
+    print(f"graph: { graph.num_nodes() } local nodes")
+
+    if lookup is not None:
+        ic(graph.lookup_part(lookup), graph.lookup_node(lookup))
+
+
+@APP.command("repartition")
+def cli_repartition (
+    *,
+    load_path: str = typer.Option(..., "--file", "-f", help="input Parquet file, or a directory of partition files"),
+    save_dir: str = typer.Option(..., "--save-dir", help="output directory"),
+    num_parts: int = typer.Option(..., "--parts", "-n", help="number of output partitions"),
+    mode: str = typer.Option("hash", "--mode", help="assign nodes to partitions by: hash, range"),
+    spill_size: int = typer.Option(1000000, "--spill-size", help="shadow names to hold in memory before spilling"),
+    debug: bool = False,
+    ) -> None:
+    """
+Split or rebalance a NOCK dataset into partitions, by hash or by range
+of the node names.
+    """
+    load: cloudpathlib.AnyPath = cloudpathlib.AnyPath(load_path)
+
+    if load.is_dir():
+        load_paths = Graph.discover(load, patterns=[ "*.parq", "*.parquet" ])
+    else:
+        load_paths = [ load ]
+
+    save: cloudpathlib.AnyPath = cloudpathlib.AnyPath(save_dir)
+    save.mkdir(parents=True, exist_ok=True)
+
+    save_paths = repartition_files(
+        load_paths,
+        save,
+        num_parts,
+        mode = mode,
+        spill_size = spill_size,
+        debug = debug,
+    )
+
+    for save_path in save_paths:
+        print(f"{ save_path }: { pq.ParquetFile(save_path.as_posix()).metadata.num_rows } rows")
+
+
+@APP.command("sort-parq")
+def cli_sort_parq (
+    *,
+    load_path: str = typer.Option(..., "--file", "-f", help="input Parquet file, or a directory of partition files"),
+    save_parq: str = typer.Option(..., "--save-parq", help="output as Parquet"),
+    run_size: int = typer.Option(1000000, "--run-size", help="rows to sort in memory before spilling a run"),
+    debug: bool = False,
+    ) -> None:
+    """
+Sort a NOCK dataset into one Parquet file, using an external merge sort
+for datasets larger than memory.
+    """
+    load: cloudpathlib.AnyPath = cloudpathlib.AnyPath(load_path)
+
+    if load.is_dir():
+        load_paths = Graph.discover(load, patterns=[ "*.parq", "*.parquet" ])
+    else:
+        load_paths = [ load ]
+
+    num_runs: int = sort_file_parquet(
+        load_paths,
+        cloudpathlib.AnyPath(save_parq),
+        run_size = run_size,
+        debug = debug,
+    )
+
+    print(f"{ save_parq }: { num_runs } sorted runs")
+
+
+@APP.command("validate")
+def cli_validate (
+    *,
+    load_path: str = typer.Option(..., "--file", "-f", help="input Parquet or CSV file"),
+    error_budget: int = typer.Option(1000, "--error-budget", help="errors to collect before stopping"),
+    encoding: str = typer.Option("utf-8", "--encoding", help="input encoding, for CSV"),
+    debug: bool = False,
+    ) -> None:
+    """
+Validate the rows of a Parquet or CSV file, merging any delta files,
+reporting the errors found rather than stopping at the first bad row.
+    """
+    load: cloudpathlib.AnyPath = cloudpathlib.AnyPath(load_path)
+    report: ValidationReport = ValidationReport(error_budget = error_budget)
+
+    # the CSV reader collects the rows which fail to convert into the
+    # same report, while iterating by row groups merges any delta files
+    if load.suffix == ".csv":
+        iter_batch = Partition.iter_batch_csv(load, encoding=encoding, report=report, debug=debug)
+    else:
+        iter_batch = Partition.iter_row_groups(load, debug=debug)
+
+    Partition.validate_batches(
+        iter_batch,
+        report = report,
+        debug = debug,
+    )
+
+    for issue in report.issues:
+        print(f"row { issue.row_num } { issue.column }: { issue.reason }")
+
+    print(f"{ report.num_rows } rows, { report.num_errors } errors")
+
+    if report.num_errors > 0:
+        raise typer.Exit(code=1)
+
+
+@APP.command("append-delta")
+def cli_append_delta (
+    *,
+    base_parq: str = typer.Option(..., "--file", "-f", help="base Parquet file"),
+    load_path: str = typer.Option(..., "--delta", help="input Parquet or CSV file, with the new or changed nodes"),
+    encoding: str = typer.Option("utf-8", "--encoding", help="input encoding, for CSV"),
+    debug: bool = False,
+    ) -> None:
+    """
+Append new or changed nodes to a Parquet partition as a delta file,
+without rewriting the base file.
+    """
+    part: Partition = load_partition_file(0, load_path, encoding=encoding, debug=debug)
+    save_path: cloudpathlib.AnyPath = write_delta(cloudpathlib.AnyPath(base_parq), part, debug=debug)
+
+    print(f"{ save_path }: { len(part.nodes) } nodes")
+
+
+@APP.command("compact-deltas")
+def cli_compact_deltas (
+    *,
+    base_parq: str = typer.Option(..., "--file", "-f", help="base Parquet file"),
+    debug: bool = False,
+    ) -> None:
+    """
+Fold the delta files of a Parquet partition back into its base file.
+    """
+    num_deltas: int = compact_deltas(cloudpathlib.AnyPath(base_parq), debug=debug)
+
+    print(f"{ base_parq }: { num_deltas } deltas compacted")
+
+
 @APP.command("load-csv")
 def cli_load_csv (
     *,
@@ -81,6 +294,7 @@ def cli_load_csv (
     rdf_format: str = typer.Option("ttl", "--format", help="RDF format: ttl, rdf, jsonld, etc."),
     encoding: str = typer.Option("utf-8", "--encoding", help="output encoding"),
     sort: bool = typer.Option(False, "--sort", help="sort the output"),
+    engine: str = typer.Option("python", "--engine", help="CSV parser: python, or arrow which is faster but raises an error on malformed rows"),
     debug: bool = False,
     ) -> None:
     """
@@ -91,14 +305,25 @@ saving to different formats.
         part_id = 0,
     )
 
-    part.parse_rows(
-        part.iter_load_csv(
-            cloudpathlib.AnyPath(load_csv),
-            encoding = encoding,
+    if engine == "arrow":
+        part.parse_batches(
+            part.iter_batch_csv(
+                cloudpathlib.AnyPath(load_csv),
+                encoding = encoding,
+                debug = debug,
+            ),
             debug = debug,
-        ),
-        debug = debug,
-    )
+        )
+    else:
+        part.parse_rows(
+            part.iter_load_csv(
+                cloudpathlib.AnyPath(load_csv),
+                encoding = encoding,
+                engine = engine,
+                debug = debug,
+            ),
+            debug = debug,
+        )
 
     if debug:
         ic(part)
@@ -126,6 +351,7 @@ def cli_load_rdf (
     *,
     load_rdf: str = typer.Option(..., "--file", "-f", help="input RDF file"),
     rdf_format: str = typer.Option("ttl", "--format", help="RDF format: ttl, rdf, jsonld, etc."),
+    sort_subjects: bool = typer.Option(True, "--sort-subjects/--no-sort-subjects", help="group N-Triples/N-Quads input by subject, using an external sort; without it, subjects which are not contiguous repeat their node rows and duplicate triples get removed only within a contiguous run"),
     save_parq: str = typer.Option(None, "--save-parq", help="output as Parquet"),
     save_csv: str = typer.Option(None, "--save-csv", help="output as CSV"),
     encoding: str = typer.Option("utf-8", "--encoding", help="output encoding"),
@@ -145,6 +371,7 @@ saving to different formats.
             cloudpathlib.AnyPath(load_rdf),
             rdf_format = rdf_format,
             encoding = encoding,
+            sort_subjects = sort_subjects,
             debug = debug,
         ),
     )
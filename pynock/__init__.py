@@ -7,5 +7,26 @@ in Python.
 """
 
 from .pynock import GraphRow, IndexInts, PropMap, TruthType, \
-    EMPTY_STRING, NOT_FOUND, \
-    Edge, Node, Partition
+    BATCH_SIZE, EMPTY_STRING, NOT_FOUND, NOCK_SCHEMA, NESTED_SCHEMA, \
+    NOCK_MAP_SCHEMA, NESTED_MAP_SCHEMA, PROPS_MAP_TYPE, \
+    Edge, Node, ParquetOptions, Partition, ScanOptions
+
+from .progress import PROGRESS_EVERY, PROGRESS_MODES, ProgressMetrics, iter_progress
+
+from .validate import ERROR_BUDGET, ValidationIssue, ValidationReport, check_batch, check_row
+
+from .compact import CompactEdge, CompactNode, CompactPartition
+
+from .delta import compact_deltas, load_merged, merge_tables, read_merged, write_delta
+
+from .graph import Graph, PARTITION_PATTERNS, load_partition_file
+
+from .sidecar import DELTA_SUFFIX, INDEX_SCHEMA, INDEX_SUFFIX, delta_path, index_path, list_deltas, parquet_fingerprint, read_index, write_index
+
+from .view import NODE_CACHE_SIZE, ROW_GROUP_CACHE_SIZE, PartitionView
+
+from .shadow import LOOKUP_BATCH_SIZE, LocalRegistry, ShadowBackend, ShadowResolver
+
+from .repartition import REPARTITION_MODES, hash_parts, range_parts, repartition_files, sample_boundaries
+
+from .sorting import RUN_SIZE, sort_file_parquet, sort_key, sort_table
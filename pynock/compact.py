@@ -0,0 +1,928 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compact array-backed storage for graph partitions, as an alternative
+to holding one pydantic object per node and per edge.
+"""
+
+import array
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+from pydantic import NonNegativeInt, PrivateAttr  # pylint: disable=E0401,E0611
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+
+from .pynock import GraphRow, IndexInts, PropMap, \
+    EMPTY_STRING, NOT_FOUND, \
+    Edge, Node, Partition, _widen_truth
+
+
+def _to_array (
+    typecode: str,
+    values: np.ndarray,
+    ) -> array.array:
+    """
+Copy a numpy array into a compact Python `array`.
+    """
+    arr: array.array = array.array(typecode)
+    arr.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+
+    return arr
+
+
+def _widen (
+    truth: float,
+    ) -> float:
+    """
+Widen one stored `float32` truth value through its shortest decimal,
+as `_widen_truth()` does for a column, so that 0.9 reads back as 0.9.
+    """
+    return float(str(np.float32(truth)))
+
+
+def _widen_array (
+    truth: array.array,
+    ) -> typing.List[float]:
+    """
+Widen a stored `float32` array of truth values to a list of floats, in
+bulk through `_widen_truth()`.
+    """
+    return _widen_truth(pa.array(np.frombuffer(truth, dtype=np.float32))).to_pylist()
+
+
+_STORAGE_ATTRS: typing.List[str] = [
+    "_names",
+    "_shadow",
+    "_truth",
+    "_is_rdf",
+    "_labels",
+    "_props",
+    "_label_sets",
+    "_prop_strs",
+    "_edge_src",
+    "_edge_rel",
+    "_edge_dst",
+    "_edge_truth",
+    "_edge_props",
+]
+
+
+######################################################################
+## edge and node handles
+
+class CompactEdge:  # pylint: disable=W0212
+    """
+Handle on an edge stored in a `CompactPartition`, which reads and
+writes through to the partition's edge arrays.
+    """
+    __slots__ = ( "part", "edge_idx" )
+
+
+    def __init__ (
+        self,
+        part: "CompactPartition",
+        edge_idx: NonNegativeInt,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.part: "CompactPartition" = part
+        self.edge_idx: NonNegativeInt = edge_idx
+
+
+    def __repr__ (
+        self,
+        ) -> str:
+        return f"CompactEdge(rel={ self.rel }, node_id={ self.node_id }, truth={ self.truth }, prop_map={ self.prop_map })"
+
+
+    @property
+    def rel (
+        self,
+        ) -> int:
+        """
+Integer index of the edge relation.
+        """
+        return self.part._edge_rel[self.edge_idx]
+
+
+    @property
+    def node_id (
+        self,
+        ) -> int:
+        """
+Node id of the dst node.
+        """
+        return self.part._edge_dst[self.edge_idx]
+
+
+    @property
+    def truth (
+        self,
+        ) -> float:
+        """
+"Truth" value of the edge.
+        """
+        return _widen(self.part._edge_truth[self.edge_idx])
+
+
+    @truth.setter
+    def truth (
+        self,
+        truth: float,
+        ) -> None:
+        self.part._edge_truth[self.edge_idx] = truth
+
+
+    @property
+    def prop_map (
+        self,
+        ) -> PropMap:
+        """
+Properties of the edge, as a new dictionary.
+        """
+        return self.part._load_props(self.part._prop_strs[self.part._edge_props[self.edge_idx]])
+
+
+    @prop_map.setter
+    def prop_map (
+        self,
+        prop_map: PropMap,
+        ) -> None:
+        self.part._edge_props[self.edge_idx] = self.part._intern_props(self.part._save_props(prop_map))
+
+
+class CompactNode:  # pylint: disable=W0212
+    """
+Handle on a node stored in a `CompactPartition`, which reads and
+writes through to the partition's node arrays.
+
+Note that `label_set` and `prop_map` return new objects, so update
+these by assignment rather than by mutating them in place.
+    """
+    __slots__ = ( "part", "node_id" )
+
+
+    def __init__ (
+        self,
+        part: "CompactPartition",
+        node_id: NonNegativeInt,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.part: "CompactPartition" = part
+        self.node_id: NonNegativeInt = node_id
+
+
+    def __repr__ (
+        self,
+        ) -> str:
+        return f"CompactNode(node_id={ self.node_id }, name={ self.name !r}, shadow={ self.shadow }, is_rdf={ self.is_rdf }, label_set={ self.label_set }, truth={ self.truth }, prop_map={ self.prop_map })"
+
+
+    @property
+    def name (
+        self,
+        ) -> str:
+        """
+Unique symbol for the node.
+        """
+        return self.part._names[self.node_id]
+
+
+    @property
+    def shadow (
+        self,
+        ) -> int:
+        """
+Shadow partition for the node, or `Node.BASED_LOCAL`.
+        """
+        return self.part._shadow[self.node_id]
+
+
+    @shadow.setter
+    def shadow (
+        self,
+        shadow: int,
+        ) -> None:
+        self.part._shadow[self.node_id] = shadow
+
+
+    @property
+    def is_rdf (
+        self,
+        ) -> bool:
+        """
+Flag for whether the node was created through the W3C stack.
+        """
+        return bool(self.part._is_rdf[self.node_id])
+
+
+    @is_rdf.setter
+    def is_rdf (
+        self,
+        is_rdf: bool,
+        ) -> None:
+        self.part._is_rdf[self.node_id] = bool(is_rdf)
+
+
+    @property
+    def label_set (
+        self,
+        ) -> typing.Set[str]:
+        """
+Labels of the node, as a new set.
+        """
+        return set(self.part._label_sets[self.part._labels[self.node_id]])
+
+
+    @label_set.setter
+    def label_set (
+        self,
+        label_set: typing.Iterable[str],
+        ) -> None:
+        self.part._labels[self.node_id] = self.part._intern_labels(label_set)
+
+
+    @property
+    def truth (
+        self,
+        ) -> float:
+        """
+"Truth" value of the node.
+        """
+        return _widen(self.part._truth[self.node_id])
+
+
+    @truth.setter
+    def truth (
+        self,
+        truth: float,
+        ) -> None:
+        self.part._truth[self.node_id] = truth
+
+
+    @property
+    def prop_map (
+        self,
+        ) -> PropMap:
+        """
+Properties of the node, as a new dictionary.
+        """
+        return self.part._load_props(self.part._prop_strs[self.part._props[self.node_id]])
+
+
+    @prop_map.setter
+    def prop_map (
+        self,
+        prop_map: PropMap,
+        ) -> None:
+        self.part._props[self.node_id] = self.part._intern_props(self.part._save_props(prop_map))
+
+
+    @property
+    def edge_map (
+        self,
+        ) -> typing.Dict[int, typing.List[CompactEdge]]:
+        """
+Edges of the node grouped by relation, as a new dictionary.
+        """
+        return {
+            rel: [ CompactEdge(self.part, edge_idx) for edge_idx in edge_list ]
+            for rel, edge_list in self.part._iter_edge_groups(self.node_id)
+        }
+
+
+    def add_edge (
+        self,
+        edge: Edge,
+        *,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> None:
+        """
+Add the given edge to its src node.
+        """
+        self.part._append_edge(
+            self.node_id,
+            edge.rel,
+            edge.node_id,
+            edge.truth,
+            self.part._intern_props(self.part._save_props(edge.prop_map)),
+        )
+
+
+######################################################################
+## partitions
+
+class CompactPartition (Partition):  # pylint: disable=R0903
+    """
+Representing a partition in the graph, stored as compact arrays rather
+than as `Node` and `Edge` objects.
+
+Node annotations get held in arrays indexed by node id, with label sets
+and property maps interned into tables. Edges get held as a list of
+coordinates, in parallel `int32` arrays for src, relation, and dst, in
+the order they were added. Truth values get stored as `float32`, as in
+the NOCK schema, then widened through their shortest decimal on read.
+
+To find the edges of a node, an index gets built on demand: the edge
+order sorted by src, plus the offsets of each src node into it.
+
+The `find_or_create_node()`, `create_edge()`, and `lookup_node()`
+methods return `CompactNode` and `CompactEdge` handles in place of
+`Node` and `Edge` objects.
+    """
+    _names: typing.List[str] = PrivateAttr(default_factory=list)
+    _shadow: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+    _truth: array.array = PrivateAttr(default_factory=lambda: array.array("f"))
+    _is_rdf: bytearray = PrivateAttr(default_factory=bytearray)
+    _labels: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+    _props: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+
+    _label_sets: typing.List[typing.Tuple[str, ...]] = PrivateAttr(default_factory=lambda: [ () ])
+    _label_ids: typing.Dict[typing.Tuple[str, ...], int] = PrivateAttr(default_factory=lambda: { (): 0 })
+    _prop_strs: typing.List[str] = PrivateAttr(default_factory=lambda: [ EMPTY_STRING ])
+    _prop_ids: typing.Dict[str, int] = PrivateAttr(default_factory=lambda: { EMPTY_STRING: 0, "null": 0 })
+
+    _edge_src: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+    _edge_rel: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+    _edge_dst: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+    _edge_truth: array.array = PrivateAttr(default_factory=lambda: array.array("f"))
+    _edge_props: array.array = PrivateAttr(default_factory=lambda: array.array("i"))
+
+    _src_index: typing.Optional[typing.Tuple[np.ndarray, np.ndarray]] = PrivateAttr(default=None)
+
+
+    def __eq__ (
+        self,
+        other: typing.Any,
+        ) -> bool:
+        """
+Compare the stored graph data, disregarding the cached edge index.
+        """
+        if not isinstance(other, CompactPartition):
+            return NotImplemented
+
+        return all([
+            self.part_id == other.part_id,
+            self.next_node == other.next_node,
+            self.node_names == other.node_names,
+            self.edge_rels == other.edge_rels,
+            self.shadow_refs == other.shadow_refs,
+        ] + [
+            getattr(self, attr) == getattr(other, attr)
+            for attr in _STORAGE_ATTRS
+        ])
+
+
+    @property
+    def num_edges (
+        self,
+        ) -> int:
+        """
+Count of the edges in this partition.
+        """
+        return len(self._edge_src)
+
+
+    def _intern_labels (
+        self,
+        label_set: typing.Iterable[str],
+        ) -> int:
+        """
+Private method to intern a set of labels, returning its index in the
+label table.
+        """
+        labels: typing.Tuple[str, ...] = tuple(dict.fromkeys(
+            label
+            for label in label_set
+            if label != EMPTY_STRING
+        ))
+
+        label_id: typing.Optional[int] = self._label_ids.get(labels)
+
+        if label_id is None:
+            label_id = len(self._label_sets)
+            self._label_sets.append(labels)
+            self._label_ids[labels] = label_id
+
+        return label_id
+
+
+    def _intern_props (
+        self,
+        props: typing.Union[str, PropMap, None],
+        ) -> int:
+        """
+Private method to intern a JSON string of property pairs, returning its
+index in the property table. Property pairs already decoded from a
+Parquet map get serialized first.
+        """
+        if props is None:
+            return 0
+
+        if isinstance(props, dict):
+            props = self._save_props(props)
+
+        prop_id: typing.Optional[int] = self._prop_ids.get(props)
+
+        if prop_id is None:
+            # normalize the JSON, which also validates it
+            norm: str = self._save_props(self._load_props(props))
+            prop_id = self._prop_ids.get(norm)
+
+            if prop_id is None:
+                prop_id = len(self._prop_strs)
+                self._prop_strs.append(norm)
+                self._prop_ids[norm] = prop_id
+
+            self._prop_ids[props] = prop_id
+
+        return prop_id
+
+
+    def lookup_node (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> typing.Optional[CompactNode]:  # type: ignore
+        """
+Lookup a node, return None if not found.
+        """
+        node_id: typing.Optional[int] = self.node_names.get(node_name)
+
+        if node_id is None:
+            return None
+
+        return CompactNode(self, node_id)
+
+
+    def _find_or_create_id (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,
+        ) -> int:
+        """
+Private method to lookup a node id by name, otherwise create a new node
+with default annotations.
+        """
+        node_id: typing.Optional[int] = self.node_names.get(node_name)
+
+        if node_id is None:
+            node_id = self._create_node_name(node_name, debug=debug)
+
+            self._names.append(node_name)
+            self._shadow.append(Node.BASED_LOCAL)
+            self._truth.append(1.0)
+            self._is_rdf.append(False)
+            self._labels.append(0)
+            self._props.append(0)
+
+        return node_id
+
+
+    def find_or_create_node (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,
+        ) -> CompactNode:  # type: ignore
+        """
+A utility method to:
+
+  * lookup a node by name and return if it already exists
+  * otherwise, create and return a new node
+
+Node attributes other than `node_id` and `name` can be set afterwards,
+as needed.
+        """
+        return CompactNode(self, self._find_or_create_id(node_name, debug=debug))
+
+
+    def add_node (
+        self,
+        node: Node,
+        *,
+        debug: bool = False,
+        ) -> None:
+        """
+Add a node to the partition, copying its annotations and edges into the
+partition's arrays.
+        """
+        if isinstance(node, CompactNode) and node.part is self:
+            return
+
+        node_id: int = self._find_or_create_id(node.name, debug=debug)
+
+        if node_id != node.node_id:
+            raise ValueError(f"node id { node.node_id } does not match { node_id } for |{ node.name }|")
+
+        compact_node: CompactNode = CompactNode(self, node_id)
+        compact_node.shadow = node.shadow
+        compact_node.truth = node.truth
+        compact_node.is_rdf = node.is_rdf
+        compact_node.label_set = node.label_set
+        compact_node.prop_map = node.prop_map
+
+        for edge_list in node.edge_map.values():
+            for edge in edge_list:
+                compact_node.add_edge(edge, debug=debug)
+
+
+    def _append_edge (
+        self,
+        src_id: int,
+        rel: int,
+        dst_id: int,
+        truth: float,
+        prop_id: int,
+        ) -> int:
+        """
+Private method to append an edge to the edge arrays, returning its index.
+        """
+        edge_idx: int = len(self._edge_src)
+
+        self._edge_src.append(src_id)
+        self._edge_rel.append(rel)
+        self._edge_dst.append(dst_id)
+        self._edge_truth.append(truth)
+        self._edge_props.append(prop_id)
+
+        return edge_idx
+
+
+    def _populate_node (
+        self,
+        row: GraphRow,
+        *,
+        debug: bool = False,
+        ) -> CompactNode:  # type: ignore
+        """
+Private method to populate a node from the given Parquet row data.
+        """
+        node_id: int = self._find_or_create_id(row["src_name"], debug=debug)
+
+        self._truth[node_id] = row["truth"]
+        self._is_rdf[node_id] = bool(row["is_rdf"])
+        self._shadow[node_id] = row["shadow"]
+        self._labels[node_id] = self._intern_labels(row["labels"].split(","))
+        self._props[node_id] = self._intern_props(row["props"])
+
+        self._note_shadow(row["src_name"], row["shadow"])
+
+        return CompactNode(self, node_id)
+
+
+    def create_edge (  # type: ignore
+        self,
+        src_node: CompactNode,
+        rel_name: str,
+        dst_node: CompactNode,
+        *,
+        debug: bool = False,
+        ) -> CompactEdge:
+        """
+Create an edge, which is effectively a triple
+        """
+        edge_idx: int = self._append_edge(
+            src_node.node_id,
+            self.get_edge_rel(rel_name, create=True, debug=debug),
+            dst_node.node_id,
+            1.0,
+            0,
+        )
+
+        return CompactEdge(self, edge_idx)
+
+
+    def _populate_edge (  # type: ignore
+        self,
+        row: GraphRow,
+        src_node: CompactNode,
+        *,
+        debug: bool = False,
+        ) -> CompactEdge:
+        """
+Private method to populate an edge from the given Parquet row data.
+        """
+        # first, lookup the dst node and create if needed
+        dst_id: int = self._find_or_create_id(row["dst_name"], debug=debug)
+
+        # add annotations
+        self._truth[dst_id] = row["truth"]
+        self._is_rdf[dst_id] = bool(row["is_rdf"])
+
+        # create the edge
+        edge_idx: int = self._append_edge(
+            src_node.node_id,
+            self.get_edge_rel(row["rel_name"], create=True, debug=debug),
+            dst_id,
+            row["truth"],
+            self._intern_props(row["props"]),
+        )
+
+        return CompactEdge(self, edge_idx)
+
+
+    def _edge_index (
+        self,
+        ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+Private method to index the edges by src node: the edges of node `i`
+are `order[offsets[i]:offsets[i + 1]]`, in the order they were added.
+
+The index gets rebuilt whenever edges or nodes have been added since
+it was last built.
+        """
+        if self._src_index is not None:
+            offsets, order = self._src_index
+
+            if len(offsets) == self.next_node + 1 and len(order) == self.num_edges:
+                return self._src_index
+
+        src: np.ndarray = np.array(self._edge_src, dtype=np.int32)
+        order = np.argsort(src, kind="stable").astype(np.int32)
+
+        offsets = np.zeros(self.next_node + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.next_node), out=offsets[1:])
+
+        self._src_index = (offsets, order)
+
+        return self._src_index
+
+
+    def _iter_edge_groups (
+        self,
+        node_id: int,
+        *,
+        sort: bool = False,
+        node_rank: typing.Optional[typing.Sequence[int]] = None,
+        ) -> typing.Iterable[typing.Tuple[int, typing.List[int]]]:
+        """
+Private method to iterate through the edges of a src node grouped by
+relation, in the same order which `Node.edge_map` would use.
+
+Optionally, sort on relation then on dst `node.name` in ASC order, using
+the rank of each node id in name order when given as `node_rank`.
+        """
+        offsets, order = self._edge_index()
+        edge_rel: array.array = self._edge_rel
+        groups: typing.Dict[int, typing.List[int]] = {}
+
+        for edge_idx in order[offsets[node_id]:offsets[node_id + 1]].tolist():
+            groups.setdefault(edge_rel[edge_idx], []).append(edge_idx)
+
+        if not sort:
+            yield from groups.items()
+        else:
+            if node_rank is None:
+                node_rank = self._rank_nodes()[1]
+
+            edge_dst: array.array = self._edge_dst
+
+            for rel, edge_list in sorted(groups.items()):
+                yield rel, sorted(edge_list, key=lambda e: node_rank[edge_dst[e]])  # type: ignore
+
+
+    def _rank_nodes (  # type: ignore
+        self,
+        ) -> typing.Tuple[typing.List[typing.Tuple[str, int]], typing.List[int]]:
+        """
+Private method to sort the nodes by name only once, with an argsort over
+the name table, returning the `(name, node_id)` pairs in ASC order,
+along with a list of the rank of each node id in that order.
+        """
+        names: typing.List[str] = self._names
+        order: np.ndarray = np.argsort(np.array(names, dtype=object), kind="stable")
+
+        node_rank: np.ndarray = np.empty(len(names), dtype=np.int64)
+        node_rank[order] = np.arange(len(names))
+
+        node_iter: typing.List[typing.Tuple[str, int]] = [
+            ( names[node_id], node_id )
+            for node_id in order.tolist()
+        ]
+
+        return node_iter, node_rank.tolist()
+
+
+    def dump_data (
+        self,
+        ) -> None:
+        """
+Dump the internal data structures for this partition.
+        """
+        for _, src_node_id in self.node_names.items():
+            self.dump_node(CompactNode(self, src_node_id))  # type: ignore
+
+
+    def dump_node (  # type: ignore
+        self,
+        node: CompactNode,
+        ) -> None:
+        """
+Dump the internal data structures for this node.
+        """
+        ic(node)
+
+        for edge_rel, edge_list in node.edge_map.items():
+            for edge in edge_list:
+                ic(edge_rel, edge, self._names[edge.node_id])
+
+
+    def iter_gen_rows (
+        self,
+        *,
+        sort: bool = False,
+        sort_edges: bool = True,
+        debug: bool = False,
+        ) -> typing.Iterable[GraphRow]:
+        """
+Iterator for generating rows on writes.
+
+Optionally, sort on:
+  * src `node.name` in ASC order
+  * `edge_id` and dst `node.name` in ASC order, unless `sort_edges` is false,
+    which keeps the edges of each node in the order they were added
+        """
+        node_iter: typing.Iterable[typing.Tuple[str, int]] = self.node_names.items()
+        node_rank: typing.Optional[typing.List[int]] = None
+
+        if sort:
+            node_iter, node_rank = self._rank_nodes()
+
+        # private attributes of a pydantic model are slow to access, so
+        # bind these once outside of the loop
+        names: typing.List[str] = self._names
+        edge_rels: typing.List[str] = self.edge_rels
+        prop_strs: typing.List[str] = self._prop_strs
+        label_sets: typing.List[typing.Tuple[str, ...]] = self._label_sets
+        node_truth: typing.List[float] = _widen_array(self._truth)
+        edge_truth: typing.List[float] = _widen_array(self._edge_truth)
+        node_shadow, node_is_rdf, node_labels, node_props = \
+            self._shadow, self._is_rdf, self._labels, self._props
+        edge_rel, edge_dst, edge_props = \
+            self._edge_rel, self._edge_dst, self._edge_props
+
+        for node_name, node_id in node_iter:
+            is_rdf: bool = bool(node_is_rdf[node_id])
+
+            row = {
+                "src_name": node_name,
+                "edge_id": -1,
+                "rel_name": None,
+                "dst_name": None,
+                "truth": node_truth[node_id],
+                "shadow": node_shadow[node_id],
+                "is_rdf": is_rdf,
+                "labels": ",".join(label_sets[node_labels[node_id]]),
+                "props": prop_strs[node_props[node_id]],
+            }
+
+            yield row
+
+            edge_id: NonNegativeInt = 0
+
+            for _, edge_list in self._iter_edge_groups(node_id, sort=sort and sort_edges, node_rank=node_rank):
+                for edge_idx in edge_list:
+                    row = {
+                        "src_name": node_name,
+                        "edge_id": edge_id,
+                        "rel_name": edge_rels[edge_rel[edge_idx]],
+                        "dst_name": names[edge_dst[edge_idx]],
+                        "truth": edge_truth[edge_idx],
+                        "shadow": -1,
+                        "is_rdf": is_rdf,
+                        "labels": None,
+                        "props": prop_strs[edge_props[edge_idx]],
+                    }
+
+                    yield row
+                    edge_id += 1
+
+
+    def _arrow_columns (
+        self,
+        *,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> typing.Dict[str, typing.Any]:
+        """
+Private method to gather the columns used by `to_arrow()`, directly from
+the node and edge arrays, without any per-row work.
+        """
+        label_strs: pa.Array = pa.array([ ",".join(label_set) for label_set in self._label_sets ], pa.string())
+        prop_strs: pa.Array = pa.array(self._prop_strs, pa.string())
+
+        return {
+            "names": self._names,
+            "node_truth": np.frombuffer(self._truth, dtype=np.float32),
+            "node_shadow": np.frombuffer(self._shadow, dtype=np.int32),
+            "node_is_rdf": np.frombuffer(self._is_rdf, dtype=np.uint8).astype(np.bool_),
+            "node_labels": label_strs.take(np.frombuffer(self._labels, dtype=np.int32)),
+            "node_props": prop_strs.take(np.frombuffer(self._props, dtype=np.int32)),
+            "edge_src": np.frombuffer(self._edge_src, dtype=np.int32).astype(np.int64),
+            "edge_rel": np.frombuffer(self._edge_rel, dtype=np.int32),
+            "edge_dst": np.frombuffer(self._edge_dst, dtype=np.int32).astype(np.int64),
+            "edge_truth": np.frombuffer(self._edge_truth, dtype=np.float32),
+            "edge_props": prop_strs.take(np.frombuffer(self._edge_props, dtype=np.int32)),
+        }
+
+
+    def _intern_column (
+        self,
+        values: pa.Array,
+        intern: typing.Callable[[str], int],
+        ) -> np.ndarray:
+        """
+Private method to intern each distinct value of a string column only
+once, returning the interned index for every row.
+        """
+        enc: pa.DictionaryArray = pc.dictionary_encode(values)
+        value_ids: np.ndarray = np.array(
+            [ intern(value) for value in enc.dictionary.to_pylist() ],
+            dtype = np.int32,
+        )
+
+        return value_ids[enc.indices.to_numpy(zero_copy_only=False)]
+
+
+    @classmethod
+    def _props_json (
+        cls,
+        props: pa.Array,
+        ) -> pa.Array:
+        """
+Private method to convert a column of properties stored as Parquet maps
+into the JSON strings which get interned.
+        """
+        if not pa.types.is_map(props.type):
+            return props
+
+        return pa.array([
+            cls._save_props(prop_map)
+            for prop_map in cls.decode_props(props)
+        ], pa.string())
+
+
+    @classmethod
+    def from_arrow (
+        cls,
+        data: typing.Union[pa.Table, typing.Iterable[pa.RecordBatch]],
+        *,
+        part_id: IndexInts = NOT_FOUND,  # type: ignore
+        trusted: bool = False,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> "CompactPartition":
+        """
+Construct a partition in bulk from an Arrow table (or a stream of record
+batches) in NOCK schema.
+
+The encoded columns get copied directly into the node and edge arrays,
+interning each distinct label set and property map only once. These
+arrays never go through pydantic validation, so `trusted` only gets
+recorded on the partition.
+        """
+        enc: typing.Dict[str, typing.Any] = cls._encode_arrow(data)
+        names: typing.List[str] = enc["names"]
+        num_nodes: int = len(names)
+        src_ids: np.ndarray = enc["src_ids"]
+
+        part: CompactPartition = cls(part_id = part_id, trusted = trusted)
+        part.node_names = dict(zip(names, range(num_nodes)))
+        part.next_node = num_nodes
+        part.edge_rels = enc["edge_rels"]
+        part.edge_rel_ids = enc["edge_rel_ids"]
+        part.shadow_refs = cls._collect_shadow_refs(names, src_ids, enc["src_shadow"])
+
+        part._names = names
+        part._truth = _to_array("f", enc["node_truth"])
+        part._is_rdf = bytearray(enc["node_is_rdf"].astype(np.uint8).tobytes())
+
+        shadow: np.ndarray = np.full(num_nodes, Node.BASED_LOCAL, dtype=np.int32)
+        shadow[src_ids] = enc["src_shadow"].to_numpy(zero_copy_only=False)
+        part._shadow = _to_array("i", shadow)
+
+        labels: np.ndarray = np.zeros(num_nodes, dtype=np.int32)
+        labels[src_ids] = part._intern_column(
+            enc["src_labels"],
+            lambda label_str: part._intern_labels(label_str.split(",")),
+        )
+        part._labels = _to_array("i", labels)
+
+        props: np.ndarray = np.zeros(num_nodes, dtype=np.int32)
+        props[src_ids] = part._intern_column(part._props_json(enc["src_props"]), part._intern_props)
+        part._props = _to_array("i", props)
+
+        part._edge_src = _to_array("i", enc["edge_src"])
+        part._edge_rel = _to_array("i", enc["edge_rel"])
+        part._edge_dst = _to_array("i", enc["edge_dst"])
+        part._edge_truth = _to_array("f", enc["edge_truth"])
+        part._edge_props = _to_array("i", part._intern_column(part._props_json(enc["edge_props"]), part._intern_props))
+
+        return part
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Incremental updates to a Parquet partition without a full rewrite: new
+or changed nodes get written as numbered delta files next to the base
+file, readers merge the base and its deltas on load, and compaction
+folds the deltas back into the base.
+"""
+
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+import cloudpathlib
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
+
+from .pynock import BATCH_SIZE, NOCK_MAP_SCHEMA, NOCK_SCHEMA, NESTED_MAP_SCHEMA, NESTED_SCHEMA, \
+    IndexInts, NOT_FOUND, ParquetOptions, Partition
+from .sidecar import delta_path, list_deltas
+
+
+def write_delta (
+    base_path: cloudpathlib.AnyPath,
+    part: Partition,
+    *,
+    options: typing.Optional[ParquetOptions] = None,
+    debug: bool = False,
+    ) -> cloudpathlib.AnyPath:
+    """
+Write the nodes of a partition as the next delta file for a base file.
+Each node replaces the node with the same name in the base and in any
+earlier deltas, along with all of its edges, so a changed node must
+include all of its edges.
+
+The delta gets written under a temporary name then renamed, so that
+readers never see a partial delta.
+
+Returns the path of the delta file.
+    """
+    deltas: typing.List[typing.Tuple[int, cloudpathlib.AnyPath]] = list_deltas(base_path)
+    seq: int = deltas[-1][0] + 1 if len(deltas) > 0 else 1
+
+    save_path: cloudpathlib.AnyPath = delta_path(base_path, seq)
+    tmp_path: cloudpathlib.AnyPath = save_path.with_name(save_path.name + ".tmp")
+
+    part.save_file_parquet(tmp_path, options=options, debug=debug)
+    tmp_path.rename(save_path)
+
+    if debug:
+        ic(save_path)
+
+    return save_path
+
+
+def _read_flat (
+    load_path: cloudpathlib.AnyPath,
+    props_map: bool,
+    ) -> pa.Table:
+    """
+Private function to read a Parquet file in either layout as a flat table
+with plain (not dictionary encoded) columns, and the properties as
+either JSON strings or Parquet maps.
+    """
+    table: pa.Table = pq.read_table(load_path.as_posix())
+
+    if Partition._is_nested(table.schema):  # pylint: disable=W0212
+        table = Partition.flatten_table(table)
+
+    table = Partition._convert_props(table, props_map)  # pylint: disable=W0212
+    flat_schema: pa.Schema = NOCK_MAP_SCHEMA if props_map else NOCK_SCHEMA
+
+    return Partition._decode_dictionaries(table.cast(flat_schema))  # pylint: disable=W0212
+
+
+def merge_tables (
+    tables: typing.List[pa.Table],
+    ) -> pa.Table:
+    """
+Merge flat tables in NOCK schema, given in order from the base through
+the latest delta, so that the last writer wins per `src_name`: each node
+group (a node row plus its edge rows) drops out of the earlier tables
+once a later table has a node row with the same name.
+
+The surviving node groups of the base keep their order, followed by
+those of each delta in turn.
+    """
+    seen: pa.Array = pa.array([], pa.string())
+    kept: typing.List[pa.Table] = []
+
+    for table in reversed(tables):
+        if len(seen) > 0:
+            table = table.filter(pc.invert(pc.is_in(table["src_name"], value_set=seen)))
+
+        node_names: pa.ChunkedArray = table["src_name"].filter(pc.less(table["edge_id"], 0))
+        seen = pa.concat_arrays([ seen, node_names.combine_chunks() ])
+        kept.append(table)
+
+    return pa.concat_tables(reversed(kept))
+
+
+def read_merged (
+    base_path: cloudpathlib.AnyPath,
+    *,
+    debug: bool = False,
+    ) -> pa.Table:
+    """
+Read a base Parquet file merged with its delta files, as a flat table.
+Without any deltas, the base gets read as-is, in its own layout.
+    """
+    deltas: typing.List[typing.Tuple[int, cloudpathlib.AnyPath]] = list_deltas(base_path)
+
+    if len(deltas) < 1:
+        return pq.read_table(base_path.as_posix())
+
+    if debug:
+        ic(base_path, len(deltas))
+
+    props_map: bool = Partition._has_props_map(pq.read_schema(base_path.as_posix()))  # pylint: disable=W0212
+
+    return merge_tables([
+        _read_flat(path, props_map)
+        for path in [ base_path ] + [ path for _, path in deltas ]
+    ])
+
+
+def load_merged (
+    base_path: cloudpathlib.AnyPath,
+    *,
+    part_id: IndexInts = NOT_FOUND,  # type: ignore
+    trusted: bool = False,
+    debug: bool = False,
+    ) -> Partition:
+    """
+Load a base Parquet file merged with its delta files into a partition.
+    """
+    return Partition.from_arrow(
+        read_merged(base_path, debug=debug),
+        part_id = part_id,
+        trusted = trusted,
+        debug = debug,
+    )
+
+
+def compact_deltas (
+    base_path: cloudpathlib.AnyPath,
+    *,
+    batch_size: int = BATCH_SIZE,
+    options: typing.Optional[ParquetOptions] = None,
+    debug: bool = False,
+    ) -> int:
+    """
+Fold the delta files of a base Parquet file back into the base, keeping
+the layout of the base, then remove the deltas.
+
+The merged base gets written under a temporary name then renamed over
+the base, before the deltas get removed; if interrupted in between, the
+remaining deltas get merged again on load, which does not change the
+result. Any sidecar index of the base becomes stale.
+
+Returns the number of deltas folded into the base.
+    """
+    deltas: typing.List[typing.Tuple[int, cloudpathlib.AnyPath]] = list_deltas(base_path)
+
+    if len(deltas) < 1:
+        return 0
+
+    if options is None:
+        options = ParquetOptions()
+
+    base_schema: pa.Schema = pq.read_schema(base_path.as_posix())
+    props_map: bool = Partition._has_props_map(base_schema)  # pylint: disable=W0212
+    table: pa.Table = read_merged(base_path, debug=debug)
+    schema: pa.Schema = NOCK_MAP_SCHEMA if props_map else NOCK_SCHEMA
+
+    if Partition._is_nested(base_schema):  # pylint: disable=W0212
+        schema = NESTED_MAP_SCHEMA if props_map else NESTED_SCHEMA
+        table = Partition.nest_table(table)
+
+    tmp_path: cloudpathlib.AnyPath = base_path.with_name(base_path.name + ".tmp")
+
+    with options.open_writer(tmp_path, schema=schema) as writer:
+        writer.write_table(table.cast(schema), row_group_size=batch_size)
+
+    tmp_path.rename(base_path)
+
+    for _, path in deltas:
+        path.unlink()
+
+    if debug:
+        ic(base_path, len(deltas))
+
+    return len(deltas)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A graph dataset which gets sharded into multiple partition files, with
+the partitions loaded concurrently and a merged lookup across them.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+from pydantic import BaseModel, NonNegativeInt  # pylint: disable=E0401,E0611
+import cloudpathlib
+
+from .delta import read_merged
+from .pynock import IndexInts, NOT_FOUND, Node, Partition
+
+
+PARTITION_PATTERNS: typing.List[str] = [
+    "*.parq",
+    "*.parquet",
+    "*.csv",
+]
+
+
+def load_partition_file (
+    part_id: int,
+    load_path: str,
+    part_class: typing.Type[Partition] = Partition,
+    *,
+    encoding: str = "utf-8",
+    trusted: bool = False,
+    debug: bool = False,
+    ) -> Partition:
+    """
+Load one partition file, either Parquet or CSV, into a partition, where
+`trusted` skips the pydantic validation of the nodes and edges. Any delta
+files for a Parquet file get merged on load.
+
+This is a module-level function so that it can run within a process
+pool worker.
+    """
+    path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(load_path)
+
+    if path.suffix == ".csv":
+        return part_class.from_arrow(
+            [
+                batch
+                for _, batch in part_class.iter_batch_csv(path, encoding=encoding, debug=debug)
+            ],
+            part_id = part_id,
+            trusted = trusted,
+            debug = debug,
+        )
+
+    return part_class.from_arrow(
+        read_merged(path, debug=debug),
+        part_id = part_id,
+        trusted = trusted,
+        debug = debug,
+    )
+
+
+class Graph (BaseModel):  # pylint: disable=R0903
+    """
+A graph dataset, as a collection of partitions indexed by `part_id`.
+
+Within a partition, a node which resides on another partition gets
+represented as a shadow node, i.e., with a non-negative `shadow` value.
+The merged lookup maps each node name to the partition where its node
+is local.
+    """
+    partitions: typing.Dict[NonNegativeInt, Partition] = {}
+    node_parts: typing.Dict[str, NonNegativeInt] = {}
+
+
+    @classmethod
+    def discover (
+        cls,
+        load_dir: cloudpathlib.AnyPath,
+        *,
+        patterns: typing.Optional[typing.List[str]] = None,
+        ) -> typing.List[cloudpathlib.AnyPath]:
+        """
+Discover the partition files within a directory, in sorted order.
+        """
+        if patterns is None:
+            patterns = PARTITION_PATTERNS
+
+        return sorted(
+            set(
+                path
+                for pattern in patterns
+                for path in load_dir.glob(pattern)
+            ),
+            key = lambda path: path.name,
+        )
+
+
+    @classmethod
+    def load_dir (
+        cls,
+        load_dir: cloudpathlib.AnyPath,
+        *,
+        patterns: typing.Optional[typing.List[str]] = None,
+        part_class: typing.Type[Partition] = Partition,
+        max_workers: typing.Optional[int] = None,
+        encoding: str = "utf-8",
+        trusted: bool = False,
+        debug: bool = False,
+        ) -> "Graph":
+        """
+Load a directory of partition files concurrently, using a process pool
+with one partition per file. Each partition gets its `part_id` from the
+sorted order of the file names.
+
+Use `max_workers = 1` to load sequentially within this process, and set
+`trusted` for files which have already been validated.
+        """
+        load_paths: typing.List[cloudpathlib.AnyPath] = cls.discover(
+            load_dir,
+            patterns = patterns,
+        )
+
+        graph: Graph = cls()
+
+        if max_workers == 1:
+            for part_id, load_path in enumerate(load_paths):
+                graph.add_partition(
+                    load_partition_file(
+                        part_id,
+                        load_path.as_posix(),
+                        part_class,
+                        encoding = encoding,
+                        trusted = trusted,
+                        debug = debug,
+                    ),
+                    debug = debug,
+                )
+
+            return graph
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    load_partition_file,
+                    part_id,
+                    load_path.as_posix(),
+                    part_class,
+                    encoding = encoding,
+                    trusted = trusted,
+                    debug = debug,
+                )
+                for part_id, load_path in enumerate(load_paths)
+            ]
+
+            for future in futures:
+                graph.add_partition(
+                    future.result(),
+                    debug = debug,
+                )
+
+        return graph
+
+
+    def add_partition (
+        self,
+        part: Partition,
+        *,
+        debug: bool = False,
+        ) -> None:
+        """
+Add a partition to the graph, indexing its local nodes by name. When
+more than one partition has the same local node, the first one added
+takes precedence.
+        """
+        if part.part_id in self.partitions:
+            raise ValueError(f"duplicate partition: { part.part_id }")
+
+        self.partitions[part.part_id] = part
+
+        for node_name in part.node_names:
+            if node_name not in self.node_parts:
+                node: typing.Optional[Node] = part.lookup_node(node_name)
+
+                if node is not None and node.shadow == Node.BASED_LOCAL:
+                    self.node_parts[node_name] = part.part_id
+
+        if debug:
+            ic(part.part_id, len(part.node_names))
+
+
+    def lookup_part (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> IndexInts:
+        """
+Lookup the `part_id` of the partition where a node is local, or
+`NOT_FOUND` if no partition has it.
+        """
+        return self.node_parts.get(node_name, NOT_FOUND)  # type: ignore
+
+
+    def lookup_node (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,
+        ) -> typing.Optional[Node]:
+        """
+Lookup a node by name across all of the partitions, returning its local
+node, or None if not found.
+        """
+        part_id: IndexInts = self.lookup_part(node_name, debug=debug)
+
+        if part_id < 0:
+            return None
+
+        return self.partitions[part_id].lookup_node(node_name, debug=debug)
+
+
+    def num_nodes (
+        self,
+        ) -> int:
+        """
+Count the distinct local nodes across all of the partitions.
+        """
+        return len(self.node_parts)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming, line-oriented parsing for the N-Triples and N-Quads RDF
+formats, plus streaming writers for N-Triples and Turtle, which avoid
+materializing an `rdflib.Graph` in memory.
+"""
+
+import heapq
+import json
+import re
+import tempfile
+import typing
+
+
+######################################################################
+## non-class definitions
+
+Triple = typing.Tuple[str, str, str]
+
+STREAM_FORMATS: typing.Set[str] = set([
+    "nt",
+    "nt11",
+    "ntriples",
+    "nq",
+    "nquads",
+])
+
+STREAM_WRITE_FORMATS: typing.Set[str] = set([
+    "nt",
+    "nt11",
+    "ntriples",
+    "ttl",
+    "turtle",
+])
+
+TURTLE_FORMATS: typing.Set[str] = set([
+    "ttl",
+    "turtle",
+])
+
+RDF_TYPE: str = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+SPILL_SIZE: int = 1000000
+WRITE_CHUNK: int = 10000
+
+_BNODE: str = r"_:(?:[^\s.<\"]|\.(?=[^\s<\"]))+"
+_IRI: str = r"<[^>]*>"
+_LITERAL: str = r"\"(?:[^\"\\]|\\.)*\"(?:@[A-Za-z]+(?:-[A-Za-z0-9]+)*|\^\^<[^>]*>)?"
+_TERM: str = f"({ _IRI }|{ _BNODE }|{ _LITERAL })"
+
+_LINE_PAT: typing.Pattern = re.compile(
+    rf"^\s*{ _TERM }\s*{ _TERM }\s*{ _TERM }\s*(?:{ _IRI }|{ _BNODE })?\s*\.\s*(?:#.*)?$"
+)
+
+_SKIP_PAT: typing.Pattern = re.compile(r"^\s*(?:#.*)?$")
+
+_ESCAPE_PAT: typing.Pattern = re.compile(r"\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|[tbnrf\"'\\])")
+
+_IRI_ESCAPE_PAT: typing.Pattern = re.compile(r"[\x00-\x20<>\"{}|^`\\]")
+
+_ESCAPE_CHARS: typing.Dict[str, str] = {
+    "t": "\t",
+    "b": "\b",
+    "n": "\n",
+    "r": "\r",
+    "f": "\f",
+    "\"": "\"",
+    "'": "'",
+    "\\": "\\",
+}
+
+
+def _unescape (
+    match: typing.Match,
+    ) -> str:
+    """
+Replace one escape sequence.
+    """
+    esc: str = match.group(1)
+
+    if esc[0] in "uU":
+        return chr(int(esc[1:], 16))
+
+    return _ESCAPE_CHARS[esc]
+
+
+def term_str (
+    term: str,
+    ) -> str:
+    """
+Convert an N-Triples term to the string which `rdflib` would produce
+for it: the IRI for a resource, the label for a blank node, or the
+lexical form for a literal.
+    """
+    if term.startswith("<"):
+        return _ESCAPE_PAT.sub(_unescape, term[1:-1])
+
+    if term.startswith("_:"):
+        return term[2:]
+
+    return _ESCAPE_PAT.sub(_unescape, term[1:term.rindex("\"")])
+
+
+def parse_line (
+    line: str,
+    line_num: int = 0,
+    ) -> typing.Optional[Triple]:
+    """
+Parse one line of N-Triples or N-Quads, returning its triple, or `None`
+for a blank or comment line. The graph term of a quad gets ignored.
+    """
+    match: typing.Optional[typing.Match] = _LINE_PAT.match(line)
+
+    if match is None:
+        if _SKIP_PAT.match(line):
+            return None
+
+        raise ValueError(f"cannot parse N-Triples at line { line_num }: |{ line.strip() }|")
+
+    return (
+        term_str(match.group(1)),
+        term_str(match.group(2)),
+        term_str(match.group(3)),
+    )
+
+
+def iter_triples (
+    lines: typing.Iterable[str],
+    ) -> typing.Iterable[Triple]:
+    """
+Iterate through the triples parsed from a stream of lines.
+    """
+    for line_num, line in enumerate(lines):
+        triple: typing.Optional[Triple] = parse_line(line, line_num)
+
+        if triple is not None:
+            yield triple
+
+
+def iter_spill_sorted (
+    triples: typing.Iterable[Triple],
+    *,
+    spill_size: int = SPILL_SIZE,
+    ) -> typing.Iterable[Triple]:
+    """
+Sort a stream of triples by subject, keeping at most `spill_size`
+triples in memory: each full chunk gets sorted then spilled to a
+temporary file, and the sorted chunks get merged.
+
+The sort is stable, so triples for a given subject keep their input
+order.
+    """
+    spill_files: typing.List[typing.IO] = []
+    chunk: typing.List[Triple] = []
+
+    def _spill () -> None:
+        chunk.sort(key=lambda t: t[0])
+        spill_file: typing.IO = tempfile.TemporaryFile(mode="w+", encoding="utf-8")  # pylint: disable=R1732
+
+        for triple in chunk:
+            spill_file.write(json.dumps(triple))
+            spill_file.write("\n")
+
+        spill_file.seek(0)
+        spill_files.append(spill_file)
+        chunk.clear()
+
+    try:
+        for triple in triples:
+            chunk.append(triple)
+
+            if len(chunk) >= spill_size:
+                _spill()
+
+        if len(spill_files) < 1:
+            # everything fit in memory
+            chunk.sort(key=lambda t: t[0])
+            yield from chunk
+            return
+
+        if len(chunk) > 0:
+            _spill()
+
+        runs: typing.List[typing.Iterable[Triple]] = [
+            ( tuple(json.loads(line)) for line in spill_file )  # type: ignore
+            for spill_file in spill_files
+        ]
+
+        yield from heapq.merge(*runs, key=lambda t: t[0])
+
+    finally:
+        for spill_file in spill_files:
+            spill_file.close()
+
+
+def iri_ref (
+    iri: str,
+    ) -> str:
+    """
+Represent an IRI as an N-Triples/Turtle term, escaping the characters
+which cannot appear within an IRI reference.
+    """
+    return "<" + _IRI_ESCAPE_PAT.sub(lambda m: f"\\u{ ord(m.group(0)):04X}", iri) + ">"
+
+
+def write_triples (
+    fp: typing.IO,
+    triples: typing.Iterable[Triple],
+    *,
+    turtle: bool = False,
+    chunk_size: int = WRITE_CHUNK,
+    ) -> int:
+    """
+Write a stream of triples, where each element is an IRI, to an open text
+file as N-Triples, or as Turtle with consecutive triples for the same
+subject (and predicate) grouped together. Output gets buffered and written in chunks of
+`chunk_size` triples.
+
+Returns the number of triples written.
+    """
+    buf: typing.List[str] = []
+    last_subj: typing.Optional[str] = None
+    last_pred: typing.Optional[str] = None
+    count: int = 0
+
+    for subj, pred, objt in triples:
+        if not turtle:
+            buf.append(f"{ iri_ref(subj) } { iri_ref(pred) } { iri_ref(objt) } .\n")
+        else:
+            pred_term: str = "a" if pred == RDF_TYPE else iri_ref(pred)
+
+            if subj == last_subj and pred == last_pred:
+                buf.append(f",\n        { iri_ref(objt) }")
+            elif subj == last_subj:
+                buf.append(f" ;\n    { pred_term } { iri_ref(objt) }")
+            else:
+                if last_subj is not None:
+                    buf.append(" .\n\n")
+
+                buf.append(f"{ iri_ref(subj) } { pred_term } { iri_ref(objt) }")
+
+            last_subj = subj
+            last_pred = pred
+
+        count += 1
+
+        if len(buf) >= chunk_size:
+            fp.write("".join(buf))
+            buf.clear()
+
+    if last_subj is not None:
+        buf.append(" .\n")
+
+    fp.write("".join(buf))
+
+    return count
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pluggable progress reporting for the parsers: off, a `rich` progress
+bar, or a callback which receives throughput metrics every N rows.
+"""
+
+import sys
+import time
+import typing
+
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt  # pylint: disable=E0401,E0611
+import rich.progress  # pylint: disable=E0401
+
+
+PROGRESS_EVERY: int = 10000
+
+PROGRESS_MODES: typing.Set[str] = set([
+    "auto",
+    "off",
+    "rich",
+])
+
+
+class ProgressMetrics (BaseModel):  # pylint: disable=R0903
+    """
+Throughput metrics for a parser, reported to a progress callback.
+
+The bytes count the Arrow buffers of the record batches parsed, which
+stays zero when parsing a stream of rows.
+    """
+    num_rows: NonNegativeInt = 0
+    num_batches: NonNegativeInt = 0
+    num_bytes: NonNegativeInt = 0
+    elapsed: NonNegativeFloat = 0.0
+    rows_per_sec: NonNegativeFloat = 0.0
+    done: bool = False
+
+
+ProgressCallback = typing.Callable[[ProgressMetrics], None]
+ProgressHook = typing.Union[str, ProgressCallback, None]
+
+
+def _rich_callback (
+    bar: rich.progress.Progress,
+    description: str,
+    ) -> ProgressCallback:
+    """
+Render the metrics on a `rich` progress bar.
+    """
+    task_id: rich.progress.TaskID = bar.add_task(description, total=None)
+
+    def _update (metrics: ProgressMetrics) -> None:
+        bar.update(
+            task_id,
+            completed = metrics.num_rows,
+            description = f"{ description } { metrics.rows_per_sec:,.0f} rows/sec",
+        )
+
+    return _update
+
+
+def iter_progress (  # pylint: disable=R0913
+    items: typing.Iterable[typing.Any],
+    *,
+    progress: ProgressHook = "auto",
+    description: str = "parse",
+    every: int = PROGRESS_EVERY,
+    batches: bool = False,
+    ) -> typing.Iterable[typing.Any]:
+    """
+Wrap the `(row_num, row)` or `(row_num, batch)` items consumed by a
+parser with progress reporting, where `progress` is one of:
+
+  * `"off"` or None: no reporting, no overhead
+  * `"rich"`: a `rich` progress bar, updated every `every` rows
+  * `"auto"`: `"rich"` when stdout is a terminal, otherwise `"off"`
+  * a callback, which gets a `ProgressMetrics` every `every` rows, then once more when done
+
+Set `batches` when the items are record batches, to count their rows
+and bytes.
+    """
+    if progress == "auto":
+        progress = "rich" if sys.stdout.isatty() else "off"
+
+    if progress is None or progress == "off":
+        yield from items
+        return
+
+    if isinstance(progress, str) and progress not in PROGRESS_MODES:
+        raise ValueError(f"unknown progress mode: { progress }")
+
+    with rich.progress.Progress(disable=(progress != "rich")) as bar:
+        callback: ProgressCallback = _rich_callback(bar, description) if progress == "rich" else progress  # type: ignore
+
+        metrics: ProgressMetrics = ProgressMetrics()
+        start: float = time.perf_counter()
+        next_report: int = every
+
+        def _report (done: bool = False) -> None:
+            metrics.elapsed = time.perf_counter() - start
+            metrics.rows_per_sec = metrics.num_rows / metrics.elapsed if metrics.elapsed > 0.0 else 0.0
+            metrics.done = done
+            callback(metrics.model_copy())
+
+        # report once more when done, even if the parser stops early
+        try:
+            for item in items:
+                yield item
+
+                if batches:
+                    metrics.num_rows += item[1].num_rows
+                    metrics.num_batches += 1
+                    metrics.num_bytes += item[1].nbytes
+                else:
+                    metrics.num_rows += 1
+
+                if metrics.num_rows >= next_report:
+                    _report()
+                    next_report = metrics.num_rows + every
+        finally:
+            _report(done=True)
@@ -6,22 +6,36 @@ Example graph serialization using low-level Parquet read/write
 efficiently in Python.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 import ast
+import collections
 import csv
 import json
+import os
 import sys
+import threading
 import typing
 
 from icecream import ic  # type: ignore  # pylint: disable=E0401
 from pydantic import BaseModel, confloat, conint, NonNegativeInt, ValidationError  # pylint: disable=E0401,E0611
-from rich.progress import track  # pylint: disable=E0401
 import cloudpathlib
+import numpy as np
 import pandas as pd
 import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+import pyarrow.csv  # type: ignore  # pylint: disable=E0401
+import pyarrow.dataset as ds  # type: ignore  # pylint: disable=E0401
 import pyarrow.lib  # type: ignore  # pylint: disable=E0401
 import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
 import rdflib
 
+from .ntriples import STREAM_FORMATS, STREAM_WRITE_FORMATS, TURTLE_FORMATS, \
+    SPILL_SIZE, Triple, \
+    iter_spill_sorted, iter_triples, write_triples
+from .progress import PROGRESS_EVERY, ProgressHook, iter_progress
+from .sidecar import NodeRowScanner, list_deltas, write_index
+from .validate import ERROR_BUDGET, ValidationReport, check_batch, check_row
+
 
 ######################################################################
 ## non-class definitions
@@ -31,9 +45,249 @@ IndexInts = conint(ge=-1)
 PropMap = typing.Dict[str, typing.Any]
 TruthType = confloat(ge=0.0, le=1.0)
 
+BATCH_SIZE: int = 65536
+CSV_BLOCK_SIZE: int = 1 << 24
+CSV_NULL_VALUES: pa.Array = pa.array(pyarrow.csv.ConvertOptions().null_values, pa.string())
 EMPTY_STRING: str = ""
 NOT_FOUND: IndexInts = -1  # type: ignore
 
+NOCK_SCHEMA: pa.Schema = pa.schema([
+    pa.field("src_name", pa.string(), nullable=False),
+    pa.field("edge_id", pa.int32()),
+    pa.field("rel_name", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("dst_name", pa.string()),
+    pa.field("truth", pa.float32()),
+    pa.field("shadow", pa.int32()),
+    pa.field("is_rdf", pa.bool_()),
+    pa.field("labels", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("props", pa.string()),
+])
+
+# Arrow cannot read dictionary types nested within lists in batches, so
+# `rel_name` relies on the Parquet page-level dictionary encoding here
+NESTED_EDGE_TYPE: pa.DataType = pa.struct([
+    pa.field("edge_id", pa.int32()),
+    pa.field("rel_name", pa.string()),
+    pa.field("dst_name", pa.string()),
+    pa.field("truth", pa.float32()),
+    pa.field("props", pa.string()),
+])
+
+NESTED_SCHEMA: pa.Schema = pa.schema([
+    pa.field("src_name", pa.string(), nullable=False),
+    pa.field("truth", pa.float32()),
+    pa.field("shadow", pa.int32()),
+    pa.field("is_rdf", pa.bool_()),
+    pa.field("labels", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("props", pa.string()),
+    pa.field("edges", pa.list_(NESTED_EDGE_TYPE)),
+])
+
+# property values get stored as a variant: exactly one of the typed
+# fields is set, with `json` as a fallback for lists, dicts, and any
+# integers out of range, while all fields null represents a JSON `null`
+PROP_VALUE_TYPE: pa.DataType = pa.struct([
+    pa.field("str", pa.string()),
+    pa.field("int", pa.int64()),
+    pa.field("float", pa.float64()),
+    pa.field("bool", pa.bool_()),
+    pa.field("json", pa.string()),
+])
+
+PROPS_MAP_TYPE: pa.DataType = pa.map_(pa.string(), PROP_VALUE_TYPE)
+
+
+def _props_schema (
+    schema: pa.Schema,
+    props_type: pa.DataType,
+    ) -> pa.Schema:
+    """
+Substitute the type of the `props` fields in a schema, including within
+the nested edges.
+    """
+    fields: typing.List[pa.Field] = []
+
+    for field in schema:
+        if field.name == "props":
+            field = field.with_type(props_type)
+        elif field.name == "edges":
+            field = field.with_type(pa.list_(pa.struct([
+                edge_field.with_type(props_type) if edge_field.name == "props" else edge_field
+                for edge_field in field.type.value_type
+            ])))
+
+        fields.append(field)
+
+    return pa.schema(fields)
+
+
+NOCK_MAP_SCHEMA: pa.Schema = _props_schema(NOCK_SCHEMA, PROPS_MAP_TYPE)
+NESTED_MAP_SCHEMA: pa.Schema = _props_schema(NESTED_SCHEMA, PROPS_MAP_TYPE)
+
+
+def _widen_truth (
+    col: typing.Union[pa.Array, pa.ChunkedArray],
+    ) -> typing.Union[pa.Array, pa.ChunkedArray]:
+    """
+Widen a `float32` truth column to `float64` through the shortest decimal
+which round-trips, so that a `0.9` stored in Parquet loads as `0.9`
+rather than `0.8999999761581421`.
+    """
+    if pa.types.is_float32(col.type):
+        return col.cast(pa.string()).cast(pa.float64())
+
+    return col
+
+
+def _assign_fields (
+    model: BaseModel,
+    values: typing.Dict[str, typing.Any],
+    trusted: bool,
+    ) -> None:
+    """
+Assign field values on a pydantic model, where trusted values bypass the
+attribute hooks in `BaseModel.__setattr__()`.
+    """
+    if trusted:
+        model.__dict__.update(values)
+    else:
+        for key, value in values.items():
+            setattr(model, key, value)
+
+
+######################################################################
+## Parquet options
+
+class ParquetOptions (BaseModel):  # pylint: disable=R0903
+    """
+Tuning for the Parquet files written by the partition writers: the
+compression codec and level, data page size, and column statistics.
+The row group size is set by the `batch_size` of each writer.
+    """
+    compression: str = "zstd"
+    compression_level: typing.Optional[int] = None
+    data_page_size: typing.Optional[NonNegativeInt] = None
+    write_statistics: bool = True
+
+
+    def open_writer (
+        self,
+        save_parq: cloudpathlib.AnyPath,
+        *,
+        schema: pa.Schema = NOCK_SCHEMA,
+        ) -> pq.ParquetWriter:
+        """
+Open a Parquet writer for the given schema using these options.
+        """
+        return pq.ParquetWriter(
+            save_parq.as_posix(),
+            schema,
+            compression = self.compression,
+            compression_level = self.compression_level,
+            data_page_size = self.data_page_size,
+            write_statistics = self.write_statistics,
+        )
+
+
+######################################################################
+## scan options
+
+class ScanOptions (BaseModel):  # pylint: disable=R0903
+    """
+Projection and predicates for loading NOCK Parquet files, which get
+pushed down into the Parquet reads, so that the skipped columns never
+get decoded and row groups get pruned using their statistics.
+
+The topology columns `TOPOLOGY_COLUMNS` always get read; `columns`
+selects among the others, where None means all of them, and the columns
+not read get default values.
+
+The predicates on `is_rdf` and the `name_prefix` of `src_name` select
+whole nodes along with their edges, while the predicates on the
+`relations` and the `min_truth` select edge rows, keeping all node rows.
+    """
+    TOPOLOGY_COLUMNS: typing.ClassVar[typing.List[str]] = [
+        "src_name",
+        "edge_id",
+        "rel_name",
+        "dst_name",
+    ]
+
+    DEFAULT_VALUES: typing.ClassVar[typing.Dict[str, typing.Any]] = {
+        "truth": 1.0,
+        "shadow": -1,
+        "is_rdf": False,
+        "labels": EMPTY_STRING,
+        "props": EMPTY_STRING,
+    }
+
+    columns: typing.Optional[typing.List[str]] = None
+    relations: typing.Optional[typing.Set[str]] = None
+    min_truth: typing.Optional[float] = None
+    is_rdf: typing.Optional[bool] = None
+    name_prefix: typing.Optional[str] = None
+
+
+    def read_columns (
+        self,
+        ) -> typing.List[str]:
+        """
+List the flat NOCK columns to read, in schema order.
+        """
+        if self.columns is None:
+            return list(NOCK_SCHEMA.names)
+
+        unknown: typing.Set[str] = set(self.columns) - set(NOCK_SCHEMA.names)
+
+        if len(unknown) > 0:
+            raise ValueError(f"unknown columns: { sorted(unknown) }")
+
+        return [
+            name
+            for name in NOCK_SCHEMA.names
+            if name in self.TOPOLOGY_COLUMNS or name in self.columns
+        ]
+
+
+    def node_filter (
+        self,
+        ) -> typing.Optional[ds.Expression]:
+        """
+The predicate which selects whole nodes, or None if there is none.
+        """
+        expr: typing.Optional[ds.Expression] = None
+
+        if self.is_rdf is not None:
+            expr = ds.field("is_rdf") == self.is_rdf
+
+        if self.name_prefix is not None:
+            prefix: ds.Expression = pc.starts_with(ds.field("src_name"), pattern=self.name_prefix)
+            expr = prefix if expr is None else expr & prefix
+
+        return expr
+
+
+    def edge_filter (
+        self,
+        ) -> typing.Optional[ds.Expression]:
+        """
+The predicate which selects rows, keeping all of the node rows while
+selecting edge rows, or None if there is none.
+        """
+        expr: typing.Optional[ds.Expression] = None
+
+        if self.relations is not None:
+            expr = ds.field("rel_name").isin(sorted(self.relations))
+
+        if self.min_truth is not None:
+            truth: ds.Expression = ds.field("truth") >= self.min_truth
+            expr = truth if expr is None else expr & truth
+
+        if expr is None:
+            return None
+
+        return (ds.field("edge_id") < 0) | expr
+
 
 ######################################################################
 ## edges
@@ -90,6 +344,17 @@ Add the given edge to its src node.
 class Partition (BaseModel):  # pylint: disable=R0903
     """
 Representing a partition in the graph.
+
+Set `trusted` when loading files which have already been validated, to
+construct the nodes and edges through `model_construct()`, and to assign
+their fields while parsing, without pydantic validation.
+
+Pydantic 2.x does not validate on assignment, so the gain comes from
+skipping the validation in `__init__()` through `model_construct()`,
+plus the `BaseModel.__setattr__()` hooks while parsing. With `bench.py
+trusted` at scale 50 (28350 rows), the median of 9 runs for
+`parse_batches()` drops from 0.50 to 0.45 sec, and for `from_arrow()`
+from 0.37 to 0.32 sec, i.e., about 10-15% faster.
     """
     SORT_COLUMNS: typing.ClassVar[typing.List[str]] = [
         "src_name",
@@ -101,6 +366,9 @@ Representing a partition in the graph.
     nodes: typing.Dict[NonNegativeInt, Node] = {}
     node_names: typing.Dict[str, NonNegativeInt] = {}
     edge_rels: typing.List[str] = [""]
+    edge_rel_ids: typing.Dict[str, NonNegativeInt] = {"": 0}
+    shadow_refs: typing.Dict[str, NonNegativeInt] = {}
+    trusted: bool = False
 
 
     def lookup_node (
@@ -167,9 +435,10 @@ as needed.
                 debug = debug,
             )
 
-            node = Node(
-                node_id = node_id,
-                name = node_name,
+            node = self._build_node(
+                node_id,
+                node_name,
+                trusted = self.trusted,
             )
 
             self.add_node(
@@ -180,24 +449,216 @@ as needed.
         return node
 
 
+    @classmethod
+    def _build_node (  # pylint: disable=R0913
+        cls,
+        node_id: int,
+        name: str,
+        *,
+        shadow: int = Node.BASED_LOCAL,
+        is_rdf: bool = False,
+        label_set: typing.Optional[typing.Set[str]] = None,
+        truth: float = 1.0,
+        prop_map: typing.Optional[PropMap] = None,
+        trusted: bool = False,
+        ) -> Node:
+        """
+Private method to construct a node, skipping the pydantic validation
+when the input is `trusted`, e.g., files which have already been
+validated.
+        """
+        values: typing.Dict[str, typing.Any] = {
+            "node_id": node_id,
+            "name": name,
+            "shadow": shadow,
+            "is_rdf": is_rdf,
+            "label_set": set() if label_set is None else label_set,
+            "truth": truth,
+            "prop_map": {} if prop_map is None else prop_map,
+            "edge_map": {},
+        }
+
+        if trusted:
+            return Node.model_construct(**values)
+
+        return Node(**values)
+
+
+    @classmethod
+    def _build_edge (
+        cls,
+        rel: int,
+        node_id: int,
+        *,
+        truth: float = 1.0,
+        prop_map: typing.Optional[PropMap] = None,
+        trusted: bool = False,
+        ) -> Edge:
+        """
+Private method to construct an edge, skipping the pydantic validation
+when the input is `trusted`.
+        """
+        values: typing.Dict[str, typing.Any] = {
+            "rel": rel,
+            "node_id": node_id,
+            "truth": truth,
+            "prop_map": {} if prop_map is None else prop_map,
+        }
+
+        if trusted:
+            return Edge.model_construct(**values)
+
+        return Edge(**values)
+
+
     @classmethod
     def _load_props (
         cls,
-        props: str,
+        props: typing.Union[str, PropMap, None],
         *,
         debug: bool = False,  # pylint: disable=W0613
         ) -> PropMap:
         """
-Load property pairs from a JSON string.
+Load property pairs from a JSON string, or pass through property pairs
+which have already been decoded from a Parquet map.
         """
         prop_map: PropMap = {}
 
-        if props not in (EMPTY_STRING, "null"):
-            prop_map = json.loads(props)
+        if isinstance(props, dict):
+            prop_map = props
+        elif props not in (EMPTY_STRING, "null", None):
+            prop_map = json.loads(props)  # type: ignore
 
         return prop_map
 
 
+    @classmethod
+    def _has_props_map (
+        cls,
+        schema: pa.Schema,
+        ) -> bool:
+        """
+Private method to test whether a schema stores `props` as a Parquet map.
+        """
+        return pa.types.is_map(schema.field("props").type)
+
+
+    @classmethod
+    def encode_props (
+        cls,
+        values: typing.Iterable[typing.Union[str, PropMap, None]],
+        ) -> pa.MapArray:
+        """
+Encode property pairs, either as JSON strings or as dictionaries, into a
+map array of `PROPS_MAP_TYPE`.
+
+Each distinct JSON string only gets parsed once.
+        """
+        offsets: typing.List[int] = [ 0 ]
+        keys: typing.List[str] = []
+        typed: typing.Dict[str, list] = { field.name: [] for field in PROP_VALUE_TYPE }
+        parsed: typing.Dict[str, PropMap] = {}
+
+        for props in values:
+            if isinstance(props, str):
+                if props not in parsed:
+                    parsed[props] = cls._load_props(props)
+
+                props = parsed[props]
+
+            for key, value in (props or {}).items():
+                keys.append(key)
+                slot: typing.Optional[str] = None
+
+                if isinstance(value, bool):
+                    slot = "bool"
+                elif isinstance(value, int):
+                    slot = "int" if -2**63 <= value < 2**63 else "json"
+                elif isinstance(value, float):
+                    slot = "float"
+                elif isinstance(value, str):
+                    slot = "str"
+                elif value is not None:
+                    slot = "json"
+
+                for name, col in typed.items():
+                    if name != slot:
+                        col.append(None)
+                    elif name == "json":
+                        col.append(json.dumps(value, separators=(",", ":")))
+                    else:
+                        col.append(value)
+
+            offsets.append(len(keys))
+
+        items: pa.StructArray = pa.StructArray.from_arrays(
+            [ pa.array(typed[field.name], field.type) for field in PROP_VALUE_TYPE ],
+            fields = list(PROP_VALUE_TYPE),
+        )
+
+        return pa.MapArray.from_arrays(
+            pa.array(offsets, pa.int32()),
+            pa.array(keys, pa.string()),
+            items,
+        )
+
+
+    @classmethod
+    def decode_props (
+        cls,
+        props: typing.Union[pa.Array, pa.ChunkedArray],
+        ) -> typing.List[PropMap]:
+        """
+Decode a column of property pairs, either JSON strings or a map of
+`PROPS_MAP_TYPE`, into a dictionary per row.
+
+Maps get decoded column by column, without any JSON parsing except for
+the fallback `json` values.
+        """
+        if isinstance(props, pa.ChunkedArray):
+            props = props.combine_chunks()
+
+        if not pa.types.is_map(props.type):
+            return [ cls._load_props(value) for value in props.to_pylist() ]
+
+        # the offsets of a sliced map array index into its whole child
+        # arrays, so slice those to match
+        offsets: np.ndarray = props.offsets.to_numpy()
+        lengths: typing.List[int] = np.diff(offsets).tolist()
+        first: int = int(offsets[0])
+        num_items: int = int(offsets[-1]) - first
+
+        keys: typing.List[str] = props.keys.slice(first, num_items).to_pylist()
+        values: pa.StructArray = props.items.slice(first, num_items)
+        merged: np.ndarray = np.full(num_items, None, dtype=object)
+
+        # scatter the set values of each typed field
+        for field in PROP_VALUE_TYPE:
+            col: pa.Array = values.field(field.name)
+
+            if col.null_count == len(col):
+                continue
+
+            valid: np.ndarray = col.is_valid().to_numpy(zero_copy_only=False)
+            col_vals: typing.List[typing.Any] = col.filter(valid).to_pylist()
+
+            if field.name == "json":
+                col_vals = [ json.loads(val) for val in col_vals ]
+
+            merged[np.flatnonzero(valid)] = col_vals
+
+        merged_vals: typing.List[typing.Any] = merged.tolist()
+        prop_maps: typing.List[PropMap] = []
+        start: int = 0
+
+        for length in lengths:
+            end: int = start + length
+            prop_maps.append(dict(zip(keys[start:end], merged_vals[start:end])))
+            start = end
+
+        return prop_maps
+
+
     @classmethod
     def _save_props (
         cls,
@@ -266,15 +727,58 @@ Private method to populate a Node object from the given Parquet row data.
         )
 
         # in this case, we know these annotations must be added
-        src_node.truth = row["truth"]
-        src_node.is_rdf = row["is_rdf"]
-        src_node.shadow = row["shadow"]
-        src_node.label_set = set(row["labels"].split(","))
-        src_node.prop_map = self._load_props(row["props"], debug=debug)
+        _assign_fields(
+            src_node,
+            {
+                "truth": row["truth"],
+                "is_rdf": row["is_rdf"],
+                "shadow": row["shadow"],
+                "label_set": set(row["labels"].split(",")),
+                "prop_map": self._load_props(row["props"], debug=debug),
+            },
+            self.trusted,
+        )
+
+        self._note_shadow(row["src_name"], row["shadow"])
 
         return src_node  # type: ignore
 
 
+    def _note_shadow (
+        self,
+        node_name: str,
+        shadow: IndexInts,
+        ) -> None:
+        """
+Private method to collect the shadow references, i.e., the nodes which
+reside on another partition, mapped to the `part_id` of that partition.
+        """
+        if shadow is not None and shadow >= 0:
+            self.shadow_refs[node_name] = shadow
+        else:
+            self.shadow_refs.pop(node_name, None)
+
+
+    @classmethod
+    def _collect_shadow_refs (
+        cls,
+        names: typing.List[str],
+        src_ids: np.ndarray,
+        src_shadow: pa.Array,
+        ) -> typing.Dict[str, int]:
+        """
+Private method to collect the shadow references from the encoded node
+rows, in bulk.
+        """
+        shadow: np.ndarray = src_shadow.to_numpy(zero_copy_only=False)
+        is_shadow: np.ndarray = shadow >= 0
+
+        return dict(zip(
+            [ names[node_id] for node_id in src_ids[is_shadow].tolist() ],
+            shadow[is_shadow].tolist(),
+        ))
+
+
     def get_edge_rel (
         self,
         rel_name: str,
@@ -284,14 +788,25 @@ Private method to populate a Node object from the given Parquet row data.
         ) -> int:
         """
 Lookup the integer index for the named edge relation.
+
+The relations get interned in both directions: `edge_rels` maps from
+index to name, while `edge_rel_ids` maps from name to index.
         """
-        if rel_name not in self.edge_rels:
-            if create:
-                self.edge_rels.append(rel_name)
-            else:
-                return NOT_FOUND
+        # rebuild the name => index map if `edge_rels` got assigned directly
+        if len(self.edge_rel_ids) != len(self.edge_rels):
+            self.edge_rel_ids = {
+                name: rel
+                for rel, name in enumerate(self.edge_rels)
+            }
 
-        return self.edge_rels.index(rel_name)
+        rel: int = self.edge_rel_ids.get(rel_name, NOT_FOUND)
+
+        if rel == NOT_FOUND and create:
+            rel = len(self.edge_rels)
+            self.edge_rels.append(rel_name)
+            self.edge_rel_ids[rel_name] = rel
+
+        return rel
 
 
     def create_edge (
@@ -305,9 +820,10 @@ Lookup the integer index for the named edge relation.
         """
 Create an edge, which is effectively a triple
         """
-        edge: Edge = Edge(
-            rel = self.get_edge_rel(rel_name, create=True, debug=debug),
-            node_id = dst_node.node_id,
+        edge: Edge = self._build_edge(
+            self.get_edge_rel(rel_name, create=True, debug=debug),
+            dst_node.node_id,
+            trusted = self.trusted,
         )
 
         src_node.add_edge(edge, debug=debug)
@@ -332,8 +848,14 @@ Private method to populate an Edge object from the given Parquet row data.
         )
 
         # add annotations
-        dst_node.truth = row["truth"]
-        dst_node.is_rdf = row["is_rdf"]
+        _assign_fields(
+            dst_node,
+            {
+                "truth": row["truth"],
+                "is_rdf": row["is_rdf"],
+            },
+            self.trusted,
+        )
 
         # create the edge
         edge: Edge = self.create_edge(
@@ -344,8 +866,14 @@ Private method to populate an Edge object from the given Parquet row data.
         )
 
         # add annotations
-        edge.truth = row["truth"]
-        edge.prop_map = self._load_props(row["props"], debug=debug)
+        _assign_fields(
+            edge,
+            {
+                "truth": row["truth"],
+                "prop_map": self._load_props(row["props"], debug=debug),
+            },
+            self.trusted,
+        )
 
         return edge
 
@@ -399,196 +927,1549 @@ Dump the metadata and content for an input Parquet file.
 
 
     @classmethod
-    def iter_load_parquet (
+    def iter_batch_parquet (
         cls,
         parq_file: pq.ParquetFile,
         *,
-        debug: bool = False,
-        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        batch_size: NonNegativeInt = BATCH_SIZE,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
         """
-Iterate through the rows in a Parquet file.
+Iterate through the record batches in a Parquet file, decoding whole
+columns at a time rather than converting each cell.
+
+Each batch gets returned along with the row number of its first row.
+This reads the file as-is, without merging any delta files, so use
+`iter_row_groups()` given a path for a base file which has deltas.
         """
         row_num: NonNegativeInt = 0
 
-        for batch in range(parq_file.num_row_groups):
-            row_group: pyarrow.lib.Table = parq_file.read_row_group(batch)  # pylint: disable=I1101
-
-            for r_idx in range(row_group.num_rows):
-                row: GraphRow = {}
-
-                for c_idx in range(row_group.num_columns):
-                    try:
-                        key: str = row_group.column_names[c_idx]
-                        col: pyarrow.lib.ChunkedArray = row_group.column(c_idx)  # pylint: disable=I1101
-                        val: typing.Any = col[r_idx]
-                        row[key] = val.as_py()
-                    except IndexError as ex:
-                        ic(ex, r_idx, c_idx)
-                        sys.exit(-1)
-
-                if debug:
-                    print()
-                    ic(r_idx, row)
-
-                yield row_num, row
-                row_num += 1
+        for batch in parq_file.iter_batches(batch_size=batch_size):
+            yield row_num, batch
+            row_num += batch.num_rows
 
 
-    def iter_load_csv (
-        self,
-        csv_path: cloudpathlib.AnyPath,
+    @classmethod
+    def iter_row_groups (
+        cls,
+        load_path: cloudpathlib.AnyPath,
         *,
-        encoding: str = "utf-8",
+        max_threads: int = 1,
         debug: bool = False,
-        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
         """
-Iterate through the rows in a CSV file.
+Iterate through the row groups in a Parquet file as record batches, in
+file order, while a pool of `max_threads` threads decodes the row groups
+which follow. Arrow releases the GIL while decoding, and each thread
+opens its own reader on the file, which gets closed when done.
+
+The pool gets capped at the CPU count; the default of one thread
+decodes sequentially, ahead of the consumer. Only single-core runs of
+`bench.py row-groups` have been measured, where pooled decoding ran at
+the same speed as sequential decoding; scaling across cores remains
+unmeasured.
+
+Nested row groups get flattened by the threads too, so each batch is in
+the flat layout, with row numbers counting its rows. Since the batches
+come back in file order, `parse_batches()` and `from_arrow()` handle the
+node rows whose edge rows straddle a row group boundary.
+
+When the file has delta files, the batches come from the base merged
+with its deltas by `read_merged()` instead, which reads every file and
+merges them in memory on the caller's thread, so `max_threads` has no
+effect.
         """
-        row_num: NonNegativeInt = 0
+        if len(list_deltas(load_path)) > 0:
+            # the delta module imports this one
+            from .delta import read_merged  # pylint: disable=C0415
 
-        with open(csv_path, encoding=encoding) as fp:
-            reader = csv.reader(
-                fp,
-                delimiter = ",",
-                quotechar = '"',
-            )
+            row_num: NonNegativeInt = 0
 
-            header = next(reader)
+            for batch in read_merged(load_path, debug=debug).to_batches():
+                yield row_num, batch
+                row_num += batch.num_rows
 
-            try:
-                for row_val in reader:
-                    row: GraphRow = dict(zip(header, row_val))
-                    row["edge_id"] = int(row["edge_id"])
-                    row["is_rdf"] = bool(ast.literal_eval(row["is_rdf"]))
-                    row["shadow"] = int(row["shadow"])
-                    row["truth"] = float(row["truth"])
+            return
 
-                    yield row_num, row
-                    row_num += 1
-            except ValueError as ex:
-                self._validation_error(row_num, row, str(ex))
-                sys.exit(-1)
+        num_threads: int = max(1, min(max_threads, os.cpu_count() or 1))
+        local: threading.local = threading.local()
+        readers: typing.List[pq.ParquetFile] = []
+        readers_lock: threading.Lock = threading.Lock()
 
+        meta_file: pq.ParquetFile = pq.ParquetFile(load_path.as_posix())
+        num_row_groups: int = meta_file.num_row_groups
+        meta_file.close()
 
-    def iter_load_rdf (
-        self,
-        rdf_path: cloudpathlib.AnyPath,
-        rdf_format: str,
-        *,
-        encoding: str = "utf-8",
-        debug: bool = False,
-        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
-        """
-Iterate through the rows implied by a RDF file.
-        """
-        row_num: NonNegativeInt = 0
-        graph = rdflib.Graph()
+        def _read_row_group (row_group: int) -> pa.Table:
+            if not hasattr(local, "parq_file"):
+                local.parq_file = pq.ParquetFile(load_path.as_posix())
 
-        graph.parse(
-            rdf_path,
-            format = rdf_format,
-            encoding = encoding,
-        )
+                with readers_lock:
+                    readers.append(local.parq_file)
 
-        for subj in graph.subjects(unique=True):  # type: ignore
-            # node representation for a triple
-            row: GraphRow = {}
-            row["src_name"] = str(subj)
-            row["truth"] = 1.0
-            row["edge_id"] = NOT_FOUND
-            row["rel_name"] = EMPTY_STRING
-            row["dst_name"] = EMPTY_STRING
-            row["is_rdf"] = True
-            row["shadow"] = Node.BASED_LOCAL
-            row["labels"] = EMPTY_STRING
-            row["props"] = EMPTY_STRING
+            table: pa.Table = local.parq_file.read_row_group(row_group, use_threads=False)
 
-            if debug:
-                ic("node", subj, row_num, row)
+            if cls._is_nested(table.schema):
+                table = cls.flatten_table(table)
 
-            yield row_num, row
-            row_num += 1
+            return table.combine_chunks()
 
-            for _, pred, objt in graph.triples((subj, None, None)):
-                if debug:
-                    ic(subj, pred, objt)
+        try:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                # bound the row groups decoded ahead of the consumer
+                pending: typing.Deque[Future] = collections.deque()
+                next_group: int = 0
+                row_num = 0
 
-                # edge representation for a triple
-                row = {}
-                row["src_name"] = str(subj)
-                row["truth"] = 1.0
-                row["edge_id"] = 1
-                row["rel_name"] = str(pred)
-                row["dst_name"] = str(objt)
-                row["is_rdf"] = True
-                row["shadow"] = Node.BASED_LOCAL
-                row["labels"] = EMPTY_STRING
-                row["props"] = EMPTY_STRING
+                try:
+                    while next_group < num_row_groups or len(pending) > 0:
+                        while next_group < num_row_groups and len(pending) < num_threads * 2:
+                            pending.append(executor.submit(_read_row_group, next_group))
+                            next_group += 1
 
-                if debug:
-                    ic("edge", objt, row_num, row)
+                        table: pa.Table = pending.popleft().result()
 
-                yield row_num, row
-                row_num += 1
+                        if debug:
+                            ic(row_num, table.num_rows)
 
+                        for batch in table.to_batches():
+                            yield row_num, batch
+                            row_num += batch.num_rows
+                finally:
+                    # when the consumer stops early, skip the decoding ahead
+                    for future in pending:
+                        future.cancel()
+        finally:
+            for parq_file in readers:
+                parq_file.close()
 
-    def parse_rows (
-        self,
-        iter_load: typing.Iterable[typing.Tuple[int, GraphRow]],
-        *,
-        debug: bool = False,
-        ) -> None:
+
+    @classmethod
+    def _fill_defaults (
+        cls,
+        table: pa.Table,
+        schema: typing.Optional[pa.Schema] = None,
+        ) -> pa.Table:
         """
-Parse a stream of rows to construct a graph partition.
+Private method to add default values for any columns which are missing
+from a table, e.g., not read with `ScanOptions`, then put it into the
+given schema, by default the flat NOCK schema which matches its `props`.
         """
-        for row_num, row in track(iter_load, description=f"parse rows"):
-            # have we reached a row which begins a new node?
-            if row["edge_id"] < 0:
-                try:
-                    src_node: Node = self._populate_node(row, debug=debug)
+        fill_schema: pa.Schema = NOCK_SCHEMA if schema is None else schema
 
-                    if debug:
-                        print()
-                        ic(src_node)
-                except ValidationError as ex:
-                    self._validation_error(row_num, row, str(ex))
-                    sys.exit(-1)
+        for name, value in ScanOptions.DEFAULT_VALUES.items():
+            if name not in table.schema.names:
+                field: pa.Field = fill_schema.field(name)
+                value_type: pa.DataType = field.type
 
-            # validate the node/edge sequencing and consistency among the rows
-            elif row["src_name"] != src_node.name:
-                error_node = row["src_name"]
-                message = f"|{ error_node }| out of sequence at row { row_num }"
-                raise ValueError(message)
+                if pa.types.is_map(value_type):
+                    value = []
+                elif pa.types.is_dictionary(value_type):
+                    value_type = value_type.value_type
 
-            # otherwise this row is an edge for the most recent node
-            else:
-                try:
-                    edge: Edge = self._populate_edge(row, src_node, debug=debug)
+                col: pa.Array = pa.repeat(pa.scalar(value, value_type), table.num_rows)
+                table = table.append_column(field.name, col.cast(field.type))
 
-                    if debug:
-                        ic(edge)
-                except ValidationError as ex:
-                    self._validation_error(row_num, row, str(ex))
-                    sys.exit(-1)
+        if schema is None:
+            schema = NOCK_MAP_SCHEMA if cls._has_props_map(table.schema) else NOCK_SCHEMA
 
+        return table.select(schema.names).cast(schema)
 
-    def iter_gen_rows (
-        self,
+
+    @classmethod
+    def iter_batch_dataset (
+        cls,
+        load_paths: typing.List[cloudpathlib.AnyPath],
         *,
-        sort: bool = False,
+        scan: typing.Optional[ScanOptions] = None,
+        batch_size: NonNegativeInt = BATCH_SIZE,
         debug: bool = False,
-        ) -> typing.Iterable[GraphRow]:
+        ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
         """
-Iterator for generating rows on writes.
+Iterate through the record batches in NOCK Parquet files, scanned with
+`pyarrow.dataset` so that the projection and the predicates in `scan`
+get pushed down into the reads.
+
+Each file gets scanned on its own, since the files may differ in
+layout. For the nested layout, only the node predicates get pushed
+down, then the edge predicates apply after flattening.
+
+Each batch gets returned in the flat NOCK schema, along with the row
+number of its first row among the rows selected. A file which has delta
+files gets scanned as its base merged with its deltas.
+        """
+        if scan is None:
+            scan = ScanOptions()
+
+        read_columns: typing.List[str] = scan.read_columns()
+        node_filter: typing.Optional[ds.Expression] = scan.node_filter()
+        edge_filter: typing.Optional[ds.Expression] = scan.edge_filter()
+        row_num: NonNegativeInt = 0
+
+        for load_path in load_paths:
+            if len(list_deltas(load_path)) > 0:
+                # the delta module imports this one
+                from .delta import read_merged  # pylint: disable=C0415
+
+                dataset: ds.Dataset = ds.dataset(read_merged(load_path, debug=debug))
+            else:
+                dataset = ds.dataset(load_path.as_posix(), format="parquet")
+
+            nested: bool = cls._is_nested(dataset.schema)
+            props_map: bool = cls._has_props_map(dataset.schema)
+            row_filter: typing.Optional[ds.Expression] = node_filter
+
+            if nested:
+                columns: typing.List[str] = [
+                    name
+                    for name in dataset.schema.names
+                    if name in read_columns or name == "edges"
+                ]
+            else:
+                columns = [ name for name in read_columns if name in dataset.schema.names ]
+
+                if edge_filter is not None:
+                    row_filter = edge_filter if row_filter is None else row_filter & edge_filter
+
+            scanner: ds.Scanner = dataset.scanner(
+                columns = columns,
+                filter = row_filter,
+                batch_size = batch_size,
+            )
+
+            for batch in scanner.to_batches():
+                if batch.num_rows < 1:
+                    continue
+
+                table: pa.Table = pa.Table.from_batches([ batch ])
+
+                if nested:
+                    table = cls.flatten_table(cls._fill_defaults(
+                        table,
+                        NESTED_MAP_SCHEMA if props_map else NESTED_SCHEMA,
+                    ))
+
+                    if edge_filter is not None:
+                        table = table.filter(edge_filter)
+
+                    table = table.select(read_columns)
+
+                table = cls._fill_defaults(table).combine_chunks()
+
+                if debug:
+                    ic(load_path, row_num, table.num_rows)
+
+                for out_batch in table.to_batches():
+                    yield row_num, out_batch
+                    row_num += out_batch.num_rows
+
+
+    @classmethod
+    def load_dataset (
+        cls,
+        load_paths: typing.List[cloudpathlib.AnyPath],
+        *,
+        scan: typing.Optional[ScanOptions] = None,
+        part_id: IndexInts = NOT_FOUND,  # type: ignore
+        trusted: bool = False,
+        debug: bool = False,
+        ) -> "Partition":
+        """
+Load NOCK Parquet files into a partition, reading only the columns and
+rows selected by `scan`, via `iter_batch_dataset()`.
+        """
+        batches: typing.List[pa.RecordBatch] = [
+            batch
+            for _, batch in cls.iter_batch_dataset(load_paths, scan=scan, debug=debug)
+        ]
+
+        if len(batches) < 1:
+            return cls(part_id = part_id, trusted = trusted)
+
+        return cls.from_arrow(
+            batches,
+            part_id = part_id,
+            trusted = trusted,
+            debug = debug,
+        )
+
+
+    @classmethod
+    def load_file_parquet (
+        cls,
+        load_path: cloudpathlib.AnyPath,
+        *,
+        max_threads: int = 1,
+        part_id: IndexInts = NOT_FOUND,  # type: ignore
+        trusted: bool = False,
+        debug: bool = False,
+        ) -> "Partition":
+        """
+Load a Parquet file into a partition, decoding its row groups in a
+pool of up to `max_threads` threads with `iter_row_groups()`, then
+building the partition in bulk with `from_arrow()`. Any delta files of
+the file get merged, serially.
+        """
+        batches: typing.List[pa.RecordBatch] = [
+            batch
+            for _, batch in cls.iter_row_groups(load_path, max_threads=max_threads, debug=debug)
+        ]
+
+        if len(batches) < 1:
+            return cls(part_id = part_id, trusted = trusted)
+
+        return cls.from_arrow(
+            batches,
+            part_id = part_id,
+            trusted = trusted,
+            debug = debug,
+        )
+
+
+    @classmethod
+    def _iter_batch_rows (
+        cls,
+        batch: pa.RecordBatch,
+        ) -> typing.Iterable[GraphRow]:
+        """
+Private method to iterate through the rows in a record batch, converting
+each column to Python values in bulk.
+        """
+        col_names: typing.List[str] = batch.schema.names
+        col_vals: typing.List[list] = []
+
+        for col_name, col in zip(col_names, batch.columns):
+            if pa.types.is_map(col.type):
+                col_vals.append(cls.decode_props(col))
+            elif col_name == "truth":
+                col_vals.append(_widen_truth(col).to_pylist())
+            else:
+                col_vals.append(col.to_pylist())
+
+        for vals in zip(*col_vals):
+            yield dict(zip(col_names, vals))
+
+
+    @classmethod
+    def iter_load_parquet (
+        cls,
+        parq_file: pq.ParquetFile,
+        *,
+        debug: bool = False,
+        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        """
+Iterate through the rows in a Parquet file, read as-is like
+`iter_batch_parquet()`, without merging any delta files.
+        """
+        iter_batch = cls.iter_batch_parquet(
+            parq_file,
+            debug = debug,
+        )
+
+        for row_num, batch in iter_batch:
+            if cls._is_nested(batch.schema):
+                batch = cls._flatten_batch(batch)
+
+            for row in cls._iter_batch_rows(batch):
+                if debug:
+                    print()
+                    ic(row_num, row)
+
+                yield row_num, row
+                row_num += 1
+
+
+    @classmethod
+    def iter_batch_csv (  # pylint: disable=R0913
+        cls,
+        csv_path: cloudpathlib.AnyPath,
+        *,
+        encoding: str = "utf-8",
+        block_size: NonNegativeInt = CSV_BLOCK_SIZE,
+        use_threads: bool = True,
+        report: typing.Optional[ValidationReport] = None,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
+        """
+Iterate through the record batches in a CSV file, using the `pyarrow`
+streaming CSV reader with the NOCK column types declared up front, which
+parses blocks of `block_size` bytes using multiple threads.
+
+Each batch gets returned along with the row number of its first row,
+to feed into `parse_batches()` or `from_arrow()`.
+
+The `truth` column gets parsed as `float64`, which matches the values
+parsed by `iter_load_csv()`.
+
+When a `report` is given, the rows which cannot get converted, or which
+have the wrong number of columns, get added to it as errors then
+skipped, rather than raising an error; see `_iter_checked_csv()`.
+        """
+        column_types: pa.Schema = NOCK_SCHEMA.set(
+            NOCK_SCHEMA.get_field_index("truth"),
+            pa.field("truth", pa.float64()),
+        )
+
+        if report is not None:
+            yield from cls._iter_checked_csv(
+                csv_path,
+                column_types,
+                report,
+                encoding = encoding,
+                block_size = block_size,
+            )
+
+            return
+
+        reader: typing.Optional[pyarrow.csv.CSVStreamingReader] = None
+        row_num: NonNegativeInt = 0
+
+        # opening the reader parses the first block, which may fail
+        try:
+            reader = pyarrow.csv.open_csv(
+                csv_path.as_posix(),
+                read_options = pyarrow.csv.ReadOptions(
+                    encoding = encoding,
+                    block_size = block_size,
+                    use_threads = use_threads,
+                ),
+                convert_options = pyarrow.csv.ConvertOptions(
+                    column_types = column_types,
+                    true_values = [ "True", "true" ],
+                    false_values = [ "False", "false" ],
+                    strings_can_be_null = False,
+                ),
+            )
+
+            for batch in reader:
+                yield row_num, batch
+                row_num += batch.num_rows
+        except pa.ArrowInvalid as ex:
+            raise ValueError(f"CSV row after { row_num }: { ex }") from ex
+        finally:
+            if reader is not None:
+                reader.close()
+
+
+    @classmethod
+    def _convert_csv_column (
+        cls,
+        col: pa.Array,
+        col_type: pa.DataType,
+        ) -> typing.Tuple[pa.Array, np.ndarray]:
+        """
+Private method to convert a column of CSV strings to its NOCK type,
+returning the converted column along with a mask of the values which
+failed to convert, which become null.
+        """
+        bad: np.ndarray = np.zeros(len(col), dtype=np.bool_)
+
+        if pa.types.is_string(col_type) or pa.types.is_dictionary(col_type):
+            return col.cast(col_type), bad
+
+        col = pc.if_else(pc.is_in(col, value_set=CSV_NULL_VALUES), pa.scalar(None, pa.string()), col)
+
+        try:
+            return col.cast(col_type), bad
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+
+        # convert one value at a time, only for a column which fails
+        values: typing.List[typing.Any] = []
+
+        for offset, value in enumerate(col.to_pylist()):
+            try:
+                values.append(pa.array([ value ], pa.string()).cast(col_type)[0].as_py())
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                bad[offset] = True
+                values.append(None)
+
+        return pa.array(values, col_type), bad
+
+
+    @classmethod
+    def _iter_checked_csv (  # pylint: disable=R0913,R0914
+        cls,
+        csv_path: cloudpathlib.AnyPath,
+        column_types: pa.Schema,
+        report: ValidationReport,
+        *,
+        encoding: str = "utf-8",
+        block_size: NonNegativeInt = CSV_BLOCK_SIZE,
+        ) -> typing.Iterable[typing.Tuple[int, pa.RecordBatch]]:
+        """
+Private method to iterate through the record batches in a CSV file,
+reading every column as strings then converting these, so that the rows
+which fail get added to the report as errors then skipped. The kept rows
+get returned in batches of consecutive row numbers.
+
+The skipped rows get counted in `report.num_rows`, while the kept rows
+get counted by the checks which run over the batches.
+        """
+        # row numbers of the rows with the wrong number of columns, not
+        # counting the header row; these get reported while parsing
+        skipped: typing.List[int] = []
+
+        def _invalid_row (row: pyarrow.csv.InvalidRow) -> str:
+            skipped.append(row.number - 2)
+            report.add(row.number - 2, None, f"expected { row.expected_columns } columns, found { row.actual_columns }")
+            return "skip"
+
+        reader: typing.Optional[pyarrow.csv.CSVStreamingReader] = None
+        next_row: int = 0
+        num_issues: int = report.num_errors
+
+        try:
+            reader = pyarrow.csv.open_csv(
+                csv_path.as_posix(),
+                read_options = pyarrow.csv.ReadOptions(
+                    encoding = encoding,
+                    block_size = block_size,
+                    use_threads = False,
+                ),
+                parse_options = pyarrow.csv.ParseOptions(
+                    invalid_row_handler = _invalid_row,
+                ),
+                convert_options = pyarrow.csv.ConvertOptions(
+                    column_types = { name: pa.string() for name in column_types.names },
+                    strings_can_be_null = False,
+                ),
+            )
+
+            for batch in reader:
+                if batch.num_rows < 1:
+                    continue
+
+                # the row number of each row, past the skipped rows
+                row_idx: np.ndarray = np.arange(next_row, next_row + batch.num_rows + len(skipped))
+                row_idx = row_idx[~np.isin(row_idx, skipped)][:batch.num_rows]
+                next_row = int(row_idx[-1]) + 1
+
+                report.num_rows += sum(1 for skip_row in skipped if skip_row < next_row)
+                skipped[:] = [ skip_row for skip_row in skipped if skip_row >= next_row ]
+
+                keep: np.ndarray = np.ones(batch.num_rows, dtype=np.bool_)
+                cols: typing.List[pa.Array] = []
+
+                for field in column_types:
+                    col, bad = cls._convert_csv_column(batch.column(field.name), field.type)
+                    cols.append(col)
+
+                    for offset in np.flatnonzero(bad & keep).tolist():
+                        report.add(int(row_idx[offset]), field.name, f"cannot convert to { field.type }")
+
+                    keep &= ~bad
+
+                # list the errors for this block in row order
+                report.issues[num_issues:] = sorted(report.issues[num_issues:], key=lambda issue: issue.row_num)
+                report.num_rows += int((~keep).sum())
+                converted: pa.RecordBatch = pa.RecordBatch.from_arrays(cols, schema=column_types)
+
+                # split the kept rows into runs of consecutive row numbers
+                kept: np.ndarray = np.flatnonzero(keep)
+                runs: typing.List[np.ndarray] = np.split(kept, np.flatnonzero(np.diff(row_idx[kept]) != 1) + 1)
+
+                for run in runs:
+                    if len(run) > 0:
+                        yield int(row_idx[run[0]]), converted.take(pa.array(run))
+
+                num_issues = report.num_errors
+
+                if report.over_budget:
+                    return
+
+            report.num_rows += len(skipped)
+        except pa.ArrowInvalid as ex:
+            raise ValueError(f"CSV row after { next_row }: { ex }") from ex
+        finally:
+            if reader is not None:
+                reader.close()
+
+
+    def iter_load_csv (
+        self,
+        csv_path: cloudpathlib.AnyPath,
+        *,
+        encoding: str = "utf-8",
+        engine: str = "python",
+        report: typing.Optional[ValidationReport] = None,
+        debug: bool = False,
+        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        """
+Iterate through the rows in a CSV file.
+
+Use `engine = "arrow"` to parse the file with the `pyarrow` CSV reader,
+which is much faster than the `csv` module.
+
+When a `report` is given, the rows which cannot get converted get added
+to it as errors then skipped, rather than exiting.
+        """
+        if engine not in ( "python", "arrow" ):
+            raise ValueError(f"unknown CSV engine: { engine }")
+
+        row_num: NonNegativeInt = 0
+
+        if engine == "arrow":
+            for row_num, batch in self.iter_batch_csv(csv_path, encoding=encoding, report=report, debug=debug):
+                for row in self._iter_batch_rows(batch):
+                    yield row_num, row
+                    row_num += 1
+
+            return
+
+        with open(csv_path, encoding=encoding) as fp:
+            reader = csv.reader(
+                fp,
+                delimiter = ",",
+                quotechar = '"',
+            )
+
+            header = next(reader)
+
+            for row_val in reader:
+                row: GraphRow = dict(zip(header, row_val))
+
+                try:
+                    if len(row_val) != len(header):
+                        raise ValueError(f"expected { len(header) } columns, found { len(row_val) }")
+
+                    row["edge_id"] = int(row["edge_id"])
+                    row["is_rdf"] = bool(ast.literal_eval(row["is_rdf"]))
+                    row["shadow"] = int(row["shadow"])
+                    row["truth"] = float(row["truth"])
+                except ValueError as ex:
+                    if report is None:
+                        self._validation_error(row_num, row, str(ex))
+                        sys.exit(-1)
+
+                    report.add(row_num, None, str(ex))
+                    report.num_rows += 1
+                    row_num += 1
+
+                    if report.over_budget:
+                        return
+
+                    continue
+
+                yield row_num, row
+                row_num += 1
+
+
+    @classmethod
+    def _rdf_node_row (
+        cls,
+        subj: str,
+        ) -> GraphRow:
+        """
+Private method to generate the node row for the subject of a triple.
+        """
+        return {
+            "src_name": subj,
+            "truth": 1.0,
+            "edge_id": NOT_FOUND,
+            "rel_name": EMPTY_STRING,
+            "dst_name": EMPTY_STRING,
+            "is_rdf": True,
+            "shadow": Node.BASED_LOCAL,
+            "labels": EMPTY_STRING,
+            "props": EMPTY_STRING,
+        }
+
+
+    @classmethod
+    def _rdf_edge_row (
+        cls,
+        subj: str,
+        pred: str,
+        objt: str,
+        ) -> GraphRow:
+        """
+Private method to generate the edge row for a triple.
+        """
+        return {
+            "src_name": subj,
+            "truth": 1.0,
+            "edge_id": 1,
+            "rel_name": pred,
+            "dst_name": objt,
+            "is_rdf": True,
+            "shadow": Node.BASED_LOCAL,
+            "labels": EMPTY_STRING,
+            "props": EMPTY_STRING,
+        }
+
+
+    def iter_load_rdf (
+        self,
+        rdf_path: cloudpathlib.AnyPath,
+        rdf_format: str,
+        *,
+        encoding: str = "utf-8",
+        sort_subjects: bool = True,
+        spill_size: NonNegativeInt = SPILL_SIZE,
+        debug: bool = False,
+        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        """
+Iterate through the rows implied by a RDF file.
+
+The N-Triples and N-Quads formats get parsed as a stream, one line at
+a time. By default `sort_subjects` groups the triples for each subject
+by an external sort, which spills to temporary files in chunks of
+`spill_size` triples, so the rows match what parsing through `rdflib`
+produces. Other formats get parsed into an `rdflib.Graph` first.
+
+Set `sort_subjects` to `False` to yield rows incrementally when the
+input already groups triples by subject. Otherwise, each run of a
+subject which is not contiguous emits another node row, and duplicate
+triples only get removed within the same run.
+        """
+        if rdf_format in STREAM_FORMATS:
+            yield from self._iter_stream_rdf(
+                rdf_path,
+                encoding = encoding,
+                sort_subjects = sort_subjects,
+                spill_size = spill_size,
+                debug = debug,
+            )
+
+            return
+
+        row_num: NonNegativeInt = 0
+        graph = rdflib.Graph()
+
+        graph.parse(
+            rdf_path,
+            format = rdf_format,
+            encoding = encoding,
+        )
+
+        for subj in graph.subjects(unique=True):  # type: ignore
+            # node representation for a triple
+            row: GraphRow = self._rdf_node_row(str(subj))
+
+            if debug:
+                ic("node", subj, row_num, row)
+
+            yield row_num, row
+            row_num += 1
+
+            for _, pred, objt in graph.triples((subj, None, None)):
+                if debug:
+                    ic(subj, pred, objt)
+
+                # edge representation for a triple
+                row = self._rdf_edge_row(str(subj), str(pred), str(objt))
+
+                if debug:
+                    ic("edge", objt, row_num, row)
+
+                yield row_num, row
+                row_num += 1
+
+
+    def _iter_stream_rdf (
+        self,
+        rdf_path: cloudpathlib.AnyPath,
+        *,
+        encoding: str = "utf-8",
+        sort_subjects: bool = True,
+        spill_size: NonNegativeInt = SPILL_SIZE,
+        debug: bool = False,
+        ) -> typing.Iterable[typing.Tuple[int, GraphRow]]:
+        """
+Private method to iterate through the rows implied by an N-Triples or
+N-Quads file, parsed as a stream of lines.
+        """
+        row_num: NonNegativeInt = 0
+        last_subj: typing.Optional[str] = None
+        seen: typing.Set[typing.Tuple[str, str]] = set()
+
+        with open(rdf_path, encoding=encoding) as fp:
+            triples: typing.Iterable[Triple] = iter_triples(fp)
+
+            if sort_subjects:
+                triples = iter_spill_sorted(triples, spill_size=spill_size)
+
+            for subj, pred, objt in triples:
+                # node representation, as each new subject begins
+                if subj != last_subj:
+                    row: GraphRow = self._rdf_node_row(subj)
+
+                    if debug:
+                        ic("node", subj, row_num, row)
+
+                    yield row_num, row
+                    row_num += 1
+                    last_subj = subj
+                    seen.clear()
+
+                # drop duplicate triples, as an `rdflib.Graph` would
+                if ( pred, objt ) in seen:
+                    continue
+
+                seen.add(( pred, objt ))
+
+                # edge representation for a triple
+                row = self._rdf_edge_row(subj, pred, objt)
+
+                if debug:
+                    ic("edge", objt, row_num, row)
+
+                yield row_num, row
+                row_num += 1
+
+
+    def _parse_row (
+        self,
+        row_num: NonNegativeInt,
+        row: GraphRow,
+        src_node: typing.Optional[Node],
+        *,
+        report: typing.Optional[ValidationReport] = None,
+        debug: bool = False,
+        ) -> typing.Optional[Node]:
+        """
+Private method to parse one row, given the most recent src node, and
+return the src node for the rows which follow.
+
+When a `report` is given, a row which fails gets added to it as an
+error then skipped, rather than exiting.
+        """
+        try:
+            # have we reached a row which begins a new node?
+            if row["edge_id"] < 0:
+                src_node = self._populate_node(row, debug=debug)
+
+                if debug:
+                    print()
+                    ic(src_node)
+
+            # validate the node/edge sequencing and consistency among the rows
+            elif src_node is None or row["src_name"] != src_node.name:
+                if report is not None:
+                    report.add(row_num, "src_name", "out of sequence")
+                    return src_node
+
+                error_node = row["src_name"]
+                message = f"|{ error_node }| out of sequence at row { row_num }"
+                raise ValueError(message)
+
+            # otherwise this row is an edge for the most recent node
+            else:
+                edge: Edge = self._populate_edge(row, src_node, debug=debug)
+
+                if debug:
+                    ic(edge)
+        except (ValidationError, ValueError, IndexError) as ex:
+            if report is not None:
+                report.add(row_num, None, str(ex))
+            elif isinstance(ex, ValidationError):
+                self._validation_error(row_num, row, str(ex))
+                sys.exit(-1)
+            else:
+                raise
+
+        return src_node
+
+
+    def parse_rows (
+        self,
+        iter_load: typing.Iterable[typing.Tuple[int, GraphRow]],
+        *,
+        report: typing.Optional[ValidationReport] = None,
+        progress: ProgressHook = "auto",
+        progress_every: int = PROGRESS_EVERY,
+        debug: bool = False,
+        ) -> typing.Optional[ValidationReport]:
+        """
+Parse a stream of rows to construct a graph partition.
+
+The `progress` hook reports throughput every `progress_every` rows, as
+described in `iter_progress()`.
+
+When a `report` is given, the range checks of `check_batch()` run over
+each row first, then the rows which fail get collected into it as
+errors and skipped, until the errors exceed its error budget, then the
+report gets returned.
+        """
+        src_node: typing.Optional[Node] = None
+
+        iter_load = iter_progress(
+            iter_load,
+            progress = progress,
+            description = "parse rows",
+            every = progress_every,
+        )
+
+        for row_num, row in iter_load:
+            if report is None or check_row(row_num, row, report):
+                src_node = self._parse_row(row_num, row, src_node, report=report, debug=debug)
+
+            if report is not None:
+                report.num_rows += 1
+
+                if report.over_budget:
+                    break
+
+        return report
+
+
+    def parse_batches (
+        self,
+        iter_batch: typing.Iterable[typing.Tuple[int, pa.RecordBatch]],
+        *,
+        report: typing.Optional[ValidationReport] = None,
+        progress: ProgressHook = "auto",
+        progress_every: int = PROGRESS_EVERY,
+        debug: bool = False,
+        ) -> typing.Optional[ValidationReport]:
+        """
+Parse a stream of record batches to construct a graph partition.
+
+The node/edge sequencing carries across batch boundaries, so a node's
+edge rows may continue into the next batch.
+
+The `progress` hook reports throughput, along with the bytes decoded,
+after the batch which crosses each `progress_every` rows.
+
+When a `report` is given, the vectorized checks in `check_batch()` run
+over each batch first, and the rows which fail get collected into it as
+errors and skipped, until the errors exceed its error budget, then the
+report gets returned.
+        """
+        src_node: typing.Optional[Node] = None
+        last_src: typing.Optional[str] = None
+
+        iter_batch = iter_progress(
+            iter_batch,
+            progress = progress,
+            description = "parse batches",
+            every = progress_every,
+            batches = True,
+        )
+
+        for row_num, batch in iter_batch:
+            if self._is_nested(batch.schema):
+                if report is None:
+                    self._parse_nested_batch(row_num, batch, debug=debug)
+                    continue
+
+                # flatten, so the row numbers in the report count the
+                # rows of the flat layout
+                batch = self._flatten_batch(batch)
+                row_num = report.num_rows
+
+            if report is None:
+                for row in self._iter_batch_rows(batch):
+                    src_node = self._parse_row(row_num, row, src_node, debug=debug)
+                    row_num += 1
+
+                continue
+
+            keep, last_src = check_batch(row_num, batch, report, last_src=last_src)
+
+            if report.over_budget:
+                break
+
+            for row_ok, row in zip(keep.tolist(), self._iter_batch_rows(batch)):
+                if row_ok:
+                    src_node = self._parse_row(row_num, row, src_node, report=report, debug=debug)
+
+                row_num += 1
+
+            if report.over_budget:
+                break
+
+        return report
+
+
+    @classmethod
+    def _flatten_batch (
+        cls,
+        batch: pa.RecordBatch,
+        ) -> pa.RecordBatch:
+        """
+Private method to convert a record batch from the nested layout to the
+flat NOCK layout.
+        """
+        table: pa.Table = cls.flatten_table(pa.Table.from_batches([ batch ]))
+        batches: typing.List[pa.RecordBatch] = table.combine_chunks().to_batches()
+
+        if len(batches) < 1:
+            return pa.RecordBatch.from_pylist([], schema=table.schema)
+
+        return batches[0]
+
+
+    @classmethod
+    def validate_batches (
+        cls,
+        iter_batch: typing.Iterable[typing.Tuple[int, pa.RecordBatch]],
+        *,
+        error_budget: NonNegativeInt = ERROR_BUDGET,
+        report: typing.Optional[ValidationReport] = None,
+        debug: bool = False,
+        ) -> ValidationReport:
+        """
+Run the vectorized checks in `check_batch()` over a stream of record
+batches, without constructing a partition, returning a report of the
+errors found.
+
+Pass a `report` to collect into, e.g., the same report given to
+`iter_batch_csv()`, otherwise a new one gets created.
+        """
+        if report is None:
+            report = ValidationReport(
+                error_budget = error_budget,
+            )
+
+        last_src: typing.Optional[str] = None
+
+        for row_num, batch in iter_batch:
+            if cls._is_nested(batch.schema):
+                batch = cls._flatten_batch(batch)
+                row_num = report.num_rows
+
+            _, last_src = check_batch(row_num, batch, report, last_src=last_src)
+
+            if debug:
+                ic(row_num, report.num_errors)
+
+            if report.over_budget:
+                break
+
+        return report
+
+
+    def _parse_nested_batch (
+        self,
+        row_num: NonNegativeInt,
+        batch: pa.RecordBatch,
+        *,
+        debug: bool = False,
+        ) -> None:
+        """
+Private method to parse a record batch in the nested layout, where each
+node row carries its own edges, so no sequencing check is needed.
+        """
+        # decode the edge properties in bulk, since Parquet maps within
+        # the nested edges would otherwise come back as lists of pairs
+        edge_lists: pa.ListArray = batch.column(batch.schema.get_field_index("edges"))
+        edge_props: typing.Iterator[PropMap] = iter(
+            self.decode_props(pc.list_flatten(edge_lists).field("props"))
+        )
+
+        for row in self._iter_batch_rows(batch):
+            try:
+                src_node: Node = self._populate_node(row, debug=debug)
+
+                for edge_row in row["edges"] or []:
+                    edge_row["src_name"] = row["src_name"]
+                    edge_row["is_rdf"] = row["is_rdf"]
+                    edge_row["props"] = next(edge_props)
+                    self._populate_edge(edge_row, src_node, debug=debug)
+            except ValidationError as ex:
+                self._validation_error(row_num, row, str(ex))
+                sys.exit(-1)
+
+            row_num += 1
+
+
+    @classmethod
+    def _last_row_index (
+        cls,
+        ids: np.ndarray,
+        row_idx: np.ndarray,
+        size: int,
+        ) -> np.ndarray:
+        """
+Private method to find the last row index at which each id occurs, or
+`NOT_FOUND` for ids which never occur.
+        """
+        last: np.ndarray = np.full(size, NOT_FOUND, dtype=np.int64)
+        np.maximum.at(last, ids, row_idx)
+
+        return last
+
+
+    @classmethod
+    def _check_sequence (
+        cls,
+        src_name: pa.Array,
+        is_node: np.ndarray,
+        ) -> np.ndarray:
+        """
+Private method to validate the node/edge sequencing, where each edge row
+must follow the node row of its src node, returning the index of the
+most recent node row for every row.
+        """
+        row_idx: np.ndarray = np.arange(len(is_node))
+        last_node: np.ndarray = np.maximum.accumulate(np.where(is_node, row_idx, NOT_FOUND))
+        same_src: np.ndarray = pc.equal(src_name, src_name.take(np.maximum(last_node, 0))).to_numpy(zero_copy_only=False)
+        out_of_seq: np.ndarray = ~is_node & ((last_node < 0) | ~same_src)
+
+        if out_of_seq.any():
+            bad_row = int(np.argmax(out_of_seq))
+            error_node = src_name[bad_row].as_py()
+            raise ValueError(f"|{ error_node }| out of sequence at row { bad_row }")
+
+        return last_node
+
+
+    @classmethod
+    def _is_nested (
+        cls,
+        schema: pa.Schema,
+        ) -> bool:
+        """
+Private method to test whether a schema uses the nested layout.
+        """
+        return "edges" in schema.names
+
+
+    @classmethod
+    def nest_table (
+        cls,
+        table: pa.Table,
+        ) -> pa.Table:
+        """
+Convert a table from the flat NOCK layout to the nested layout, where
+each node row carries a list of its edges, which avoids repeating the
+`src_name` and `is_rdf` values on every edge row.
+        """
+        props_map: bool = cls._has_props_map(table.schema)
+        flat_schema: pa.Schema = NOCK_MAP_SCHEMA if props_map else NOCK_SCHEMA
+        nested_schema: pa.Schema = NESTED_MAP_SCHEMA if props_map else NESTED_SCHEMA
+        edge_type: pa.DataType = nested_schema.field("edges").type.value_type
+
+        table = table.select(flat_schema.names).cast(flat_schema).combine_chunks()
+        is_node: np.ndarray = pc.less(table["edge_id"], 0).to_numpy()
+
+        cls._check_sequence(table["src_name"].combine_chunks(), is_node)
+
+        nodes: pa.Table = table.filter(is_node)
+        edges: pa.Table = table.filter(~is_node)
+
+        # edge rows follow their node row, so the edge list offsets are
+        # a running count of the edges for each node
+        parent: np.ndarray = (np.cumsum(is_node) - 1)[~is_node]
+        offsets: np.ndarray = np.zeros(nodes.num_rows + 1, dtype=np.int32)
+        np.cumsum(np.bincount(parent, minlength=nodes.num_rows), out=offsets[1:])
+
+        edge_structs: pa.StructArray = pa.StructArray.from_arrays(
+            [ edges[field.name].combine_chunks().cast(field.type) for field in edge_type ],
+            fields = list(edge_type),
+        )
+
+        return pa.Table.from_arrays(
+            [ nodes[field.name] for field in nested_schema if field.name != "edges" ] + [
+                pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), edge_structs),
+            ],
+            schema = nested_schema,
+        )
+
+
+    @classmethod
+    def flatten_table (
+        cls,
+        table: pa.Table,
+        ) -> pa.Table:
+        """
+Convert a table from the nested layout to the flat NOCK layout, with
+the edge rows of each node following its node row.
+        """
+        table = table.combine_chunks()
+        num_nodes: int = table.num_rows
+        flat_schema: pa.Schema = NOCK_MAP_SCHEMA if cls._has_props_map(table.schema) else NOCK_SCHEMA
+
+        edge_lists: pa.ListArray = table["edges"].combine_chunks()
+        edge_structs: pa.StructArray = pc.list_flatten(edge_lists)
+        parent: np.ndarray = pc.list_parent_indices(edge_lists).to_numpy(zero_copy_only=False)
+        num_edges: int = len(parent)
+
+        nodes: pa.Table = pa.Table.from_arrays(
+            [
+                table["src_name"],
+                pa.array(np.full(num_nodes, NOT_FOUND, dtype=np.int32)),
+                pa.nulls(num_nodes, NOCK_SCHEMA.field("rel_name").type),
+                pa.nulls(num_nodes, pa.string()),
+                table["truth"],
+                table["shadow"],
+                table["is_rdf"],
+                table["labels"],
+                table["props"],
+            ],
+            schema = flat_schema,
+        )
+
+        edges: pa.Table = pa.Table.from_arrays(
+            [
+                table["src_name"].take(parent),
+                edge_structs.field("edge_id"),
+                edge_structs.field("rel_name").cast(NOCK_SCHEMA.field("rel_name").type),
+                edge_structs.field("dst_name"),
+                edge_structs.field("truth"),
+                pa.array(np.full(num_edges, Node.BASED_LOCAL, dtype=np.int32)),
+                table["is_rdf"].take(parent),
+                pa.nulls(num_edges, NOCK_SCHEMA.field("labels").type),
+                edge_structs.field("props"),
+            ],
+            schema = flat_schema,
+        )
+
+        # interleave, so that each node row precedes its edge rows
+        node_pos: np.ndarray = np.arange(num_nodes) + np.searchsorted(parent, np.arange(num_nodes))
+        edge_pos: np.ndarray = parent + 1 + np.arange(num_edges)
+
+        perm: np.ndarray = np.empty(num_nodes + num_edges, dtype=np.int64)
+        perm[node_pos] = np.arange(num_nodes)
+        perm[edge_pos] = num_nodes + np.arange(num_edges)
+
+        return pa.concat_tables([ nodes, edges ]).take(perm)
+
+
+    @classmethod
+    def convert_file_parquet (
+        cls,
+        parq_file: pq.ParquetFile,
+        save_parq: cloudpathlib.AnyPath,
+        *,
+        nested: bool = True,
+        props_map: bool = False,
+        options: typing.Optional[ParquetOptions] = None,
+        debug: bool = False,
+        ) -> None:
+        """
+Convert a Parquet file between the flat and nested layouts, and between
+JSON strings and Parquet maps for the properties, one batch at a time,
+without constructing a partition.
+        """
+        if options is None:
+            options = ParquetOptions()
+
+        flat_schema: pa.Schema = NOCK_MAP_SCHEMA if props_map else NOCK_SCHEMA
+        schema: pa.Schema = flat_schema
+
+        if nested:
+            schema = NESTED_MAP_SCHEMA if props_map else NESTED_SCHEMA
+
+        carry: typing.Optional[pa.Table] = None
+
+        with options.open_writer(save_parq, schema=schema) as writer:
+            for _, batch in cls.iter_batch_parquet(parq_file, debug=debug):
+                table: pa.Table = pa.Table.from_batches([ batch ])
+
+                if cls._is_nested(table.schema):
+                    table = cls.flatten_table(table)
+
+                table = cls._convert_props(table, props_map)
+
+                if not nested:
+                    writer.write_table(table.cast(flat_schema))
+                    continue
+
+                # the edge rows of the last node may continue into the
+                # next batch, so carry that node over
+                if carry is not None:
+                    table = pa.concat_tables([ carry, table.cast(carry.schema) ])
+
+                node_rows: np.ndarray = np.flatnonzero(pc.less(table["edge_id"], 0).to_numpy())
+                last_node: int = int(node_rows[-1]) if len(node_rows) > 0 else 0
+
+                if last_node > 0:
+                    writer.write_table(cls.nest_table(table.slice(0, last_node)))
+
+                carry = table.slice(last_node)
+
+            if carry is not None and carry.num_rows > 0:
+                writer.write_table(cls.nest_table(carry))
+
+
+    @classmethod
+    def _convert_props (
+        cls,
+        table: pa.Table,
+        props_map: bool,
+        ) -> pa.Table:
+        """
+Private method to convert the `props` column of a flat table to either
+JSON strings or Parquet maps.
+        """
+        if cls._has_props_map(table.schema) == props_map:
+            return table
+
+        props: typing.Union[pa.Array, typing.List[str]]
+
+        if props_map:
+            props = cls.encode_props(table["props"].to_pylist())
+        else:
+            props = pa.array([
+                cls._save_props(prop_map)
+                for prop_map in cls.decode_props(table["props"])
+            ], pa.string())
+
+        return table.set_column(table.schema.get_field_index("props"), "props", props)
+
+
+    @classmethod
+    def _decode_dictionaries (
+        cls,
+        table: pa.Table,
+        ) -> pa.Table:
+        """
+Private method to decode any dictionary encoded columns in a table, such
+as `rel_name` and `labels` in the NOCK schema, into their plain values.
+        """
+        for col_idx, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(
+                    col_idx,
+                    field.name,
+                    table.column(col_idx).cast(field.type.value_type),
+                )
+
+        return table
+
+
+    @classmethod
+    def _encode_arrow (
+        cls,
+        data: typing.Union[pa.Table, typing.Iterable[pa.RecordBatch]],
+        ) -> typing.Dict[str, typing.Any]:
+        """
+Private method to encode an Arrow table (or a stream of record batches)
+in NOCK schema as arrays indexed by node id and by edge, using
+vectorized Arrow compute.
+
+Node names get dictionary encoded, and node ids assigned in the same
+order of first occurrence that `parse_rows()` would assign them.
+Likewise for the edge relations. The node/edge sequencing gets
+validated using masks on `edge_id < 0`.
+        """
+        if not isinstance(data, pa.Table):
+            data = pa.Table.from_batches(list(data))
+
+        if cls._is_nested(data.schema):
+            data = cls.flatten_table(data)
+
+        table: pa.Table = cls._decode_dictionaries(data).combine_chunks()
+        num_rows: int = table.num_rows
+        row_idx: np.ndarray = np.arange(num_rows)
+
+        src_name: pa.Array = table["src_name"].combine_chunks()
+        dst_name: pa.Array = pc.fill_null(table["dst_name"].combine_chunks(), EMPTY_STRING)
+        edge_id: pa.ChunkedArray = table["edge_id"]
+
+        if edge_id.null_count > 0:
+            raise ValueError("edge_id cannot be null")
+
+        if table["truth"].null_count > 0:
+            raise ValueError("truth cannot be null")
+
+        is_node: np.ndarray = pc.less(edge_id, 0).to_numpy()
+
+        # the name each row refers to: the src node for a node row,
+        # otherwise the dst node for an edge row
+        ref_name: pa.Array = pc.if_else(pa.array(is_node, pa.bool_()), src_name, dst_name)
+        null_name: np.ndarray = pc.fill_null(pc.equal(ref_name, EMPTY_STRING), True).to_numpy(zero_copy_only=False)
+
+        if null_name.any():
+            bad_row: int = int(np.argmax(null_name))
+            raise ValueError(f"node name cannot be null at row { bad_row }")
+
+        last_node: np.ndarray = cls._check_sequence(src_name, is_node)
+
+        # node names, in order of first occurrence
+        name_enc: pa.DictionaryArray = pc.dictionary_encode(ref_name)
+        node_ids: np.ndarray = name_enc.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+        names: typing.List[str] = name_enc.dictionary.to_pylist()
+        num_nodes: int = len(names)
+
+        # edge relations, in order of first occurrence
+        rel_enc: pa.DictionaryArray = pc.dictionary_encode(
+            pc.fill_null(table["rel_name"].combine_chunks().filter(~is_node), EMPTY_STRING)
+        )
+
+        rel_dict: typing.List[str] = rel_enc.dictionary.to_pylist()
+        edge_rels: typing.List[str] = [ EMPTY_STRING ] + [
+            rel_name
+            for rel_name in rel_dict
+            if rel_name != EMPTY_STRING
+        ]
+
+        edge_rel_ids: typing.Dict[str, int] = {
+            rel_name: rel
+            for rel, rel_name in enumerate(edge_rels)
+        }
+
+        rel_map: np.ndarray = np.array(
+            [ edge_rel_ids[rel_name] for rel_name in rel_dict ],
+            dtype = np.int64,
+        )
+
+        # node annotations: `truth` and `is_rdf` come from the last row
+        # which refers to the node, while the rest come from its last
+        # node row
+        last_ref: np.ndarray = cls._last_row_index(node_ids, row_idx, num_nodes)
+        last_src: np.ndarray = cls._last_row_index(node_ids[is_node], row_idx[is_node], num_nodes)
+        src_rows: np.ndarray = last_src[last_src >= 0]
+
+        truth: np.ndarray = _widen_truth(table["truth"]).to_numpy()
+        is_rdf: np.ndarray = pc.fill_null(table["is_rdf"], False).to_numpy()
+        shadow: pa.Array = pc.fill_null(table["shadow"].combine_chunks(), Node.BASED_LOCAL)
+        labels: pa.Array = pc.fill_null(table["labels"].combine_chunks(), EMPTY_STRING)
+        props: pa.Array = table["props"].combine_chunks()
+
+        if not pa.types.is_map(props.type):
+            props = pc.fill_null(props, EMPTY_STRING)
+
+        edge_rows: np.ndarray = row_idx[~is_node]
+
+        return {
+            "names": names,
+            "edge_rels": edge_rels,
+            "edge_rel_ids": edge_rel_ids,
+            "node_truth": truth[last_ref],
+            "node_is_rdf": is_rdf[last_ref],
+            "src_ids": np.flatnonzero(last_src >= 0),
+            "src_shadow": shadow.take(src_rows),
+            "src_labels": labels.take(src_rows),
+            "src_props": props.take(src_rows),
+            "edge_src": node_ids[last_node[edge_rows]],
+            "edge_rel": rel_map[rel_enc.indices.to_numpy(zero_copy_only=False)],
+            "edge_dst": node_ids[edge_rows],
+            "edge_truth": truth[edge_rows],
+            "edge_props": props.take(edge_rows),
+        }
+
+
+    @classmethod
+    def from_arrow (
+        cls,
+        data: typing.Union[pa.Table, typing.Iterable[pa.RecordBatch]],
+        *,
+        part_id: IndexInts = NOT_FOUND,  # type: ignore
+        trusted: bool = False,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> "Partition":
+        """
+Construct a partition in bulk from an Arrow table (or a stream of record
+batches) in NOCK schema.
+
+Rather than stepping through `parse_rows()` one row at a time, this
+uses vectorized Arrow compute to dictionary encode the node names and
+edge relations, and to validate the node/edge sequencing. Node ids and
+relation ids get assigned in the same order as `parse_rows()` would
+assign them.
+
+Set `trusted` to skip the pydantic validation of each node and edge,
+for input which has already been validated.
+        """
+        enc: typing.Dict[str, typing.Any] = cls._encode_arrow(data)
+        names: typing.List[str] = enc["names"]
+        num_nodes: int = len(names)
+
+        node_truth: typing.List[float] = enc["node_truth"].tolist()
+        node_is_rdf: typing.List[bool] = enc["node_is_rdf"].tolist()
+        node_shadow: typing.List[int] = [ Node.BASED_LOCAL ] * num_nodes
+        node_labels: typing.List[typing.Set[str]] = [ set() for _ in range(num_nodes) ]
+        node_props: typing.List[PropMap] = [ {} for _ in range(num_nodes) ]
+
+        src_vals = zip(
+            enc["src_ids"].tolist(),
+            enc["src_shadow"].to_pylist(),
+            enc["src_labels"].to_pylist(),
+            cls.decode_props(enc["src_props"]),
+        )
+
+        for node_id, src_shadow, src_labels, src_props in src_vals:
+            node_shadow[node_id] = src_shadow
+            node_labels[node_id] = set(src_labels.split(","))
+            node_props[node_id] = src_props
+
+        nodes: typing.Dict[int, Node] = {
+            node_id: cls._build_node(
+                node_id,
+                names[node_id],
+                shadow = node_shadow[node_id],
+                is_rdf = node_is_rdf[node_id],
+                label_set = node_labels[node_id],
+                truth = node_truth[node_id],
+                prop_map = node_props[node_id],
+                trusted = trusted,
+            )
+            for node_id in range(num_nodes)
+        }
+
+        # edges, in row order under their src nodes
+        edge_vals = zip(
+            enc["edge_src"].tolist(),
+            enc["edge_rel"].tolist(),
+            enc["edge_dst"].tolist(),
+            enc["edge_truth"].tolist(),
+            cls.decode_props(enc["edge_props"]),
+        )
+
+        for src_id, rel, dst_id, edge_truth, edge_props in edge_vals:
+            nodes[src_id].add_edge(
+                cls._build_edge(
+                    rel,
+                    dst_id,
+                    truth = edge_truth,
+                    prop_map = edge_props,
+                    trusted = trusted,
+                )
+            )
+
+        part: Partition = cls(part_id = part_id, trusted = trusted)
+        part.nodes = nodes
+        part.node_names = dict(zip(names, range(num_nodes)))
+        part.next_node = num_nodes
+        part.edge_rels = enc["edge_rels"]
+        part.edge_rel_ids = enc["edge_rel_ids"]
+        part.shadow_refs = cls._collect_shadow_refs(names, enc["src_ids"], enc["src_shadow"])
+
+        return part
+
+
+    def _rank_nodes (
+        self,
+        ) -> typing.Tuple[typing.List[typing.Tuple[str, int]], typing.Dict[int, int]]:
+        """
+Private method to sort the nodes by name only once, returning the
+`(name, node_id)` pairs in ASC order, along with the rank of each node
+id in that order, so that edges can get sorted on integer ranks rather
+than by looking up and comparing their dst names.
+        """
+        node_iter: typing.List[typing.Tuple[str, int]] = sorted(self.node_names.items())
+
+        node_rank: typing.Dict[int, int] = {
+            node_id: rank
+            for rank, (_, node_id) in enumerate(node_iter)
+        }
+
+        return node_iter, node_rank
+
+
+    def iter_gen_rows (
+        self,
+        *,
+        sort: bool = False,
+        sort_edges: bool = True,
+        debug: bool = False,
+        ) -> typing.Iterable[GraphRow]:
+        """
+Iterator for generating rows on writes.
 
 Optionally, sort on:
   * src `node.name` in ASC order
-  * `edge_id` and dst `node.name` in ASC order
+  * `edge_id` and dst `node.name` in ASC order, unless `sort_edges` is false,
+    which keeps the edges of each node in the order they were added
         """
+        node_iter: typing.Iterable[typing.Tuple[str, int]] = self.node_names.items()
+
         if sort:
-            node_iter = sorted(self.node_names.items())
-        else:
-            node_iter = self.node_names.items()  # type: ignore
+            node_iter, node_rank = self._rank_nodes()
 
         for _, node_id in node_iter:
             node: Node = self.nodes[node_id]
@@ -609,14 +2490,14 @@ Optionally, sort on:
 
             edge_id: NonNegativeInt = 0
 
-            if sort:
+            if sort and sort_edges:
                 edge_rel_iter = sorted(node.edge_map.items())
             else:
                 edge_rel_iter = node.edge_map.items()  # type: ignore
 
             for _, edge_list in edge_rel_iter:
-                if sort:
-                    edge_iter = sorted(edge_list, key=lambda e: self.nodes[e.node_id].name)
+                if sort and sort_edges:
+                    edge_iter = sorted(edge_list, key=lambda e: node_rank[e.node_id])
                 else:
                     edge_iter = edge_list
 
@@ -637,46 +2518,299 @@ Optionally, sort on:
                     edge_id += 1
 
 
+    def _arrow_columns (
+        self,
+        *,
+        debug: bool = False,
+        ) -> typing.Dict[str, typing.Any]:
+        """
+Private method to gather the columns used by `to_arrow()`: the node
+annotations indexed by position in `node_names`, plus the edges, where
+`edge_src` and `edge_dst` are node positions.
+        """
+        num_nodes: int = len(self.node_names)
+        node_pos: typing.Dict[int, int] = {}
+        names: typing.List[str] = []
+        node_truth: np.ndarray = np.empty(num_nodes, dtype=np.float32)
+        node_shadow: np.ndarray = np.empty(num_nodes, dtype=np.int32)
+        node_is_rdf: np.ndarray = np.empty(num_nodes, dtype=np.bool_)
+        node_labels: typing.List[str] = []
+        node_props: typing.List[str] = []
+
+        for pos, (node_name, node_id) in enumerate(self.node_names.items()):
+            node: Node = self.nodes[node_id]
+            node_pos[node_id] = pos
+            names.append(node_name)
+            node_truth[pos] = node.truth
+            node_shadow[pos] = node.shadow
+            node_is_rdf[pos] = node.is_rdf
+            node_labels.append(",".join(node.label_set))
+            node_props.append(self._save_props(node.prop_map, debug=debug))
+
+        edge_src: typing.List[int] = []
+        edge_rel: typing.List[int] = []
+        edge_dst: typing.List[int] = []
+        edge_truth: typing.List[float] = []
+        edge_props: typing.List[str] = []
+
+        for node_id, pos in node_pos.items():
+            for rel, edge_list in self.nodes[node_id].edge_map.items():
+                for edge in edge_list:
+                    edge_src.append(pos)
+                    edge_rel.append(rel)
+                    edge_dst.append(node_pos[edge.node_id])
+                    edge_truth.append(edge.truth)
+                    edge_props.append(self._save_props(edge.prop_map, debug=debug))
+
+        return {
+            "names": names,
+            "node_truth": node_truth,
+            "node_shadow": node_shadow,
+            "node_is_rdf": node_is_rdf,
+            "node_labels": pa.array(node_labels, pa.string()),
+            "node_props": pa.array(node_props, pa.string()),
+            "edge_src": np.array(edge_src, dtype=np.int64),
+            "edge_rel": np.array(edge_rel, dtype=np.int32),
+            "edge_dst": np.array(edge_dst, dtype=np.int64),
+            "edge_truth": np.array(edge_truth, dtype=np.float32),
+            "edge_props": pa.array(edge_props, pa.string()),
+        }
+
+
+    def to_arrow (
+        self,
+        *,
+        sort: bool = False,
+        debug: bool = False,
+        ) -> pa.Table:
+        """
+Represent the partition as an Arrow table in NOCK schema, with the same
+rows in the same order as `iter_gen_rows()`.
+
+The columns get built directly from arrays of node and edge values,
+using vectorized Arrow compute to take the node names by index and to
+lay out the rows, rather than constructing a dictionary per row.
+        """
+        cols: typing.Dict[str, typing.Any] = self._arrow_columns(debug=debug)
+        names: pa.Array = pa.array(cols["names"], pa.string())
+        num_nodes: int = len(names)
+
+        edge_src: np.ndarray = cols["edge_src"]
+        edge_rel: np.ndarray = cols["edge_rel"]
+        edge_dst: np.ndarray = cols["edge_dst"]
+        num_edges: int = len(edge_src)
+
+        # the order of the node rows, and the rank of each node within it
+        if sort:
+            node_order: np.ndarray = np.argsort(np.array(cols["names"], dtype=object), kind="stable")
+        else:
+            node_order = np.arange(num_nodes)
+
+        node_rank: np.ndarray = np.empty(num_nodes, dtype=np.int64)
+        node_rank[node_order] = np.arange(num_nodes)
+        src_rank: np.ndarray = node_rank[edge_src]
+
+        # the order of the edge rows: grouped by src node, then by relation
+        # in order of first appearance, or else sorted on relation then on
+        # dst name
+        if sort:
+            edge_order: np.ndarray = np.lexsort((node_rank[edge_dst], edge_rel, src_rank))
+        else:
+            edge_order = np.argsort(src_rank, kind="stable")
+            group_key: np.ndarray = src_rank[edge_order] * len(self.edge_rels) + edge_rel[edge_order]
+            _, first_idx, inverse = np.unique(group_key, return_index=True, return_inverse=True)
+            edge_order = edge_order[np.argsort(first_idx[inverse], kind="stable")]
+
+        edge_src = edge_src[edge_order]
+        num_out: np.ndarray = np.bincount(node_rank[edge_src], minlength=num_nodes)
+        edge_start: np.ndarray = np.cumsum(num_out) - num_out
+        edge_ids: np.ndarray = np.arange(num_edges) - edge_start[node_rank[edge_src]]
+
+        # interleave, so that each node row precedes its edge rows
+        node_pos: np.ndarray = np.arange(num_nodes) + edge_start
+        edge_pos: np.ndarray = node_pos[node_rank[edge_src]] + 1 + edge_ids
+
+        perm: np.ndarray = np.empty(num_nodes + num_edges, dtype=np.int64)
+        perm[node_pos] = np.arange(num_nodes)
+        perm[edge_pos] = num_nodes + np.arange(num_edges)
+
+        rel_type: pa.DataType = NOCK_SCHEMA.field("rel_name").type
+        labels_type: pa.DataType = NOCK_SCHEMA.field("labels").type
+
+        nodes: pa.Table = pa.Table.from_arrays(
+            [
+                names.take(node_order),
+                pa.array(np.full(num_nodes, NOT_FOUND, dtype=np.int32)),
+                pa.nulls(num_nodes, rel_type),
+                pa.nulls(num_nodes, pa.string()),
+                pa.array(cols["node_truth"][node_order]),
+                pa.array(cols["node_shadow"][node_order]),
+                pa.array(cols["node_is_rdf"][node_order]),
+                cols["node_labels"].take(node_order).cast(labels_type),
+                cols["node_props"].take(node_order),
+            ],
+            schema = NOCK_SCHEMA,
+        )
+
+        edges: pa.Table = pa.Table.from_arrays(
+            [
+                names.take(edge_src),
+                pa.array(edge_ids.astype(np.int32)),
+                pa.DictionaryArray.from_arrays(
+                    pa.array(edge_rel[edge_order]),
+                    pa.array(self.edge_rels, pa.string()),
+                ),
+                names.take(edge_dst[edge_order]),
+                pa.array(cols["edge_truth"][edge_order]),
+                pa.array(np.full(num_edges, Node.BASED_LOCAL, dtype=np.int32)),
+                pa.array(cols["node_is_rdf"][edge_src]),
+                pa.nulls(num_edges, labels_type),
+                cols["edge_props"].take(edge_order),
+            ],
+            schema = NOCK_SCHEMA,
+        )
+
+        return pa.concat_tables([ nodes, edges ]).take(perm)
+
+
     def to_df (
         self,
         *,
         sort: bool = False,
+        types_mapper: typing.Optional[typing.Callable[[pa.DataType], typing.Any]] = None,
         debug: bool = False,
         ) -> pd.DataFrame:
         """
-Represent the partition as a DataFrame.
+Represent the partition as a DataFrame, converted through `to_arrow()`.
+
+By default the columns use the `pandas` nullable dtypes, so that missing
+values do not get replaced by `NaN`, or else use `types_mapper` to
+select other dtypes, e.g., `pd.ArrowDtype` to keep the Arrow data.
         """
-        df: pd.DataFrame = pd.DataFrame([
-            row
-            for row in self.iter_gen_rows(debug=debug)
-        ])
-     
-        if sort:
-            df = df.sort_values(self.SORT_COLUMNS)
+        if types_mapper is None:
+            types_mapper = {
+                pa.int32(): pd.Int32Dtype(),
+                pa.float64(): pd.Float64Dtype(),
+                pa.bool_(): pd.BooleanDtype(),
+                pa.string(): pd.StringDtype(),
+            }.get
+
+        table: pa.Table = self._decode_dictionaries(self.to_arrow(sort=sort, debug=debug))
+        table = table.set_column(table.schema.get_field_index("truth"), "truth", _widen_truth(table["truth"]))
+
+        return table.to_pandas(types_mapper=types_mapper)
+
+
+    def iter_gen_batches (
+        self,
+        *,
+        batch_size: NonNegativeInt = BATCH_SIZE,
+        align_nodes: bool = False,
+        props_map: bool = False,
+        sort: bool = False,
+        debug: bool = False,
+        ) -> typing.Iterable[pa.RecordBatch]:
+        """
+Iterator for generating record batches in NOCK schema on writes, with
+about `batch_size` rows per batch.
+
+Optionally, align the batches on node rows, so that the edge rows of a
+node never continue into the next batch, and encode the properties as
+Parquet maps in `NOCK_MAP_SCHEMA`.
+        """
+        col_names: typing.List[str] = NOCK_SCHEMA.names
+        cols: typing.Dict[str, list] = { name: [] for name in col_names }
+        num_rows: int = 0
+
+        def _make_batch () -> pa.RecordBatch:
+            if props_map:
+                cols["props"] = self.encode_props(cols["props"])  # type: ignore
+                return pa.RecordBatch.from_pydict(cols, schema=NOCK_MAP_SCHEMA)
+
+            return pa.RecordBatch.from_pydict(cols, schema=NOCK_SCHEMA)
 
-        return df
+        for row in self.iter_gen_rows(sort=sort, debug=debug):
+            if num_rows >= batch_size and (not align_nodes or row["edge_id"] < 0):
+                yield _make_batch()
+                cols = { name: [] for name in col_names }
+                num_rows = 0
+
+            for name in col_names:
+                cols[name].append(row[name])
+
+            num_rows += 1
+
+        if num_rows > 0:
+            yield _make_batch()
 
 
     def save_file_parquet (
         self,
         save_parq: cloudpathlib.AnyPath,
         *,
+        batch_size: NonNegativeInt = BATCH_SIZE,
+        options: typing.Optional[ParquetOptions] = None,
+        nested: bool = False,
+        props_map: bool = False,
         sort: bool = False,
+        index: bool = False,
         debug: bool = False,
         ) -> None:
         """
 Save a partition to a Parquet file.
+
+The rows get streamed in record batches of `batch_size` rows, each
+written as one row group, so that memory use stays bounded by the
+batch size. Compression and other tuning can be set through `options`.
+
+Optionally, use the nested layout, where each node row carries a list
+of its edges, and store the properties as Parquet maps instead of JSON
+strings.
+
+Optionally, write a sidecar `index` file alongside, which maps each node
+name to its node id and the location of its rows, plus the edge
+relations; see `PartitionView`.
         """
-        table = pa.Table.from_pandas(
-            self.to_df(
+        if options is None:
+            options = ParquetOptions()
+
+        schema: pa.Schema = NOCK_MAP_SCHEMA if props_map else NOCK_SCHEMA
+
+        if nested:
+            schema = NESTED_MAP_SCHEMA if props_map else NESTED_SCHEMA
+
+        with options.open_writer(save_parq, schema=schema) as writer:
+            batch_iter = self.iter_gen_batches(
+                batch_size = batch_size,
+                align_nodes = nested,
+                props_map = props_map,
                 sort = sort,
                 debug = debug,
-            ),
-        )
+            )
+
+            scanner: NodeRowScanner = NodeRowScanner(nested = nested)
+
+            for batch in batch_iter:
+                if nested:
+                    batch = self.nest_table(pa.Table.from_batches([ batch ]))
+                    writer.write_table(batch)
+                else:
+                    writer.write_batch(batch)
+
+                if index:
+                    scanner.add(batch)
+
+        if index:
+            row_start, row_count = scanner.row_ranges()
 
-        writer = pq.ParquetWriter(save_parq.as_posix(), table.schema)
-        writer.write_table(table)
-        writer.close()
+            write_index(
+                save_parq,
+                scanner.names,
+                [ self.node_names[name] for name in scanner.names ],
+                row_start,
+                row_count,
+                self.edge_rels,
+            )
 
 
     def save_file_csv (
@@ -684,23 +2818,70 @@ Save a partition to a Parquet file.
         save_csv: cloudpathlib.AnyPath,
         *,
         encoding: str = "utf-8",
+        chunk_size: NonNegativeInt = BATCH_SIZE,
         sort: bool = False,
         debug: bool = False,
         ) -> None:
         """
 Save a partition to a CSV file.
+
+The rows get streamed, then written in chunks of `chunk_size` rows, so
+that memory use stays bounded. Following the NOCK conventions, a header
+row gets written, and strings are always quoted using double quotes,
+while missing values get written as `""` empty strings.
+
+Optionally, `sort` on `SORT_COLUMNS`, i.e., the node rows by name, while
+the edge rows of each node keep the order in which they were added.
+        """
+        col_names: typing.List[str] = NOCK_SCHEMA.names
+        chunk: typing.List[list] = []
+
+        with open(save_csv.as_posix(), "w", encoding=encoding, newline="") as fp:
+            writer = csv.writer(
+                fp,
+                quoting = csv.QUOTE_NONNUMERIC,
+                lineterminator = "\n",
+            )
+
+            writer.writerow(col_names)
+
+            for row in self.iter_gen_rows(sort=sort, sort_edges=False, debug=debug):
+                chunk.append([ row[name] for name in col_names ])
+
+                if len(chunk) >= chunk_size:
+                    writer.writerows(chunk)
+                    chunk = []
+
+            writer.writerows(chunk)
+
+
+    def _iter_rdf_triples (
+        self,
+        *,
+        sort: bool = False,
+        debug: bool = False,
+        ) -> typing.Iterable[Triple]:
+        """
+Private method to iterate through the triples for the RDF nodes in this
+partition, grouped by subject.
         """
-        self.to_df(
+        subj: typing.Optional[str] = None
+
+        row_iter = self.iter_gen_rows(
             sort = sort,
             debug = debug,
-        ).to_csv(
-            save_csv.as_posix(),
-            index = False,
-            header = True,
-            encoding = encoding,
-            quoting = csv.QUOTE_NONNUMERIC,
         )
 
+        for row in row_iter:
+            if row["is_rdf"]:
+                if row["edge_id"] < 0:
+                    subj = row["src_name"]
+                else:
+                    if debug:
+                        ic(subj, row["rel_name"], row["dst_name"])
+
+                    yield subj, row["rel_name"], row["dst_name"]  # type: ignore
+
 
     def save_file_rdf (
         self,
@@ -713,27 +2894,34 @@ Save a partition to a CSV file.
         ) -> None:
         """
 Save a partition to an RDF file.
-        """
-        subj = None
-        graph = rdflib.Graph()
 
-        row_iter = self.iter_gen_rows(
+The N-Triples and Turtle formats get written directly as a stream of
+triples, grouped by subject. Other formats get built as an
+`rdflib.Graph` first, then serialized.
+        """
+        triples: typing.Iterable[Triple] = self._iter_rdf_triples(
             sort = sort,
             debug = debug,
         )
 
-        for row in row_iter:
-            if row["is_rdf"]:
-                if row["edge_id"] < 0:
-                    subj = rdflib.term.URIRef(row["src_name"])
-                else:
-                    pred = rdflib.term.URIRef(row["rel_name"])
-                    objt = rdflib.term.URIRef(row["dst_name"])
-                    
-                    graph.add((subj, pred, objt))  # type: ignore
+        if rdf_format in STREAM_WRITE_FORMATS:
+            with open(save_rdf.as_posix(), "w", encoding=encoding) as fp:
+                write_triples(
+                    fp,
+                    triples,
+                    turtle = rdf_format in TURTLE_FORMATS,
+                )
 
-                    if debug:
-                        ic(subj, pred, objt)
+            return
+
+        graph = rdflib.Graph()
+
+        for subj, pred, objt in triples:
+            graph.add((
+                rdflib.term.URIRef(subj),
+                rdflib.term.URIRef(pred),
+                rdflib.term.URIRef(objt),
+            ))
 
         graph.serialize(
             save_rdf,
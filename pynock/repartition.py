@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Repartitioning a NOCK dataset, to split or rebalance its partition
+files, by hash or by range of the node names.
+"""
+
+import heapq
+import json
+import random
+import tempfile
+import typing
+import zlib
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+import cloudpathlib
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
+
+from .delta import read_merged
+from .ntriples import SPILL_SIZE
+from .pynock import BATCH_SIZE, EMPTY_STRING, NOCK_SCHEMA, NOT_FOUND, \
+    Node, ParquetOptions, Partition
+from .sidecar import list_deltas
+
+
+REPARTITION_MODES: typing.Set[str] = set([
+    "hash",
+    "range",
+])
+
+SAMPLE_SIZE: int = 100000
+
+
+def hash_parts (
+    names: pa.Array,
+    num_parts: int,
+    ) -> np.ndarray:
+    """
+Assign node names to partitions by a stable hash (CRC-32) of each name,
+hashing each distinct name within the array only once. Null names get
+assigned `NOT_FOUND`.
+    """
+    enc: pa.DictionaryArray = pc.dictionary_encode(names)
+    value_parts: np.ndarray = np.array(
+        [ zlib.crc32(name.encode("utf-8")) % num_parts for name in enc.dictionary.to_pylist() ] + [ NOT_FOUND ],
+        dtype = np.int32,
+    )
+
+    indices: np.ndarray = pc.fill_null(enc.indices, len(enc.dictionary)).to_numpy()
+
+    return value_parts[indices]
+
+
+def range_parts (
+    names: pa.Array,
+    boundaries: typing.List[str],
+    ) -> np.ndarray:
+    """
+Assign node names to partitions by range, where partition `i` holds the
+names from `boundaries[i - 1]` inclusive up to `boundaries[i]`. Null
+names get assigned `NOT_FOUND`.
+    """
+    values: np.ndarray = np.array(pc.fill_null(names, EMPTY_STRING).to_pylist(), dtype=object)
+    parts: np.ndarray = np.searchsorted(np.array(boundaries, dtype=object), values, side="right").astype(np.int32)
+
+    return np.where(pc.is_null(names).to_numpy(zero_copy_only=False), NOT_FOUND, parts)
+
+
+def iter_dataset_tables (
+    load_paths: typing.List[cloudpathlib.AnyPath],
+    *,
+    batch_size: int = BATCH_SIZE,
+    debug: bool = False,
+    ) -> typing.Iterable[pa.Table]:
+    """
+Stream the rows of the Parquet files in a dataset as tables in the flat
+NOCK schema, one record batch at a time, merging any delta files.
+    """
+    for load_path in load_paths:
+        batches: typing.Iterable[pa.RecordBatch]
+
+        if len(list_deltas(load_path)) > 0:
+            batches = read_merged(load_path, debug=debug).to_batches(max_chunksize=batch_size)
+        else:
+            parq_file: pq.ParquetFile = pq.ParquetFile(load_path.as_posix())
+
+            batches = (
+                batch
+                for _, batch in Partition.iter_batch_parquet(parq_file, batch_size=batch_size, debug=debug)
+            )
+
+        for batch in batches:
+            table: pa.Table = pa.Table.from_batches([ batch ])
+
+            if Partition._is_nested(table.schema):  # pylint: disable=W0212
+                table = Partition.flatten_table(table)
+
+            table = Partition._convert_props(table, False)  # pylint: disable=W0212
+
+            yield table.select(NOCK_SCHEMA.names).cast(NOCK_SCHEMA)
+
+
+def sample_boundaries (
+    load_paths: typing.List[cloudpathlib.AnyPath],
+    num_parts: int,
+    *,
+    sample_size: int = SAMPLE_SIZE,
+    seed: int = 0,
+    ) -> typing.List[str]:
+    """
+Choose the range boundaries which split a dataset into `num_parts`
+partitions of about equal numbers of nodes, from a reservoir sample of
+the `src_name` values of its node rows, merging any delta files.
+
+The boundaries are distinct, and each starts a non-empty partition, so
+there may be fewer than `num_parts - 1` of them when the sample has too
+few distinct names.
+    """
+    rng: random.Random = random.Random(seed)
+    sample: typing.List[str] = []
+    seen: int = 0
+
+    for load_path in load_paths:
+        batches: typing.Iterable[pa.RecordBatch]
+
+        if len(list_deltas(load_path)) > 0:
+            batches = read_merged(load_path).select([ "src_name", "edge_id" ]).to_batches()
+        else:
+            parq_file: pq.ParquetFile = pq.ParquetFile(load_path.as_posix())
+
+            if Partition._is_nested(parq_file.schema_arrow):  # pylint: disable=W0212
+                columns: typing.List[str] = [ "src_name" ]
+            else:
+                columns = [ "src_name", "edge_id" ]
+
+            batches = parq_file.iter_batches(columns=columns)
+
+        for batch in batches:
+            names: pa.Array = batch.column(0)
+
+            if "edge_id" in batch.schema.names:
+                names = names.filter(pc.less(batch.column(1), 0))
+
+            for name in names.to_pylist():
+                if seen < sample_size:
+                    sample.append(name)
+                else:
+                    slot: int = rng.randrange(seen + 1)
+
+                    if slot < sample_size:
+                        sample[slot] = name
+
+                seen += 1
+
+    sample.sort()
+
+    boundaries: typing.Set[str] = set(
+        sample[len(sample) * i // num_parts]
+        for i in range(1, num_parts)
+        if len(sample) > 0
+    )
+
+    # a repeated boundary, or one at the smallest name, would leave a
+    # partition empty
+    return sorted(boundaries - set(sample[:1]))
+
+
+class ShadowSpill:
+    """
+The distinct names of the shadow nodes needed by one partition, kept in
+memory up to a limit, then spilled as sorted runs to temporary files.
+    """
+
+    def __init__ (
+        self,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.names: typing.Set[str] = set()
+        self.spill_files: typing.List[typing.IO] = []
+
+
+    def spill (
+        self,
+        ) -> None:
+        """
+Spill the names held in memory as a sorted run.
+        """
+        spill_file: typing.IO = tempfile.TemporaryFile(mode="w+", encoding="utf-8")  # pylint: disable=R1732
+
+        for name in sorted(self.names):
+            spill_file.write(json.dumps(name))
+            spill_file.write("\n")
+
+        spill_file.seek(0)
+        self.spill_files.append(spill_file)
+        self.names.clear()
+
+
+    def iter_names (
+        self,
+        ) -> typing.Iterable[str]:
+        """
+Iterate through the distinct names, in sorted order, merging any runs
+which got spilled.
+        """
+        runs: typing.List[typing.Iterable[str]] = [
+            ( json.loads(line) for line in spill_file )
+            for spill_file in self.spill_files
+        ]
+
+        last_name: typing.Optional[str] = None
+
+        for name in heapq.merge(sorted(self.names), *runs):
+            if name != last_name:
+                yield name
+                last_name = name
+
+
+    def close (
+        self,
+        ) -> None:
+        """
+Close the spill files.
+        """
+        for spill_file in self.spill_files:
+            spill_file.close()
+
+        self.spill_files = []
+
+
+def shadow_table (
+    names: typing.List[str],
+    parts: np.ndarray,
+    ) -> pa.Table:
+    """
+Construct the shadow node rows for the given names, where `parts` holds
+the `part_id` of the partition on which each node resides.
+    """
+    num_rows: int = len(names)
+
+    return pa.Table.from_pydict(
+        {
+            "src_name": names,
+            "edge_id": [ NOT_FOUND ] * num_rows,
+            "rel_name": [ None ] * num_rows,
+            "dst_name": [ None ] * num_rows,
+            "truth": [ 1.0 ] * num_rows,
+            "shadow": parts,
+            "is_rdf": [ False ] * num_rows,
+            "labels": [ EMPTY_STRING ] * num_rows,
+            "props": [ EMPTY_STRING ] * num_rows,
+        },
+        schema = NOCK_SCHEMA,
+    )
+
+
+def repartition_files (  # pylint: disable=R0912,R0913,R0914,R0915
+    load_paths: typing.List[cloudpathlib.AnyPath],
+    save_dir: cloudpathlib.AnyPath,
+    num_parts: int,
+    *,
+    mode: str = "hash",
+    boundaries: typing.Optional[typing.List[str]] = None,
+    batch_size: int = BATCH_SIZE,
+    spill_size: int = SPILL_SIZE,
+    options: typing.Optional[ParquetOptions] = None,
+    debug: bool = False,
+    ) -> typing.List[cloudpathlib.AnyPath]:
+    """
+Stream the rows of a NOCK dataset, then rewrite these into `num_parts`
+partition files within `save_dir`, assigning each node (along with its
+edges) to a partition by a hash of its `src_name`, or by name range.
+
+In range mode, the distinct `boundaries` (sampled by default) must make
+exactly `num_parts` partitions, otherwise this raises `ValueError`, e.g.,
+when the node names have too few distinct values to sample.
+
+Each edge whose `dst_name` resides on a different partition gets a
+shadow node row within the partition of its src node, with `shadow` set
+to the `part_id` of the partition where the dst node resides. Shadow
+node rows from the input get dropped, then regenerated this way.
+
+Memory stays bounded: rows get written in batches of about `batch_size`
+rows per partition, while the distinct shadow names get spilled to
+temporary files once more than `spill_size` of them are held.
+
+Returns the paths of the partition files written.
+    """
+    if mode not in REPARTITION_MODES:
+        raise ValueError(f"unknown repartition mode: { mode }")
+
+    if options is None:
+        options = ParquetOptions()
+
+    if mode == "range":
+        if boundaries is None:
+            boundaries = sample_boundaries(load_paths, num_parts)
+
+        boundaries = sorted(set(boundaries))
+
+        if len(boundaries) + 1 != num_parts:
+            raise ValueError(f"{ len(boundaries) } distinct range boundaries make { len(boundaries) + 1 } partitions, not { num_parts }")
+
+    def _assign (names: pa.Array) -> np.ndarray:
+        if mode == "range":
+            return range_parts(names, boundaries)  # type: ignore
+
+        return hash_parts(names, num_parts)
+
+    save_paths: typing.List[cloudpathlib.AnyPath] = [
+        save_dir / f"part_{ part_id:05d}.parq"
+        for part_id in range(num_parts)
+    ]
+
+    writers: typing.List[pq.ParquetWriter] = [
+        options.open_writer(save_path)
+        for save_path in save_paths
+    ]
+
+    buffers: typing.List[typing.List[pa.Table]] = [ [] for _ in range(num_parts) ]
+    buffer_rows: typing.List[int] = [ 0 ] * num_parts
+    shadows: typing.List[ShadowSpill] = [ ShadowSpill() for _ in range(num_parts) ]
+    num_shadows: int = 0
+
+    try:
+        for table in iter_dataset_tables(load_paths, batch_size=batch_size, debug=debug):
+            edge_id: np.ndarray = table["edge_id"].to_numpy()
+            shadow: np.ndarray = pc.fill_null(table["shadow"], Node.BASED_LOCAL).to_numpy()
+            keep: np.ndarray = (edge_id >= 0) | (shadow < 0)
+
+            table = table.filter(keep)
+            is_edge: np.ndarray = edge_id[keep] >= 0
+
+            src_parts: np.ndarray = _assign(table["src_name"].combine_chunks())
+            dst_parts: np.ndarray = _assign(table["dst_name"].combine_chunks())
+            cross: np.ndarray = is_edge & (dst_parts >= 0) & (dst_parts != src_parts)
+
+            if cross.any():
+                dst_names: typing.List[str] = table["dst_name"].filter(cross).to_pylist()
+
+                for part_id, dst_name in zip(src_parts[cross].tolist(), dst_names):
+                    shadows[part_id].names.add(dst_name)
+
+                num_shadows += len(dst_names)
+
+                if num_shadows >= spill_size:
+                    for shadow_spill in shadows:
+                        if len(shadow_spill.names) > 0:
+                            shadow_spill.spill()
+
+                    num_shadows = 0
+
+            for part_id in np.unique(src_parts).tolist():
+                part_rows: pa.Table = table.filter(src_parts == part_id)
+                buffers[part_id].append(part_rows)
+                buffer_rows[part_id] += part_rows.num_rows
+
+                if buffer_rows[part_id] >= batch_size:
+                    writers[part_id].write_table(pa.concat_tables(buffers[part_id]))
+                    buffers[part_id] = []
+                    buffer_rows[part_id] = 0
+
+        for part_id in range(num_parts):
+            if buffer_rows[part_id] > 0:
+                writers[part_id].write_table(pa.concat_tables(buffers[part_id]))
+
+            # the shadow node rows have no edges, so these can follow
+            # all of the other rows
+            chunk: typing.List[str] = []
+
+            for name in shadows[part_id].iter_names():
+                chunk.append(name)
+
+                if len(chunk) >= batch_size:
+                    writers[part_id].write_table(shadow_table(chunk, _assign(pa.array(chunk, pa.string()))))
+                    chunk = []
+
+            if len(chunk) > 0:
+                writers[part_id].write_table(shadow_table(chunk, _assign(pa.array(chunk, pa.string()))))
+
+            if debug:
+                ic(part_id, save_paths[part_id])
+
+    finally:
+        for writer in writers:
+            writer.close()
+
+        for shadow_spill in shadows:
+            shadow_spill.close()
+
+    return save_paths
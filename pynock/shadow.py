@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resolution of shadow nodes, i.e., nodes referenced within a partition
+which reside on another partition, using `asyncio` futures.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import abc
+import asyncio
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+
+from .pynock import Node, Partition
+
+
+LOOKUP_BATCH_SIZE: int = 1024
+
+ShadowKey = typing.Tuple[int, str]
+
+
+class ShadowBackend (abc.ABC):  # pylint: disable=R0903
+    """
+Interface for a backend which looks up nodes by name within a given
+partition, e.g., across a cluster.
+    """
+
+    @abc.abstractmethod
+    async def lookup_nodes (
+        self,
+        part_id: int,
+        node_names: typing.List[str],
+        ) -> typing.Dict[str, typing.Optional[Node]]:
+        """
+Lookup a batch of nodes by name within one partition, returning None
+for each name not found.
+        """
+
+
+class LocalRegistry (ShadowBackend):  # pylint: disable=R0903
+    """
+The default backend: a registry of partitions within this process,
+indexed by `part_id`, such as `Graph.partitions`.
+    """
+
+    def __init__ (
+        self,
+        partitions: typing.Optional[typing.Dict[int, Partition]] = None,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.partitions: typing.Dict[int, Partition] = {}
+
+        for part in (partitions or {}).values():
+            self.register(part)
+
+
+    def register (
+        self,
+        part: Partition,
+        ) -> None:
+        """
+Register a partition by its `part_id`.
+        """
+        self.partitions[part.part_id] = part
+
+
+    async def lookup_nodes (
+        self,
+        part_id: int,
+        node_names: typing.List[str],
+        ) -> typing.Dict[str, typing.Optional[Node]]:
+        """
+Lookup a batch of nodes by name within one registered partition, where
+only the local (non-shadow) nodes count as found.
+        """
+        part: typing.Optional[Partition] = self.partitions.get(part_id)
+        found: typing.Dict[str, typing.Optional[Node]] = {}
+
+        for node_name in node_names:
+            node: typing.Optional[Node] = None
+
+            if part is not None:
+                node = part.lookup_node(node_name)
+
+                if node is not None and node.shadow != Node.BASED_LOCAL:
+                    node = None
+
+            found[node_name] = node
+
+        return found
+
+
+class ShadowResolver:
+    """
+Resolve shadow references concurrently, batching the lookups for each
+target partition and caching the results, so that repeated references
+to the same remote node cost only one lookup.
+    """
+
+    def __init__ (
+        self,
+        backend: typing.Optional[ShadowBackend] = None,
+        *,
+        batch_size: int = LOOKUP_BATCH_SIZE,
+        ) -> None:
+        """
+Constructor, which uses an empty `LocalRegistry` as the default backend.
+        """
+        self.backend: ShadowBackend = backend if backend is not None else LocalRegistry()
+        self.batch_size: int = batch_size
+        self.cache: typing.Dict[ShadowKey, typing.Optional[Node]] = {}
+        self.num_lookups: int = 0
+        self.num_batches: int = 0
+        self._pending: typing.Dict[ShadowKey, asyncio.Future] = {}
+
+
+    async def _lookup_batch (
+        self,
+        part_id: int,
+        node_names: typing.List[str],
+        ) -> None:
+        """
+Private method to run one batch of lookups against the backend, then
+settle the pending future for each of its names.
+        """
+        self.num_batches += 1
+        self.num_lookups += len(node_names)
+
+        try:
+            found: typing.Dict[str, typing.Optional[Node]] = await self.backend.lookup_nodes(part_id, node_names)
+        except Exception as ex:  # pylint: disable=W0703
+            for node_name in node_names:
+                self._pending.pop((part_id, node_name)).set_exception(ex)
+
+            return
+
+        for node_name in node_names:
+            key: ShadowKey = ( part_id, node_name )
+            self.cache[key] = found.get(node_name)
+            self._pending.pop(key).set_result(self.cache[key])
+
+
+    async def resolve_refs (
+        self,
+        shadow_refs: typing.Dict[str, int],
+        *,
+        debug: bool = False,
+        ) -> typing.Dict[str, typing.Optional[Node]]:
+        """
+Resolve shadow references, which map node names to the `part_id` of
+the partition where each resides, returning the resolved node for each
+name, or None if its lookup failed to find it.
+
+Cached results get reused, and references already being looked up by a
+concurrent call await the same future.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        waits: typing.Dict[str, asyncio.Future] = {}
+        todo: typing.Dict[int, typing.List[str]] = {}
+        resolved: typing.Dict[str, typing.Optional[Node]] = {}
+
+        for node_name, part_id in shadow_refs.items():
+            key: ShadowKey = ( part_id, node_name )
+
+            if key in self.cache:
+                resolved[node_name] = self.cache[key]
+            elif key in self._pending:
+                waits[node_name] = self._pending[key]
+            else:
+                self._pending[key] = loop.create_future()
+                waits[node_name] = self._pending[key]
+                todo.setdefault(part_id, []).append(node_name)
+
+        tasks: typing.List[typing.Awaitable] = [
+            self._lookup_batch(part_id, node_names[i:i + self.batch_size])
+            for part_id, node_names in todo.items()
+            for i in range(0, len(node_names), self.batch_size)
+        ]
+
+        if debug:
+            ic(len(shadow_refs), len(resolved), len(tasks))
+
+        await asyncio.gather(*tasks)
+
+        for node_name, future in waits.items():
+            resolved[node_name] = await future
+
+        return resolved
+
+
+    def resolve_partition (
+        self,
+        part: Partition,
+        *,
+        debug: bool = False,
+        ) -> typing.Dict[str, typing.Optional[Node]]:
+        """
+Resolve all of the shadow references collected while loading the given
+partition, running an event loop until done.
+
+This blocks the caller. Within a running event loop, e.g., in a
+notebook, `await resolve_refs(part.shadow_refs)` instead; otherwise
+the lookups run on an event loop in a separate thread, since only one
+event loop can run per thread.
+        """
+        coro: typing.Coroutine = self.resolve_refs(part.shadow_refs, debug=debug)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
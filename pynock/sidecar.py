@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A sidecar index file written alongside a Parquet partition, which maps
+each node name to its node id and the location of its rows, plus the
+dictionary of edge relations, so that a reader can skip rebuilding the
+node names by scanning the rows.
+
+The numbered delta files next to a partition get named and listed here
+too, since the fingerprint of the index covers them.
+"""
+
+import hashlib
+import json
+import os
+import typing
+
+import cloudpathlib
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
+
+
+INDEX_SUFFIX: str = ".idx"
+DELTA_SUFFIX: str = ".delta"
+
+INDEX_SCHEMA: pa.Schema = pa.schema([
+    pa.field("name", pa.string(), nullable=False),
+    pa.field("node_id", pa.int64(), nullable=False),
+    pa.field("row_group", pa.int32(), nullable=False),
+    pa.field("row_offset", pa.int64(), nullable=False),
+    pa.field("row_count", pa.int64(), nullable=False),
+])
+
+PARQUET_MAGIC: bytes = b"PAR1"
+
+
+def index_path (
+    parq_path: cloudpathlib.AnyPath,
+    ) -> cloudpathlib.AnyPath:
+    """
+The path of the sidecar index file for a Parquet file.
+    """
+    return parq_path.with_name(parq_path.name + INDEX_SUFFIX)
+
+
+def delta_path (
+    base_path: cloudpathlib.AnyPath,
+    seq: int,
+    ) -> cloudpathlib.AnyPath:
+    """
+The path of the delta file with sequence number `seq` for a base file,
+which the partition file patterns of `Graph` do not match.
+    """
+    return base_path.with_name(f"{ base_path.name }.{ seq:06d}{ DELTA_SUFFIX }")
+
+
+def list_deltas (
+    base_path: cloudpathlib.AnyPath,
+    ) -> typing.List[typing.Tuple[int, cloudpathlib.AnyPath]]:
+    """
+List the `(seq, path)` pairs of the delta files for a base file, in
+order of their sequence numbers.
+    """
+    prefix: str = base_path.name + "."
+    deltas: typing.List[typing.Tuple[int, cloudpathlib.AnyPath]] = []
+
+    for path in base_path.parent.glob(f"{ base_path.name }.*{ DELTA_SUFFIX }"):
+        seq: str = path.name[len(prefix):-len(DELTA_SUFFIX)]
+
+        if seq.isdigit():
+            deltas.append(( int(seq), path, ))
+
+    return sorted(deltas, key=lambda delta: delta[0])
+
+
+def parquet_fingerprint (
+    parq_path: cloudpathlib.AnyPath,
+    ) -> str:
+    """
+Fingerprint a Parquet file by hashing its size and its footer, which
+holds the offsets and statistics of every column chunk, so that any
+rewrite of the data changes the fingerprint, without reading the data.
+The sequence numbers of its delta files get hashed too, so that
+appending a delta changes the fingerprint.
+    """
+    with parq_path.open("rb") as fp:
+        fp.seek(0, os.SEEK_END)
+        file_size: int = fp.tell()
+
+        fp.seek(file_size - 8)
+        tail: bytes = fp.read(8)
+
+        if tail[4:] != PARQUET_MAGIC:
+            raise ValueError(f"not a Parquet file: { parq_path }")
+
+        footer_size: int = int.from_bytes(tail[:4], "little")
+        fp.seek(file_size - 8 - footer_size)
+        footer: bytes = fp.read(footer_size)
+
+    digest = hashlib.sha256()
+    digest.update(str(file_size).encode("utf-8"))
+    digest.update(footer)
+    digest.update(json.dumps([ seq for seq, _ in list_deltas(parq_path) ]).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class NodeRowScanner:  # pylint: disable=R0903
+    """
+Collect the names and the row offsets of the node rows, from a stream
+of record batches in NOCK schema, either layout. Only the `src_name`
+column is needed, plus `edge_id` for the flat layout.
+    """
+
+    def __init__ (
+        self,
+        *,
+        nested: bool = False,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.nested: bool = nested
+        self.names: typing.List[str] = []
+        self.starts: typing.List[np.ndarray] = []
+        self.num_rows: int = 0
+
+
+    def add (
+        self,
+        batch: typing.Union[pa.RecordBatch, pa.Table],
+        ) -> None:
+        """
+Add the node rows of the next batch.
+        """
+        src_name: pa.Array = batch.column(batch.schema.get_field_index("src_name"))
+
+        if self.nested:
+            node_rows: np.ndarray = np.arange(batch.num_rows)
+            self.names.extend(src_name.to_pylist())
+        else:
+            is_node: pa.Array = pc.less(batch.column(batch.schema.get_field_index("edge_id")), 0)
+            node_rows = np.flatnonzero(is_node.to_numpy(zero_copy_only=False))
+            self.names.extend(src_name.filter(is_node).to_pylist())
+
+        self.starts.append(node_rows + self.num_rows)
+        self.num_rows += batch.num_rows
+
+
+    def row_ranges (
+        self,
+        ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+Return the offset of each node row, along with its count of rows, which
+includes the edge rows which follow it in the flat layout.
+        """
+        row_start: np.ndarray = np.concatenate(self.starts) if len(self.starts) > 0 else np.empty(0, dtype=np.int64)
+        row_count: np.ndarray = np.diff(np.append(row_start, self.num_rows))
+
+        return row_start, row_count
+
+
+def group_starts (
+    parq_file: pq.ParquetFile,
+    ) -> np.ndarray:
+    """
+The offset of the first row of each row group within a Parquet file,
+followed by its total number of rows.
+    """
+    group_rows: typing.List[int] = [
+        parq_file.metadata.row_group(i).num_rows
+        for i in range(parq_file.num_row_groups)
+    ]
+
+    return np.cumsum([ 0 ] + group_rows)
+
+
+def write_index (  # pylint: disable=R0913
+    parq_path: cloudpathlib.AnyPath,
+    names: typing.List[str],
+    node_ids: typing.List[int],
+    row_start: np.ndarray,
+    row_count: np.ndarray,
+    edge_rels: typing.List[str],
+    ) -> cloudpathlib.AnyPath:
+    """
+Write the sidecar index for a Parquet file which has already been
+closed, given the node row offsets, as a table sorted by node name. The
+fingerprint of the Parquet file and the edge relations get stored in
+the schema metadata.
+
+Returns the path of the index file.
+    """
+    starts: np.ndarray = group_starts(pq.ParquetFile(parq_path.as_posix()))
+    row_group: np.ndarray = np.searchsorted(starts, row_start, side="right") - 1
+
+    table: pa.Table = pa.table(
+        {
+            "name": pa.array(names, pa.string()),
+            "node_id": pa.array(node_ids, pa.int64()),
+            "row_group": pa.array(row_group, pa.int32()),
+            "row_offset": pa.array(row_start - starts[row_group], pa.int64()),
+            "row_count": pa.array(row_count, pa.int64()),
+        },
+        schema = INDEX_SCHEMA,
+    )
+
+    table = table.sort_by("name").replace_schema_metadata({
+        "nock.fingerprint": parquet_fingerprint(parq_path),
+        "nock.edge_rels": json.dumps(edge_rels),
+    })
+
+    save_idx: cloudpathlib.AnyPath = index_path(parq_path)
+    pq.write_table(table, save_idx.as_posix())
+
+    return save_idx
+
+
+def read_index (
+    parq_path: cloudpathlib.AnyPath,
+    ) -> typing.Optional[typing.Tuple[pa.Table, typing.List[str]]]:
+    """
+Read the sidecar index for a Parquet file, returning its table and the
+edge relations, or None if the index is missing or stale, i.e., its
+fingerprint no longer matches the Parquet file.
+    """
+    load_idx: cloudpathlib.AnyPath = index_path(parq_path)
+
+    if not load_idx.exists():
+        return None
+
+    table: pa.Table = pq.read_table(load_idx.as_posix())
+    metadata: typing.Dict[bytes, bytes] = table.schema.metadata or {}
+
+    if metadata.get(b"nock.fingerprint", b"").decode("utf-8") != parquet_fingerprint(parq_path):
+        return None
+
+    return table, json.loads(metadata[b"nock.edge_rels"])
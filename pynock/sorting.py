@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sorting a NOCK dataset which may be larger than memory, with an
+external merge sort: sorted runs get spilled to temporary Parquet files,
+then merged.
+"""
+
+import heapq
+import tempfile
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+import cloudpathlib
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
+
+from .pynock import BATCH_SIZE, EMPTY_STRING, NOCK_SCHEMA, GraphRow, Node, ParquetOptions
+from .repartition import iter_dataset_tables
+
+
+RUN_SIZE: int = 1000000
+
+SortKey = typing.Tuple[str, bool, bool, int, str, str]
+
+
+def sort_key (
+    row: GraphRow,
+    ) -> SortKey:
+    """
+The sort key for one row: the src node name, then its node rows before
+its edge rows, then the edges by relation and dst node name.
+
+Among the node rows for the same name, any shadow rows sort by `shadow`
+before the local node row (`Node.BASED_LOCAL`), so that the local node
+row comes last and wins on load, regardless of the run it came from.
+    """
+    shadow: int = Node.BASED_LOCAL if row["shadow"] is None else row["shadow"]
+
+    return (
+        row["src_name"],
+        row["edge_id"] >= 0,
+        shadow == Node.BASED_LOCAL,
+        shadow,
+        row["rel_name"] or EMPTY_STRING,
+        row["dst_name"] or EMPTY_STRING,
+    )
+
+
+def renumber_edges (
+    table: pa.Table,
+    ) -> pa.Table:
+    """
+Renumber the `edge_id` values of a sorted table, counting up from 0
+within each node group. The table must start with a node row.
+    """
+    is_edge: np.ndarray = table["edge_id"].to_numpy() >= 0
+    row_idx: np.ndarray = np.arange(table.num_rows)
+    start: np.ndarray = np.maximum.accumulate(np.where(is_edge, 0, row_idx))
+    edge_id: np.ndarray = np.where(is_edge, row_idx - start - 1, -1).astype(np.int32)
+
+    return table.set_column(
+        table.schema.get_field_index("edge_id"),
+        NOCK_SCHEMA.field("edge_id"),
+        pa.array(edge_id, pa.int32()),
+    )
+
+
+def sort_table (
+    table: pa.Table,
+    ) -> pa.Table:
+    """
+Sort a table in the flat NOCK schema in memory, in the order given by
+`sort_key()`, i.e., the same order which `Partition.save_file_parquet()`
+uses with `sort = True`, except that relations sort by name.
+
+The `edge_id` values do not get renumbered, since a table may hold only
+part of a node group.
+    """
+    shadow: pa.ChunkedArray = pc.fill_null(table["shadow"], Node.BASED_LOCAL)
+
+    keys: pa.Table = pa.table({
+        "src_name": table["src_name"],
+        "is_edge": pc.greater_equal(table["edge_id"], 0),
+        "is_local": pc.equal(shadow, Node.BASED_LOCAL),
+        "shadow": shadow,
+        "rel_name": pc.fill_null(table["rel_name"].cast(pa.string()), EMPTY_STRING),
+        "dst_name": pc.fill_null(table["dst_name"], EMPTY_STRING),
+    })
+
+    order: pa.Array = pc.sort_indices(
+        keys,
+        sort_keys = [ ( name, "ascending" ) for name in keys.schema.names ],
+    )
+
+    return table.take(order)
+
+
+def iter_run_rows (
+    run_path: str,
+    *,
+    batch_size: int = BATCH_SIZE,
+    ) -> typing.Iterable[GraphRow]:
+    """
+Iterate through the rows of one sorted run file.
+    """
+    parq_file: pq.ParquetFile = pq.ParquetFile(run_path)
+
+    for batch in parq_file.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def sort_file_parquet (  # pylint: disable=R0913,R0914
+    load_paths: typing.List[cloudpathlib.AnyPath],
+    save_parq: cloudpathlib.AnyPath,
+    *,
+    run_size: int = RUN_SIZE,
+    batch_size: int = BATCH_SIZE,
+    options: typing.Optional[ParquetOptions] = None,
+    debug: bool = False,
+    ) -> int:
+    """
+Stream the rows of a NOCK dataset, then write these as one Parquet file
+in sorted order, renumbering the `edge_id` values within each node
+group.
+
+Memory stays bounded: each run of about `run_size` rows gets sorted,
+then spilled to a temporary Parquet file, and the runs get merged while
+writing batches of `batch_size` rows. When the dataset fits within one
+run, it gets sorted in memory instead.
+
+Returns the number of sorted runs.
+    """
+    if options is None:
+        options = ParquetOptions()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_paths: typing.List[str] = []
+        buffer: typing.List[pa.Table] = []
+        buffer_rows: int = 0
+
+        def _spill () -> None:
+            run_path: str = f"{ tmp_dir }/run_{ len(run_paths):05d}.parq"
+            pq.write_table(sort_table(pa.concat_tables(buffer)), run_path)
+            run_paths.append(run_path)
+
+        for table in iter_dataset_tables(load_paths, batch_size=batch_size, debug=debug):
+            buffer.append(table)
+            buffer_rows += table.num_rows
+
+            if buffer_rows >= run_size:
+                _spill()
+                buffer = []
+                buffer_rows = 0
+
+        writer: pq.ParquetWriter = options.open_writer(save_parq)
+
+        try:
+            if len(run_paths) < 1:
+                # the entire dataset fits within one run
+                if buffer_rows > 0:
+                    writer.write_table(renumber_edges(sort_table(pa.concat_tables(buffer))))
+
+                return 1
+
+            if buffer_rows > 0:
+                _spill()
+
+            if debug:
+                ic(len(run_paths))
+
+            rows: typing.List[GraphRow] = []
+            edge_id: int = 0
+
+            for row in heapq.merge(
+                *[ iter_run_rows(run_path, batch_size=batch_size) for run_path in run_paths ],
+                key = sort_key,
+            ):
+                if row["edge_id"] < 0:
+                    edge_id = 0
+                else:
+                    row["edge_id"] = edge_id
+                    edge_id += 1
+
+                rows.append(row)
+
+                if len(rows) >= batch_size:
+                    writer.write_table(pa.Table.from_pylist(rows, schema=NOCK_SCHEMA))
+                    rows = []
+
+            if len(rows) > 0:
+                writer.write_table(pa.Table.from_pylist(rows, schema=NOCK_SCHEMA))
+
+            return len(run_paths)
+
+        finally:
+            writer.close()
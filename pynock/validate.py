@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Validation of NOCK rows, which collects the errors into a report rather
+than exiting on the first bad row, running vectorized checks over whole
+record batches.
+"""
+
+import typing
+
+from pydantic import BaseModel, NonNegativeInt  # pylint: disable=E0401,E0611
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.compute as pc  # type: ignore  # pylint: disable=E0401
+
+
+ERROR_BUDGET: int = 1000
+
+
+class ValidationIssue (BaseModel):  # pylint: disable=R0903
+    """
+One error found in the input rows.
+    """
+    row_num: NonNegativeInt
+    column: typing.Optional[str] = None
+    reason: str
+
+
+class ValidationReport (BaseModel):
+    """
+A structured report of the errors found in the input rows, where
+parsing stops once the number of errors exceeds `error_budget`.
+
+Rows which have errors get skipped, while the other rows still get
+parsed.
+    """
+    error_budget: NonNegativeInt = ERROR_BUDGET
+    num_rows: NonNegativeInt = 0
+    issues: typing.List[ValidationIssue] = []
+
+
+    @property
+    def num_errors (
+        self,
+        ) -> int:
+        """
+Count the errors found so far.
+        """
+        return len(self.issues)
+
+
+    @property
+    def over_budget (
+        self,
+        ) -> bool:
+        """
+Test whether the errors found so far exceed the error budget.
+        """
+        return self.num_errors > self.error_budget
+
+
+    def add (
+        self,
+        row_num: int,
+        column: typing.Optional[str],
+        reason: str,
+        ) -> None:
+        """
+Add one error to the report.
+        """
+        self.issues.append(ValidationIssue(
+            row_num = row_num,
+            column = column,
+            reason = reason,
+        ))
+
+
+    def add_mask (
+        self,
+        row_num: int,
+        mask: np.ndarray,
+        column: str,
+        reason: str,
+        ) -> None:
+        """
+Add an error for each row flagged in a boolean mask over a batch whose
+first row is `row_num`.
+        """
+        for offset in np.flatnonzero(mask).tolist():
+            self.add(row_num + offset, column, reason)
+
+
+    def summary (
+        self,
+        ) -> typing.Dict[str, int]:
+        """
+Count the errors for each reason.
+        """
+        counts: typing.Dict[str, int] = {}
+
+        for issue in self.issues:
+            counts[issue.reason] = counts.get(issue.reason, 0) + 1
+
+        return counts
+
+
+def _is_blank (
+    col: pa.Array,
+    ) -> np.ndarray:
+    """
+Flag the null or empty strings in a column.
+    """
+    if pa.types.is_dictionary(col.type):
+        col = col.cast(col.type.value_type)
+
+    return pc.fill_null(pc.equal(col, ""), True).to_numpy(zero_copy_only=False)
+
+
+def _range_checks (
+    is_node: np.ndarray,
+    truth: np.ndarray,
+    shadow: np.ndarray,
+    ) -> typing.List[typing.Tuple[np.ndarray, str, str]]:
+    """
+The range checks on `truth` and `shadow`, shared by `check_batch()` and
+`check_row()`, as a mask of the rows which fail each check along with
+its column and reason. Nulls must get filled with out of range values.
+    """
+    return [
+        ( ~((truth >= 0.0) & (truth <= 1.0)), "truth", "truth out of range [0.0, 1.0]", ),
+        ( is_node & (shadow < -1), "shadow", "shadow out of range", ),
+    ]
+
+
+def check_batch (
+    row_num: int,
+    batch: pa.RecordBatch,
+    report: ValidationReport,
+    *,
+    last_src: typing.Optional[str] = None,
+    ) -> typing.Tuple[np.ndarray, typing.Optional[str]]:
+    """
+Run the vectorized checks over a record batch in the flat NOCK layout,
+whose first row is `row_num`, adding any errors found to the report:
+
+  * node names must not be null
+  * `edge_id` must not be null, and its sign distinguishes node rows from edge rows
+  * `truth` must be within `[0.0, 1.0]`
+  * `shadow` on a node row must be at least -1
+  * edge rows must have a relation (possibly blank) and a dst node name
+  * each edge row must follow the node row of its src node
+
+The sequencing carries across batches: `last_src` is the name of the
+most recent valid node row before this batch.
+
+Returns a mask of the rows which passed all of the checks, along with
+the name of the most recent valid node row, for the next batch.
+    """
+    num_rows: int = batch.num_rows
+    num_issues: int = report.num_errors
+    report.num_rows += num_rows
+
+    def _col (name: str) -> pa.Array:
+        return batch.column(batch.schema.get_field_index(name))
+
+    bad: np.ndarray = np.zeros(num_rows, dtype=np.bool_)
+
+    def _flag (mask: np.ndarray, column: str, reason: str) -> None:
+        nonlocal bad
+        report.add_mask(row_num, mask, column, reason)
+        bad |= mask
+
+    edge_id: pa.Array = _col("edge_id")
+    edge_null: np.ndarray = edge_id.is_null().to_numpy(zero_copy_only=False)
+    is_node: np.ndarray = pc.fill_null(pc.less(edge_id, 0), False).to_numpy(zero_copy_only=False)
+    is_edge: np.ndarray = ~is_node & ~edge_null
+
+    _flag(_is_blank(_col("src_name")), "src_name", "node name cannot be null")
+    _flag(edge_null, "edge_id", "edge_id cannot be null")
+
+    truth: np.ndarray = pc.fill_null(_col("truth").cast(pa.float64()), -1.0).to_numpy(zero_copy_only=False)
+    shadow: np.ndarray = pc.fill_null(_col("shadow"), -2).to_numpy(zero_copy_only=False)
+
+    for mask, column, reason in _range_checks(is_node, truth, shadow):
+        _flag(mask, column, reason)
+
+    _flag(_col("is_rdf").is_null().to_numpy(zero_copy_only=False), "is_rdf", "is_rdf cannot be null")
+    _flag(is_edge & _col("rel_name").is_null().to_numpy(zero_copy_only=False), "rel_name", "edge relation cannot be null")
+    _flag(is_edge & _is_blank(_col("dst_name")), "dst_name", "node name cannot be null")
+
+    # an edge row must follow the most recent valid node row, with the
+    # same src name, otherwise it's out of sequence
+    names: np.ndarray = np.array(pc.fill_null(_col("src_name"), "").to_pylist(), dtype=object)
+    valid_node: np.ndarray = is_node & ~bad
+    row_idx: np.ndarray = np.arange(num_rows)
+    last_node: np.ndarray = np.maximum.accumulate(np.where(valid_node, row_idx, -1))
+
+    prev_names: np.ndarray = np.where(last_node >= 0, names[np.maximum(last_node, 0)], last_src)
+    _flag(is_edge & ~bad & (prev_names != names), "src_name", "out of sequence")
+
+    if valid_node.any():
+        last_src = names[np.flatnonzero(valid_node)[-1]]
+
+    # list the errors for this batch in row order
+    report.issues[num_issues:] = sorted(report.issues[num_issues:], key=lambda issue: issue.row_num)
+
+    return ~bad, last_src
+
+
+def check_row (
+    row_num: int,
+    row: typing.Dict[str, typing.Any],
+    report: ValidationReport,
+    ) -> bool:
+    """
+Run the range checks of `check_batch()` on `truth` and `shadow` over one
+row, adding any errors found to the report, since these do not get
+validated when assigned to the `Node` and `Edge` fields. The other
+checks happen while parsing the row.
+
+Returns whether the row passed the checks.
+    """
+    edge_id: typing.Optional[int] = row.get("edge_id")
+
+    checks: typing.List[typing.Tuple[np.ndarray, str, str]] = _range_checks(
+        np.array([ edge_id is not None and edge_id < 0 ]),
+        np.array([ -1.0 if row.get("truth") is None else row["truth"] ], dtype=np.float64),
+        np.array([ -2 if row.get("shadow") is None else row["shadow"] ], dtype=np.int64),
+    )
+
+    row_ok: bool = True
+
+    for mask, column, reason in checks:
+        if mask[0]:
+            report.add(row_num, column, reason)
+            row_ok = False
+
+    return row_ok
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A read-only view of a partition over a memory-mapped Parquet file,
+which builds only an index of the node names up front, then
+materializes nodes and their edges on demand.
+"""
+
+import functools
+import typing
+
+from icecream import ic  # type: ignore  # pylint: disable=E0401
+import cloudpathlib
+import numpy as np
+import pyarrow as pa  # type: ignore  # pylint: disable=E0401
+import pyarrow.parquet as pq  # type: ignore  # pylint: disable=E0401
+
+from .pynock import BATCH_SIZE, NOT_FOUND, Edge, IndexInts, Node, Partition
+from .sidecar import NodeRowScanner, group_starts, list_deltas, read_index
+
+
+NODE_CACHE_SIZE: int = 4096
+ROW_GROUP_CACHE_SIZE: int = 4
+
+
+class PartitionView:
+    """
+A read-only partition over a Parquet file in NOCK format, either layout.
+
+Opening the view memory-maps the file, then indexes each node name by
+the offset and count of its rows: from the sidecar index file written by
+`Partition.save_file_parquet(index=True)` when present and up to date,
+otherwise by reading only the `src_name` and `edge_id` columns. The
+`Node` and `Edge` objects get materialized when looked up, and the most
+recent `cache_size` nodes get kept in an LRU cache, along with a few
+decoded row groups.
+
+The view reads the rows in place, so it cannot open a base file which
+has delta files; load it with `load_merged()` instead, or fold the
+deltas into the base with `compact_deltas()` first.
+
+With the sidecar index, the nodes which have a node row keep their node
+ids from the saved partition, and the edge relations match too; since
+`save_file_parquet()` writes a node row for every node, including the
+dst nodes, all of its node ids match. Without the index, node ids get
+assigned in the order of the node rows, and relations get interned as
+the edges get materialized.
+
+Either way, a dst node name which has no node row in the file, e.g.,
+one written by another tool, gets a new id past the largest indexed id
+as its edges get materialized, which does not match any saved
+partition; these cannot get looked up as nodes.
+    """
+
+    def __init__ (  # pylint: disable=R0913
+        self,
+        load_path: cloudpathlib.AnyPath,
+        *,
+        part_id: IndexInts = NOT_FOUND,  # type: ignore
+        cache_size: int = NODE_CACHE_SIZE,
+        row_group_cache_size: int = ROW_GROUP_CACHE_SIZE,
+        index: bool = True,
+        trusted: bool = False,
+        debug: bool = False,
+        ) -> None:
+        """
+Constructor, which builds the index of node names, or loads it from the
+sidecar `index` file. Raises `ValueError` if the file has delta files.
+        """
+        num_deltas: int = len(list_deltas(load_path))
+
+        if num_deltas > 0:
+            raise ValueError(f"cannot view { load_path } with { num_deltas } delta files, compact these first")
+
+        self.part_id: IndexInts = part_id
+        self.trusted: bool = trusted
+        self.parq_file: pq.ParquetFile = pq.ParquetFile(load_path.as_posix(), memory_map=True)
+        self.nested: bool = Partition._is_nested(self.parq_file.schema_arrow)  # pylint: disable=W0212
+        self.group_start: np.ndarray = group_starts(self.parq_file)
+        self.num_rows: int = int(self.group_start[-1])
+
+        self.names: typing.List[typing.Optional[str]] = []
+        self.node_names: typing.Dict[str, int] = {}
+        self.edge_rels: typing.List[str] = []
+        self.edge_rel_ids: typing.Dict[str, int] = {}
+        self.row_start: np.ndarray = np.empty(0, dtype=np.int64)
+        self.row_count: np.ndarray = np.empty(0, dtype=np.int64)
+        self.num_nodes: int = 0
+
+        sidecar: typing.Optional[typing.Tuple[pa.Table, typing.List[str]]] = None
+
+        if index:
+            sidecar = read_index(load_path)
+
+        self.indexed: bool = sidecar is not None
+
+        if sidecar is not None:
+            self._load_index(*sidecar)
+        else:
+            self._build_index()
+
+        if debug:
+            ic(self.indexed, self.num_nodes, self.num_rows)
+
+        self._row_group = functools.lru_cache(maxsize=row_group_cache_size)(self._read_row_group)
+        self._node = functools.lru_cache(maxsize=cache_size)(self._load_node)
+
+
+    def _set_index (
+        self,
+        names: typing.List[str],
+        node_ids: np.ndarray,
+        row_start: np.ndarray,
+        row_count: np.ndarray,
+        ) -> None:
+        """
+Private method to set the index of node names, where the row offsets get
+stored in arrays indexed by node id, which may have gaps.
+        """
+        num_ids: int = int(node_ids.max()) + 1 if len(node_ids) > 0 else 0
+
+        self.names = [ None ] * num_ids
+        self.row_start = np.full(num_ids, -1, dtype=np.int64)
+        self.row_count = np.zeros(num_ids, dtype=np.int64)
+
+        for node_id, name in zip(node_ids.tolist(), names):
+            self.names[node_id] = name
+
+        self.row_start[node_ids] = row_start
+        self.row_count[node_ids] = row_count
+        self.node_names = dict(zip(names, node_ids.tolist()))
+        self.num_nodes = len(names)
+
+
+    def _build_index (
+        self,
+        ) -> None:
+        """
+Private method to index the node names by the offset of their node row,
+and the count of their rows, reading only the columns needed.
+        """
+        columns: typing.List[str] = [ "src_name" ] if self.nested else [ "src_name", "edge_id" ]
+        scanner: NodeRowScanner = NodeRowScanner(nested = self.nested)
+
+        for batch in self.parq_file.iter_batches(batch_size=BATCH_SIZE, columns=columns):
+            scanner.add(batch)
+
+        row_start, row_count = scanner.row_ranges()
+        self._set_index(scanner.names, np.arange(len(scanner.names)), row_start, row_count)
+
+
+    def _load_index (
+        self,
+        table: pa.Table,
+        edge_rels: typing.List[str],
+        ) -> None:
+        """
+Private method to load the index of node names from a sidecar index,
+skipping the scan of the rows.
+        """
+        row_group: np.ndarray = table["row_group"].to_numpy()
+
+        self._set_index(
+            table["name"].to_pylist(),
+            table["node_id"].to_numpy(),
+            self.group_start[row_group] + table["row_offset"].to_numpy(),
+            table["row_count"].to_numpy(),
+        )
+
+        self.edge_rels = edge_rels
+        self.edge_rel_ids = { rel_name: rel for rel, rel_name in enumerate(edge_rels) }
+
+
+    def _read_row_group (
+        self,
+        row_group: int,
+        ) -> pa.Table:
+        """
+Private method to decode one row group, cached by the constructor.
+        """
+        return self.parq_file.read_row_group(row_group)
+
+
+    def _read_rows (
+        self,
+        start: int,
+        count: int,
+        ) -> pa.Table:
+        """
+Private method to read a range of rows, which may straddle row groups.
+        """
+        tables: typing.List[pa.Table] = []
+        end: int = start + count
+        row_group: int = int(np.searchsorted(self.group_start, start, side="right")) - 1
+
+        while start < end:
+            group_end: int = int(self.group_start[row_group + 1])
+            offset: int = start - int(self.group_start[row_group])
+            length: int = min(end, group_end) - start
+
+            tables.append(self._row_group(row_group).slice(offset, length))
+            start += length
+            row_group += 1
+
+        return pa.concat_tables(tables)
+
+
+    def _node_id (
+        self,
+        node_name: str,
+        ) -> int:
+        """
+Private method to get the node id for a dst node name, assigning a new
+id past the largest indexed id to a name which has no node row.
+        """
+        node_id: typing.Optional[int] = self.node_names.get(node_name)
+
+        if node_id is None:
+            node_id = len(self.names)
+            self.names.append(node_name)
+            self.node_names[node_name] = node_id
+
+        return node_id
+
+
+    def get_edge_rel (
+        self,
+        rel_name: str,
+        ) -> int:
+        """
+Lookup the integer index for the named edge relation, interning it.
+        """
+        rel: typing.Optional[int] = self.edge_rel_ids.get(rel_name)
+
+        if rel is None:
+            rel = len(self.edge_rels)
+            self.edge_rels.append(rel_name)
+            self.edge_rel_ids[rel_name] = rel
+
+        return rel
+
+
+    def _load_node (
+        self,
+        node_id: int,
+        ) -> Node:
+        """
+Private method to materialize a node and its edges from its rows,
+cached by the constructor.
+        """
+        table: pa.Table = self._read_rows(int(self.row_start[node_id]), int(self.row_count[node_id]))
+
+        if self.nested:
+            table = Partition.flatten_table(table)
+
+        rows: typing.Iterator[typing.Dict[str, typing.Any]] = iter([
+            row
+            for batch in table.to_batches()
+            for row in Partition._iter_batch_rows(batch)  # pylint: disable=W0212
+        ])
+
+        row = next(rows)
+
+        node: Node = Partition._build_node(  # pylint: disable=W0212
+            node_id,
+            row["src_name"],
+            shadow = row["shadow"],
+            is_rdf = row["is_rdf"],
+            label_set = set((row["labels"] or "").split(",")),
+            truth = row["truth"],
+            prop_map = Partition._load_props(row["props"]),  # pylint: disable=W0212
+            trusted = self.trusted,
+        )
+
+        for row in rows:
+            edge: Edge = Partition._build_edge(  # pylint: disable=W0212
+                self.get_edge_rel(row["rel_name"]),
+                self._node_id(row["dst_name"]),
+                truth = row["truth"],
+                prop_map = Partition._load_props(row["props"]),  # pylint: disable=W0212
+                trusted = self.trusted,
+            )
+
+            node.add_edge(edge)
+
+        return node
+
+
+    def get_node (
+        self,
+        node_id: int,
+        ) -> typing.Optional[Node]:
+        """
+Get a node by its id, materializing it if not cached, or None if the
+node has no node row in this partition.
+        """
+        if node_id < 0 or node_id >= len(self.row_start) or self.row_start[node_id] < 0:
+            return None
+
+        return self._node(node_id)
+
+
+    def lookup_node (
+        self,
+        node_name: str,
+        *,
+        debug: bool = False,  # pylint: disable=W0613
+        ) -> typing.Optional[Node]:
+        """
+Lookup a node by name, return None if not found.
+        """
+        node_id: typing.Optional[int] = self.node_names.get(node_name)
+
+        if node_id is None:
+            return None
+
+        return self.get_node(node_id)
+
+
+    def cache_info (
+        self,
+        ) -> typing.Any:
+        """
+Report the hits and misses of the node cache.
+        """
+        return self._node.cache_info()
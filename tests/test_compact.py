@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Compact array-backed partitions
+
+  * construct a compact partition programmatically
+  * compare with a reference CSV file
+  * compare the rows generated by compact and object partitions
+  * store the truth values as float32, reading back the shortest decimal
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import CompactPartition, Partition
+
+
+def test_compact_tiny ():
+    load_csv: str = "dat/tiny.csv"
+    tmp_obs = tempfile.NamedTemporaryFile(mode="w+b", delete=True)
+
+    try:
+        part: CompactPartition = CompactPartition(
+            part_id = 0,
+        )
+
+        src_node = part.find_or_create_node("https://www.food.com/recipe/327593")
+        src_node.is_rdf = True
+        src_node.label_set = set(["Recipe"])
+        src_node.prop_map = {
+            "minutes": 8,
+            "name": "anytime crepes",
+        }
+
+        dst_info = [
+            ( "http://purl.org/heals/ingredient/ChickenEgg", "Ingredient", {} ),
+            ( "http://purl.org/heals/ingredient/CowMilk", "Ingredient", {} ),
+            ( "http://purl.org/heals/ingredient/WholeWheatFlour", "Ingredient", { "vegan": True } ),
+        ]
+
+        for dst_name, label, prop_map in dst_info:
+            dst_node = part.find_or_create_node(dst_name)
+            dst_node.is_rdf = True
+            dst_node.label_set = set([label])
+            dst_node.prop_map = prop_map
+
+            part.create_edge(
+                src_node,
+                "http://purl.org/heals/food/uses_ingredient",
+                dst_node,
+            )
+
+        dst_node = part.find_or_create_node("http://purl.org/heals/food/Recipe")
+        dst_node.is_rdf = True
+        dst_node.label_set = set(["top_level"])
+
+        part.create_edge(
+            src_node,
+            "http://www.w3.org/1999/02/22-rdf-syntax-ns#type",
+            dst_node,
+        )
+
+        assert part.num_edges == 4
+        assert len(src_node.edge_map[1]) == 3
+
+        part.save_file_csv(
+            cloudpathlib.AnyPath(tmp_obs.name),
+            encoding = "utf-8",
+            sort = True,
+        )
+
+        obs_text: str = cloudpathlib.AnyPath(tmp_obs.name).read_text()
+        exp_text: str = cloudpathlib.AnyPath(load_csv).read_text()
+
+        assert exp_text == obs_text
+
+    finally:
+        tmp_obs.close()
+
+
+@pytest.mark.parametrize("load_parq", [ "dat/tiny.parq", "dat/recipes.parq" ])
+def test_compact_rows (load_parq: str):
+    part: Partition = Partition.from_arrow(pq.read_table(load_parq))
+
+    part_bulk: CompactPartition = CompactPartition.from_arrow(pq.read_table(load_parq))
+
+    part_rows: CompactPartition = CompactPartition()
+    part_rows.parse_rows(part_rows.iter_load_parquet(pq.ParquetFile(load_parq)))
+
+    for sort in [ False, True ]:
+        exp_rows: list = list(part.iter_gen_rows(sort=sort))
+
+        assert list(part_bulk.iter_gen_rows(sort=sort)) == exp_rows
+        assert list(part_rows.iter_gen_rows(sort=sort)) == exp_rows
+
+
+def test_compact_truth ():
+    part: CompactPartition = CompactPartition(part_id = 0)
+
+    src_node = part.find_or_create_node("src")
+    src_node.truth = 0.9
+    edge = part.create_edge(src_node, "rel", part.find_or_create_node("dst"))
+    edge.truth = 0.7
+
+    assert part._truth.itemsize == 4  # pylint: disable=W0212
+    assert part._edge_truth.itemsize == 4  # pylint: disable=W0212
+
+    assert src_node.truth == 0.9
+    assert edge.truth == 0.7
+    assert [ row["truth"] for row in part.iter_gen_rows() ] == [ 0.9, 0.7, 1.0 ]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+CSV => Partition, using `pyarrow.csv`
+
+  * read a CSV file as record batches
+  * construct the same Partition as the `csv` module engine
+"""
+
+import tempfile
+
+import cloudpathlib
+import pytest
+
+from pynock import Partition
+
+
+def test_csv_arrow ():
+    load_csv = cloudpathlib.AnyPath("dat/tiny.csv")
+
+    part_rows: Partition = Partition(
+        part_id = 0,
+    )
+
+    part_rows.parse_rows(part_rows.iter_load_csv(load_csv))
+
+    part_batch: Partition = Partition(
+        part_id = 0,
+    )
+
+    part_batch.parse_batches(part_batch.iter_batch_csv(load_csv, block_size=256))
+    assert part_batch == part_rows
+
+    part_arrow: Partition = Partition(
+        part_id = 0,
+    )
+
+    part_arrow.parse_rows(part_arrow.iter_load_csv(load_csv, engine="arrow"))
+    assert part_arrow == part_rows
+
+    batches = [ batch for _, batch in Partition.iter_batch_csv(load_csv) ]
+    assert Partition.from_arrow(batches, part_id=0) == part_rows
+
+
+def test_csv_arrow_errors ():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv") as tmp_csv:
+        tmp_csv.write('"src_name","edge_id","rel_name","dst_name","truth","shadow","is_rdf","labels","props"\n')
+        tmp_csv.write('"a",not_an_int,"","",1.0,-1,True,"",""\n')
+        tmp_csv.flush()
+
+        with pytest.raises(ValueError):
+            list(Partition.iter_batch_csv(cloudpathlib.AnyPath(tmp_csv.name)))
+
+    with pytest.raises(ValueError, match="unknown CSV engine"):
+        list(Partition(part_id=0).iter_load_csv(cloudpathlib.AnyPath("dat/tiny.csv"), engine="pandas"))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Partition => CSV, streaming
+
+  * write a CSV file in small chunks
+  * compare with the expected text
+  * sort the node rows by name, keeping the edge rows in the order added
+"""
+
+import csv
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import CompactPartition, Partition
+
+
+def test_csv_stream ():
+    load_csv: str = "dat/tiny.csv"
+    tmp_obs = tempfile.NamedTemporaryFile(mode="w+b", suffix=".csv", delete=True)
+
+    try:
+        part: Partition = Partition.from_arrow(pq.read_table("dat/tiny.parq"))
+
+        part.save_file_csv(
+            cloudpathlib.AnyPath(tmp_obs.name),
+            chunk_size = 2,
+            sort = True,
+        )
+
+        obs_text: str = cloudpathlib.AnyPath(tmp_obs.name).read_text()
+        exp_text: str = cloudpathlib.AnyPath(load_csv).read_text()
+
+        assert exp_text == obs_text
+
+    finally:
+        tmp_obs.close()
+
+
+@pytest.mark.parametrize("part_class", [ Partition, CompactPartition ])
+def test_csv_sort_order (part_class):
+    part: Partition = part_class.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    # the order of sorting the rows on `SORT_COLUMNS`
+    expected: list = [
+        ( row["src_name"], row["edge_id"], row["dst_name"] or "" )
+        for row in sorted(part.iter_gen_rows(), key=lambda row: ( row["src_name"], row["edge_id"] ))
+    ]
+
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+        part.save_file_csv(cloudpathlib.AnyPath(tmp_csv.name), sort=True)
+
+        with open(tmp_csv.name, encoding="utf-8", newline="") as fp:
+            observed: list = [
+                ( row["src_name"], int(float(row["edge_id"])), row["dst_name"] )
+                for row in csv.DictReader(fp)
+            ]
+
+    assert observed == expected
+
+    # which differs from sorting the edge rows by dst name
+    assert observed != [
+        ( row["src_name"], row["edge_id"], row["dst_name"] or "" )
+        for row in part.iter_gen_rows(sort=True)
+    ]
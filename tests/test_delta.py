@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Incremental updates through delta files
+
+  * write new and changed nodes as numbered delta files
+  * merge the base and its deltas on load, where the last writer wins per node name
+  * compact the deltas back into the base, keeping its layout
+  * the readers given a base path merge its deltas, or refuse to open it
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+from typer.testing import CliRunner
+
+from cli import APP
+from pynock import Graph, Partition, PartitionView, ScanOptions, compact_deltas, list_deltas, \
+    load_merged, read_index, sort_file_parquet, write_delta
+
+
+def _updates (
+    part: Partition,
+    ) -> Partition:
+    """
+Build a delta which changes one node, replacing its edges, and adds a
+new node with an edge to the changed node.
+    """
+    delta: Partition = Partition(part_id = 0)
+
+    changed = next(iter(part.nodes.values()))
+    node = delta.find_or_create_node(changed.name)
+    node.prop_map = { "seq": 1 }
+    node.label_set = set([ "changed" ])
+
+    added = delta.find_or_create_node("added node")
+    added.prop_map = { "seq": 1 }
+    delta.create_edge(added, "linked", node)
+
+    return delta
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_delta_merge (nested):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+    changed_name: str = next(iter(part.nodes.values())).name
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(base_path, nested=nested)
+
+        write_delta(base_path, _updates(part))
+        assert [ seq for seq, _ in list_deltas(base_path) ] == [ 1 ]
+
+        merged: Partition = load_merged(base_path, part_id=0)
+        assert len(merged.nodes) == len(part.nodes) + 1
+
+        node = merged.lookup_node(changed_name)
+        assert node.prop_map == { "seq": 1 }
+        assert node.label_set == set([ "changed" ])
+        assert len(node.edge_map) == 0
+
+        added = merged.lookup_node("added node")
+        assert added.prop_map == { "seq": 1 }
+        assert [ edge.node_id for edge in added.edge_map[merged.edge_rel_ids["linked"]] ] == [ node.node_id ]
+
+        # a later delta wins over an earlier one
+        again: Partition = Partition(part_id = 0)
+        again.find_or_create_node(changed_name).prop_map = { "seq": 2 }
+        write_delta(base_path, again)
+        assert [ seq for seq, _ in list_deltas(base_path) ] == [ 1, 2 ]
+        assert load_merged(base_path).lookup_node(changed_name).prop_map == { "seq": 2 }
+
+        # the graph loader merges the deltas, and ignores the delta files
+        graph: Graph = Graph.load_dir(cloudpathlib.AnyPath(tmp_dir))
+        assert len(graph.partitions) == 1
+        assert graph.partitions[0].lookup_node(changed_name).prop_map == { "seq": 2 }
+
+        # compaction folds the deltas into the base
+        expected: Partition = load_merged(base_path, part_id=0)
+        assert compact_deltas(base_path, batch_size=7) == 2
+        assert len(list_deltas(base_path)) == 0
+        assert compact_deltas(base_path) == 0
+
+        assert Partition._is_nested(pq.read_schema(base_path.as_posix())) == nested  # pylint: disable=W0212
+        assert load_merged(base_path, part_id=0) == expected
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_delta_readers (nested):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+    changed_name: str = next(iter(part.nodes.values())).name
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(base_path, batch_size=7, nested=nested, index=True)
+        assert read_index(base_path) is not None
+
+        write_delta(base_path, _updates(part))
+        expected: Partition = load_merged(base_path, part_id=0)
+
+        # appending a delta invalidates the sidecar index
+        assert read_index(base_path) is None
+
+        assert Partition.load_file_parquet(base_path, part_id=0) == expected
+        assert Partition.load_file_parquet(base_path, max_threads=4, part_id=0) == expected
+
+        loaded: Partition = Partition.load_dataset([ base_path ], part_id=0)
+        assert loaded.lookup_node(changed_name).prop_map == { "seq": 1 }
+        assert loaded.lookup_node("added node") is not None
+
+        scanned: Partition = Partition.load_dataset(
+            [ base_path ],
+            scan = ScanOptions(name_prefix = "added"),
+            part_id = 0,
+        )
+        assert scanned.lookup_node("added node").prop_map == { "seq": 1 }
+        assert scanned.lookup_node(changed_name).prop_map != { "seq": 1 }
+
+        sort_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "sorted.parq"
+        sort_file_parquet([ base_path ], sort_path)
+        assert pq.read_table(sort_path.as_posix()).num_rows == expected.to_arrow().num_rows
+
+        with pytest.raises(ValueError):
+            PartitionView(base_path)
+
+        compact_deltas(base_path)
+        assert PartitionView(base_path).lookup_node(changed_name).prop_map == { "seq": 1 }
+
+
+def test_delta_load_parq_cli ():
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        save_csv: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.csv"
+        part.save_file_parquet(base_path)
+        write_delta(base_path, _updates(part))
+
+        result = CliRunner().invoke(APP, [ "load-parq", "--file", base_path.as_posix(), "--save-csv", save_csv.as_posix() ])
+        assert result.exit_code == 0
+
+        assert "added node" in save_csv.read_text(encoding="utf-8")
+
+
+def test_delta_validate_cli ():
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(base_path)
+
+        result = CliRunner().invoke(APP, [ "validate", "--file", base_path.as_posix() ])
+        assert result.exit_code == 0
+
+        # a delta with a truth out of range, which validation must see
+        delta: Partition = _updates(part)
+        delta.lookup_node("added node").truth = 1.5
+        write_delta(base_path, delta)
+
+        result = CliRunner().invoke(APP, [ "validate", "--file", base_path.as_posix() ])
+        assert result.exit_code == 1
+        assert "truth: truth out of range [0.0, 1.0]" in result.output
+
+        save_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "nested.parq"
+        result = CliRunner().invoke(APP, [ "convert-parq", "--file", base_path.as_posix(), "--save-parq", save_path.as_posix() ])
+        assert result.exit_code == 1
+        assert not save_path.exists()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+  * intern edge relations in both directions
+"""
+
+import pytest
+
+from pynock import NOT_FOUND, Partition
+
+
+def test_edge_rels ():
+    part: Partition = Partition(
+        part_id = 0,
+    )
+
+    assert part.get_edge_rel("") == 0
+    assert part.get_edge_rel("rdf:type") == NOT_FOUND
+    assert part.get_edge_rel("rdf:type", create=True) == 1
+    assert part.get_edge_rel("rdf:type", create=True) == 1
+    assert part.get_edge_rel("wtm:uses_ingredient", create=True) == 2
+    assert part.edge_rels == [ "", "rdf:type", "wtm:uses_ingredient" ]
+    assert part.edge_rel_ids == { "": 0, "rdf:type": 1, "wtm:uses_ingredient": 2 }
+
+    # the name => index map gets rebuilt after assigning the list
+    part.edge_rels = [ "", "wtm:uses_ingredient" ]
+
+    assert part.get_edge_rel("wtm:uses_ingredient") == 1
+    assert part.get_edge_rel("rdf:type") == NOT_FOUND
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Graph datasets
+
+  * discover a directory of partition files
+  * load the partitions concurrently
+  * lookup nodes across the partitions
+"""
+
+import shutil
+import tempfile
+
+import cloudpathlib
+import pytest
+
+from pynock import CompactPartition, Graph, Partition
+
+
+@pytest.mark.parametrize("max_workers", [ 1, 2 ])
+def test_graph_load_dir (max_workers):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shutil.copy("dat/recipes.parq", f"{ tmp_dir }/part_0.parq")
+        shutil.copy("dat/tiny.csv", f"{ tmp_dir }/part_1.csv")
+        shutil.copy("dat/tiny.ttl", f"{ tmp_dir }/ignored.ttl")
+
+        load_dir = cloudpathlib.AnyPath(tmp_dir)
+
+        assert [ path.name for path in Graph.discover(load_dir) ] == [ "part_0.parq", "part_1.csv" ]
+
+        graph: Graph = Graph.load_dir(
+            load_dir,
+            max_workers = max_workers,
+        )
+
+        assert sorted(graph.partitions) == [ 0, 1 ]
+        assert graph.partitions[0].part_id == 0
+
+        tiny_name: str = "https://www.food.com/recipe/327593"
+        assert graph.lookup_part(tiny_name) == 1
+        assert graph.lookup_node(tiny_name).name == tiny_name
+
+        recipe_name: str = next(iter(graph.partitions[0].node_names))
+        assert graph.lookup_part(recipe_name) == 0
+
+        assert graph.lookup_part("not a node") < 0
+        assert graph.lookup_node("not a node") is None
+
+
+def test_graph_compact ():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shutil.copy("dat/tiny.parq", f"{ tmp_dir }/part_0.parq")
+
+        graph: Graph = Graph.load_dir(
+            cloudpathlib.AnyPath(tmp_dir),
+            part_class = CompactPartition,
+            max_workers = 2,
+        )
+
+        assert isinstance(graph.partitions[0], CompactPartition)
+        assert graph.num_nodes() == len(graph.partitions[0].node_names)
+
+        with pytest.raises(ValueError):
+            graph.add_partition(Partition(part_id = 0))
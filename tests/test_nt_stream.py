@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+RDF (N-Triples) => CSV, streaming
+
+  * convert an RDF file to N-Triples, with subjects out of order
+  * parse it as a stream, with an external sort by subject
+  * compare with parsing through `rdflib`
+  * by default, group subjects and drop duplicate triples, as `rdflib` does
+"""
+
+import random
+import tempfile
+
+import cloudpathlib
+import rdflib
+import pytest
+
+from pynock import NOT_FOUND, Partition
+from pynock.ntriples import iter_spill_sorted, parse_line
+
+
+def test_nt_stream ():
+    tmp_nt = tempfile.NamedTemporaryFile(mode="w+", suffix=".nt", delete=True)
+
+    try:
+        graph = rdflib.Graph()
+        graph.parse("dat/tiny.ttl", format="ttl")
+
+        lines: list = graph.serialize(format="nt").strip().split("\n")
+        random.Random(42).shuffle(lines)
+        tmp_nt.write("# comment line\n\n" + "\n".join(lines) + "\n")
+        tmp_nt.flush()
+
+        part_exp: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_exp.parse_rows(
+            part_exp.iter_load_rdf(
+                cloudpathlib.AnyPath(tmp_nt.name),
+                rdf_format = "turtle",
+            ),
+        )
+
+        part_obs: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_obs.parse_rows(
+            part_obs.iter_load_rdf(
+                cloudpathlib.AnyPath(tmp_nt.name),
+                rdf_format = "nt",
+                sort_subjects = True,
+                spill_size = 2,
+            ),
+        )
+
+        assert list(part_obs.iter_gen_rows(sort=True)) == list(part_exp.iter_gen_rows(sort=True))
+
+    finally:
+        tmp_nt.close()
+
+
+def test_nt_stream_default ():
+    lines: list = [
+        "<http://ex.org/a> <http://ex.org/p> <http://ex.org/b> .",
+        "<http://ex.org/b> <http://ex.org/p> <http://ex.org/c> .",
+        "<http://ex.org/a> <http://ex.org/q> <http://ex.org/c> .",
+        "<http://ex.org/b> <http://ex.org/p> <http://ex.org/c> .",
+        "<http://ex.org/a> <http://ex.org/p> <http://ex.org/b> .",
+    ]
+
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".nt") as tmp_nt:
+        tmp_nt.write("\n".join(lines) + "\n")
+        tmp_nt.flush()
+        nt_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_nt.name)
+
+        part: Partition = Partition(part_id = 0)
+        exp_rows: list = list(part.iter_load_rdf(nt_path, rdf_format="turtle"))
+        obs_rows: list = list(part.iter_load_rdf(nt_path, rdf_format="nt"))
+
+        # without the sort, each run of a subject gets its own node row
+        # and the duplicates across runs remain
+        raw_rows: list = list(part.iter_load_rdf(nt_path, rdf_format="nt", sort_subjects=False))
+
+    assert len(obs_rows) == len(exp_rows) == 5
+
+    assert sorted(( row["src_name"], row["edge_id"], row["rel_name"], row["dst_name"] ) for _, row in obs_rows) == \
+        sorted(( row["src_name"], row["edge_id"], row["rel_name"], row["dst_name"] ) for _, row in exp_rows)
+
+    assert len(raw_rows) == 10
+    assert [ row["src_name"] for _, row in raw_rows if row["edge_id"] == NOT_FOUND ] == [
+        "http://ex.org/a",
+        "http://ex.org/b",
+        "http://ex.org/a",
+        "http://ex.org/b",
+        "http://ex.org/a",
+    ]
+
+
+def test_nt_parse_line ():
+    line: str = '<http://ex.org/s> <http://ex.org/p> "a \\"b\\"\\n\\u00E9"@en-US <http://ex.org/g> .'
+    triple = parse_line(line)
+
+    subj, pred, objt, _ = list(rdflib.Dataset().parse(data=line, format="nquads").quads())[0]
+    assert triple == ( str(subj), str(pred), str(objt) )
+
+    assert parse_line("_:b0 <http://ex.org/p> _:b1.") == ( "b0", "http://ex.org/p", "b1" )
+    assert parse_line("  # comment") is None
+
+    with pytest.raises(ValueError):
+        parse_line("<http://ex.org/s> <http://ex.org/p> .")
+
+
+def test_nt_spill_sorted ():
+    triples: list = [ ( str(i % 7), "p", str(i) ) for i in range(100) ]
+    obs: list = list(iter_spill_sorted(triples, spill_size=9))
+
+    assert obs == sorted(triples, key=lambda t: t[0])
+
+
+@pytest.mark.parametrize("rdf_format", [ "nt", "ttl", "xml" ])
+def test_rdf_stream_write (rdf_format: str):
+    tmp_obs = tempfile.NamedTemporaryFile(mode="w+b", delete=True)
+
+    try:
+        part: Partition = Partition(
+            part_id = 0,
+        )
+
+        src_node = part.find_or_create_node("http://ex.org/s p{ace}")
+        src_node.is_rdf = True
+
+        for dst_name in [ "http://ex.org/o1", "http://ex.org/é\"2" ]:
+            dst_node = part.find_or_create_node(dst_name)
+            part.create_edge(src_node, "http://ex.org/p", dst_node)
+
+        part.create_edge(src_node, "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", dst_node)
+
+        part.save_file_rdf(
+            cloudpathlib.AnyPath(tmp_obs.name),
+            rdf_format = rdf_format,
+        )
+
+        obs_graph = rdflib.Graph().parse(tmp_obs.name, format=rdf_format)
+
+        assert sorted(( str(s), str(p), str(o) ) for s, p, o in obs_graph) == sorted([
+            ( "http://ex.org/s p{ace}", "http://ex.org/p", "http://ex.org/o1" ),
+            ( "http://ex.org/s p{ace}", "http://ex.org/p", "http://ex.org/é\"2" ),
+            ( "http://ex.org/s p{ace}", "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", "http://ex.org/é\"2" ),
+        ])
+
+    finally:
+        tmp_obs.close()
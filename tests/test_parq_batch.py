@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Parquet => CSV, columnar
+
+  * read a Parquet file as record batches
+  * construct a Partition internally, with edges straddling batches
+  * write a CSV file
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import NESTED_SCHEMA, NOCK_SCHEMA, ParquetOptions, Partition
+
+
+def test_parq_batch ():
+    load_parq: str = "dat/tiny.parq"
+    load_csv: str = "dat/tiny.csv"
+    tmp_obs = tempfile.NamedTemporaryFile(mode="w+b", delete=True)
+
+    try:
+        # construct a Partition, using a batch size which splits the
+        # edge rows of a node across batches
+        part: Partition = Partition(
+            part_id = 0,
+        )
+
+        parq_file: pq.ParquetFile = pq.ParquetFile(load_parq)
+
+        part.parse_batches(
+            part.iter_batch_parquet(
+                parq_file,
+                batch_size = 3,
+            ),
+        )
+
+        # write the partition as a CSV file
+        part.save_file_csv(
+            cloudpathlib.AnyPath(tmp_obs.name),
+            encoding = "utf-8",
+            sort = True,
+        )
+
+        # compare the respective texts
+        obs_text: str = cloudpathlib.AnyPath(tmp_obs.name).read_text()
+        exp_text: str = cloudpathlib.AnyPath(load_csv).read_text()
+
+        assert exp_text == obs_text
+
+    finally:
+        tmp_obs.close()
+
+
+def test_parq_batch_rows ():
+    parq_file: pq.ParquetFile = pq.ParquetFile("dat/recipes.parq")
+    rows: list = list(Partition.iter_load_parquet(parq_file))
+
+    assert len(rows) == parq_file.metadata.num_rows
+    assert [ row_num for row_num, _ in rows ] == list(range(len(rows)))
+    assert rows[0][1]["src_name"] == "164636"
+    assert rows[1][1]["edge_id"] == 0
+
+
+def test_from_arrow ():
+    for load_parq in [ "dat/tiny.parq", "dat/recipes.parq" ]:
+        part_rows: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_rows.parse_rows(part_rows.iter_load_parquet(pq.ParquetFile(load_parq)))
+
+        part_bulk: Partition = Partition.from_arrow(
+            pq.read_table(load_parq),
+            part_id = 0,
+        )
+
+        assert part_bulk == part_rows
+
+
+def test_from_arrow_sequence ():
+    table = pq.read_table("dat/tiny.parq")
+
+    # drop the node row for the recipe, which leaves its edge rows
+    # out of sequence
+    with pytest.raises(ValueError, match="out of sequence"):
+        Partition.from_arrow(table.slice(1))
+
+
+def test_save_parq_batches ():
+    load_csv: str = "dat/tiny.csv"
+    tmp_parq = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+    tmp_obs = tempfile.NamedTemporaryFile(mode="w+b", delete=True)
+
+    try:
+        part: Partition = Partition(
+            part_id = 0,
+        )
+
+        part.parse_rows(part.iter_load_csv(cloudpathlib.AnyPath(load_csv)))
+
+        # one row group per batch, in the explicit NOCK schema
+        part.save_file_parquet(
+            cloudpathlib.AnyPath(tmp_parq.name),
+            batch_size = 4,
+        )
+
+        parq_file: pq.ParquetFile = pq.ParquetFile(tmp_parq.name)
+
+        assert parq_file.num_row_groups == 3
+        assert parq_file.schema_arrow.equals(NOCK_SCHEMA)
+
+        # read it back again
+        part = Partition(
+            part_id = 0,
+        )
+
+        part.parse_batches(part.iter_batch_parquet(parq_file))
+
+        part.save_file_csv(
+            cloudpathlib.AnyPath(tmp_obs.name),
+            encoding = "utf-8",
+            sort = True,
+        )
+
+        obs_text: str = cloudpathlib.AnyPath(tmp_obs.name).read_text()
+        exp_text: str = cloudpathlib.AnyPath(load_csv).read_text()
+
+        assert exp_text == obs_text
+
+    finally:
+        tmp_parq.close()
+        tmp_obs.close()
+
+
+def test_save_parq_options ():
+    tmp_parq = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+
+    try:
+        part: Partition = Partition.from_arrow(pq.read_table("dat/tiny.parq"))
+
+        part.save_file_parquet(
+            cloudpathlib.AnyPath(tmp_parq.name),
+            options = ParquetOptions(
+                compression = "gzip",
+                write_statistics = False,
+            ),
+        )
+
+        parq_file: pq.ParquetFile = pq.ParquetFile(tmp_parq.name)
+        col_meta = parq_file.metadata.row_group(0).column(0)
+
+        assert col_meta.compression == "GZIP"
+        assert not col_meta.is_stats_set
+        assert Partition.from_arrow(parq_file.read()) == part
+
+    finally:
+        tmp_parq.close()
+
+
+def test_nest_table ():
+    for load_parq in [ "dat/tiny.parq", "dat/recipes.parq" ]:
+        flat = pq.read_table(load_parq).cast(NOCK_SCHEMA)
+        nested = Partition.nest_table(flat)
+
+        assert nested.schema.equals(NESTED_SCHEMA)
+        assert nested.num_rows == pc.sum(pc.less(flat["edge_id"], 0)).as_py()
+
+        # both layouts load as the same partition
+        assert Partition.from_arrow(nested) == Partition.from_arrow(flat)
+        assert Partition.from_arrow(Partition.flatten_table(nested)) == Partition.from_arrow(flat)
+
+
+def test_save_parq_nested ():
+    load_parq: str = "dat/recipes.parq"
+    tmp_nest = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+    tmp_flat = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+
+    try:
+        part: Partition = Partition.from_arrow(
+            pq.read_table(load_parq),
+            part_id = 0,
+        )
+
+        part.save_file_parquet(
+            cloudpathlib.AnyPath(tmp_nest.name),
+            batch_size = 50,
+            nested = True,
+        )
+
+        parq_file: pq.ParquetFile = pq.ParquetFile(tmp_nest.name)
+
+        assert parq_file.schema_arrow.equals(NESTED_SCHEMA)
+        assert parq_file.metadata.num_rows == part.next_node
+
+        # load the nested file, row by row and as batches
+        part_rows: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_rows.parse_rows(part_rows.iter_load_parquet(parq_file))
+        assert part_rows == part
+
+        part_batch: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_batch.parse_batches(part_batch.iter_batch_parquet(parq_file, batch_size=7))
+        assert part_batch == part
+
+        # convert back to the flat layout, with the node groups
+        # straddling batches
+        Partition.convert_file_parquet(
+            pq.ParquetFile(load_parq),
+            cloudpathlib.AnyPath(tmp_nest.name),
+            nested = True,
+        )
+
+        Partition.convert_file_parquet(
+            pq.ParquetFile(tmp_nest.name),
+            cloudpathlib.AnyPath(tmp_flat.name),
+            nested = False,
+        )
+
+        assert pq.ParquetFile(tmp_flat.name).schema_arrow.equals(NOCK_SCHEMA)
+        assert Partition.from_arrow(pq.read_table(tmp_flat.name), part_id=0) == part
+
+    finally:
+        tmp_nest.close()
+        tmp_flat.close()
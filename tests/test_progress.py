@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Progress hooks
+
+  * callback every N rows, with throughput metrics
+  * progress turned off
+"""
+
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import Partition, ProgressMetrics, iter_progress
+
+
+def test_progress_rows ():
+    parq_file: pq.ParquetFile = pq.ParquetFile("dat/recipes.parq")
+    reports: list = []
+
+    part: Partition = Partition(part_id = 0)
+
+    part.parse_rows(
+        part.iter_load_parquet(parq_file),
+        progress = reports.append,
+        progress_every = 100,
+    )
+
+    assert [ metrics.num_rows for metrics in reports ] == [ 100, 200, 300, 400, 500, 567 ]
+    assert all(isinstance(metrics, ProgressMetrics) for metrics in reports)
+    assert [ metrics.done for metrics in reports ].count(True) == 1
+    assert reports[-1].done
+    assert reports[-1].num_bytes == 0
+
+    part_off: Partition = Partition(part_id = 0)
+    part_off.parse_rows(part_off.iter_load_parquet(parq_file), progress="off")
+
+    assert part_off == part
+
+
+def test_progress_batches ():
+    parq_file: pq.ParquetFile = pq.ParquetFile("dat/recipes.parq")
+    reports: list = []
+
+    part: Partition = Partition(part_id = 0)
+
+    part.parse_batches(
+        part.iter_batch_parquet(parq_file, batch_size=50),
+        progress = reports.append,
+        progress_every = 200,
+    )
+
+    assert [ metrics.num_rows for metrics in reports ] == [ 200, 400, 567 ]
+    assert reports[-1].num_batches == 12
+    assert reports[-1].num_bytes > 0
+    assert reports[-1].rows_per_sec > 0.0
+
+
+def test_progress_mode ():
+    with pytest.raises(ValueError, match="unknown progress mode"):
+        list(iter_progress([ ( 0, {} ) ], progress="loud"))
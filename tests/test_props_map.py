@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Parquet map properties
+
+  * encode/decode property pairs as Parquet maps
+  * write a partition with map properties, in flat and nested layouts
+  * read it back, with each of the load paths
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import CompactPartition, NESTED_MAP_SCHEMA, NOCK_MAP_SCHEMA, Partition
+
+
+def test_props_map_values ():
+    values = [
+        '{"a":1,"b":"x","c":2.5,"d":true,"e":[1,2],"f":null}',
+        "",
+        None,
+        { "g": { "h": 1 }, "i": 2**70 },
+    ]
+
+    expected = [
+        { "a": 1, "b": "x", "c": 2.5, "d": True, "e": [ 1, 2 ], "f": None },
+        {},
+        {},
+        { "g": { "h": 1 }, "i": 2**70 },
+    ]
+
+    props = Partition.encode_props(values)
+
+    assert Partition.decode_props(props) == expected
+    assert Partition.decode_props(props.slice(2)) == expected[2:]
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_props_map_load (nested):
+    tmp_parq = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+
+    try:
+        part: Partition = Partition.from_arrow(
+            pq.read_table("dat/recipes.parq"),
+            part_id = 0,
+        )
+
+        part.save_file_parquet(
+            cloudpathlib.AnyPath(tmp_parq.name),
+            batch_size = 50,
+            nested = nested,
+            props_map = True,
+        )
+
+        parq_file: pq.ParquetFile = pq.ParquetFile(tmp_parq.name)
+        exp_schema = NESTED_MAP_SCHEMA if nested else NOCK_MAP_SCHEMA
+
+        assert parq_file.schema_arrow.equals(exp_schema)
+
+        part_rows: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_rows.parse_rows(part_rows.iter_load_parquet(parq_file))
+        assert part_rows == part
+
+        part_batch: Partition = Partition(
+            part_id = 0,
+        )
+
+        part_batch.parse_batches(part_batch.iter_batch_parquet(parq_file, batch_size=7))
+        assert part_batch == part
+
+        assert Partition.from_arrow(parq_file.read(), part_id=0) == part
+
+        part_compact = CompactPartition.from_arrow(parq_file.read(), part_id=0)
+        assert list(part_compact.iter_gen_rows()) == list(part.iter_gen_rows())
+
+    finally:
+        tmp_parq.close()
+
+
+def test_props_map_convert ():
+    load_parq: str = "dat/recipes.parq"
+    tmp_map = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+    tmp_json = tempfile.NamedTemporaryFile(mode="w+b", suffix=".parq", delete=True)
+
+    try:
+        Partition.convert_file_parquet(
+            pq.ParquetFile(load_parq),
+            cloudpathlib.AnyPath(tmp_map.name),
+            nested = False,
+            props_map = True,
+        )
+
+        assert pq.ParquetFile(tmp_map.name).schema_arrow.equals(NOCK_MAP_SCHEMA)
+
+        Partition.convert_file_parquet(
+            pq.ParquetFile(tmp_map.name),
+            cloudpathlib.AnyPath(tmp_json.name),
+            nested = False,
+        )
+
+        exp_part: Partition = Partition.from_arrow(pq.read_table(load_parq))
+
+        assert Partition.from_arrow(pq.read_table(tmp_map.name)) == exp_part
+        assert Partition.from_arrow(pq.read_table(tmp_json.name)) == exp_part
+
+    finally:
+        tmp_map.close()
+        tmp_json.close()
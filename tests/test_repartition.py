@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Repartitioning
+
+  * split a Parquet file into partitions, by hash and by range
+  * spill the shadow node names
+  * load the partitions as a graph, then resolve the shadow nodes
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import Graph, LocalRegistry, Partition, ShadowResolver, \
+    hash_parts, range_parts, repartition_files, sample_boundaries
+
+
+def test_assign_parts ():
+    names = pa.array([ "a", "b", None, "a", "z" ])
+
+    parts = hash_parts(names, 4)
+    assert parts[2] == -1
+    assert parts[0] == parts[3]
+    assert ((parts[[0, 1, 4]] >= 0) & (parts[[0, 1, 4]] < 4)).all()
+
+    assert range_parts(names, [ "b", "m" ]).tolist() == [ 0, 1, -1, 0, 2 ]
+
+
+@pytest.mark.parametrize("mode", [ "hash", "range" ])
+def test_repartition (mode):
+    load_parq: str = "dat/recipes.parq"
+    orig: Partition = Partition.from_arrow(pq.read_table(load_parq), part_id=0)
+    orig_rows = list(orig.iter_gen_rows())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_paths = repartition_files(
+            [ cloudpathlib.AnyPath(load_parq) ],
+            cloudpathlib.AnyPath(tmp_dir),
+            3,
+            mode = mode,
+            batch_size = 50,
+            spill_size = 5,
+        )
+
+        assert len(save_paths) == 3
+
+        graph: Graph = Graph.load_dir(
+            cloudpathlib.AnyPath(tmp_dir),
+            max_workers = 1,
+        )
+
+        # every node row and edge row lands in exactly one partition
+        node_rows = [
+            row
+            for row in orig_rows
+            if row["edge_id"] < 0
+        ]
+
+        for row in node_rows:
+            node = graph.lookup_node(row["src_name"])
+            assert node is not None
+            assert node.prop_map == orig.lookup_node(row["src_name"]).prop_map
+
+        num_edges: int = sum(
+            1
+            for part in graph.partitions.values()
+            for row in part.iter_gen_rows()
+            if row["edge_id"] >= 0
+        )
+
+        assert num_edges == len(orig_rows) - len(node_rows)
+
+        # the shadow nodes all resolve to the partitions where they reside
+        resolver: ShadowResolver = ShadowResolver(LocalRegistry(graph.partitions))
+        num_shadows: int = 0
+
+        for part in graph.partitions.values():
+            for name, node in resolver.resolve_partition(part).items():
+                assert node is not None
+                assert graph.lookup_part(name) == part.shadow_refs[name] != part.part_id
+                num_shadows += 1
+
+        assert num_shadows > 0
+
+
+def test_repartition_low_cardinality ():
+    part: Partition = Partition(part_id = 0)
+
+    for name in [ "c", "a", "b" ]:
+        part.find_or_create_node(name)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "input.parq"
+        part.save_file_parquet(load_path)
+
+        save_dir: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "parts"
+        save_dir.mkdir()
+
+        # too few distinct names for the partitions requested
+        assert sample_boundaries([ load_path ], 5) == [ "b", "c" ]
+
+        with pytest.raises(ValueError):
+            repartition_files([ load_path ], save_dir, 5, mode="range")
+
+        with pytest.raises(ValueError):
+            repartition_files([ load_path ], save_dir, 3, mode="range", boundaries=[ "b", "b" ])
+
+        save_paths = repartition_files([ load_path ], save_dir, 3, mode="range")
+        assert len(save_paths) == 3
+        assert [ pq.read_table(save_path.as_posix())["src_name"].to_pylist() for save_path in save_paths ] == [
+            [ "a" ], [ "b" ], [ "c" ],
+        ]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Row-group-parallel Parquet loading
+
+  * decode row groups in a thread pool, yielding batches in file order
+  * node rows whose edge rows straddle row group boundaries
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import NOCK_SCHEMA, Partition
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_row_groups_parallel (nested):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+
+        # small row groups, which split the edge rows of some nodes
+        part.save_file_parquet(load_path, batch_size=7, nested=nested)
+        assert pq.ParquetFile(load_path.as_posix()).num_row_groups > 50
+
+        for max_threads in [ 1, 4, 16 ]:
+            batches: list = list(Partition.iter_row_groups(load_path, max_threads=max_threads))
+
+            assert [ row_num for row_num, _ in batches ][:2] == [ 0, batches[0][1].num_rows ]
+            assert all(batch.schema.names == NOCK_SCHEMA.names for _, batch in batches)
+
+            part_bulk: Partition = Partition.load_file_parquet(load_path, max_threads=max_threads, part_id=0)
+            assert part_bulk == part
+
+            part_rows: Partition = Partition(part_id = 0)
+            part_rows.parse_batches(iter(batches), progress="off")
+            assert part_rows == part
+
+
+def test_row_groups_close_readers (monkeypatch):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+    opened: list = []
+
+    class RecordedFile (pq.ParquetFile):  # pylint: disable=R0903
+        def __init__ (self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(load_path, batch_size=7)
+
+        monkeypatch.setattr(pq, "ParquetFile", RecordedFile)
+
+        for max_threads in [ 1, 4 ]:
+            Partition.load_file_parquet(load_path, max_threads=max_threads, part_id=0)
+
+            # including a consumer which stops early
+            batches = Partition.iter_row_groups(load_path, max_threads=max_threads)
+            next(iter(batches))
+            batches.close()
+
+        assert len(opened) > 0
+        assert all(parq_file.closed for parq_file in opened)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Projection and predicate pushdown
+
+  * read only the topology columns, with defaults for the others
+  * filter edge rows by relation and truth
+  * filter whole nodes by name prefix and `is_rdf`
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import NOCK_SCHEMA, Partition, ScanOptions
+
+
+def count_edges (part: Partition) -> int:
+    return sum(
+        len(edge_list)
+        for node in part.nodes.values()
+        for edge_list in node.edge_map.values()
+    )
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_scan_projection (nested):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/tiny.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(load_path, batch_size=4, nested=nested)
+
+        assert Partition.load_dataset([ load_path ], part_id=0) == part
+
+        # only the topology, with defaults for the other columns
+        batches: list = list(Partition.iter_batch_dataset([ load_path ], scan=ScanOptions(columns=[])))
+        assert all(batch.schema.equals(NOCK_SCHEMA) for _, batch in batches)
+
+        topo: Partition = Partition.load_dataset([ load_path ], scan=ScanOptions(columns=[ "labels" ]), part_id=0)
+
+        assert topo.node_names == part.node_names
+        assert count_edges(topo) == count_edges(part)
+        assert all(node.prop_map == {} for node in topo.nodes.values())
+        assert topo.nodes[0].label_set == part.nodes[0].label_set
+
+    with pytest.raises(ValueError, match="unknown columns"):
+        ScanOptions(columns=[ "nope" ]).read_columns()
+
+
+def test_scan_filters ():
+    load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath("dat/recipes.parq")
+    table = pq.read_table(load_path.as_posix())
+
+    # edge predicates keep all of the node rows
+    part: Partition = Partition.load_dataset(
+        [ load_path ],
+        scan = ScanOptions(relations={ "nope" }),
+    )
+
+    assert count_edges(part) == 0
+    assert len(part.node_names) == sum(1 for edge_id in table["edge_id"].to_pylist() if edge_id < 0)
+
+    part = Partition.load_dataset(
+        [ load_path ],
+        scan = ScanOptions(relations={ "wtm:uses_ingredient" }, min_truth=0.5),
+    )
+
+    assert count_edges(part) == sum(1 for edge_id in table["edge_id"].to_pylist() if edge_id >= 0)
+
+    # node predicates select whole nodes, along with their edges
+    part = Partition.load_dataset(
+        [ load_path ],
+        scan = ScanOptions(name_prefix="ingredient", is_rdf=True),
+    )
+
+    assert len(part.node_names) > 0
+    assert all(name.startswith("ingredient") for name in part.node_names)
+    assert count_edges(part) == 0
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Shadow nodes
+
+  * collect the shadow references while parsing rows
+  * resolve them across partitions, in batches, with caching
+"""
+
+import asyncio
+
+import pyarrow as pa  # type: ignore
+import pytest
+
+from pynock import LocalRegistry, NOCK_SCHEMA, Node, Partition, ShadowBackend, ShadowResolver
+
+
+def node_row (name, shadow = -1):
+    return {
+        "src_name": name,
+        "edge_id": -1,
+        "rel_name": None,
+        "dst_name": None,
+        "truth": 1.0,
+        "shadow": shadow,
+        "is_rdf": False,
+        "labels": "",
+        "props": "",
+    }
+
+
+def edge_row (name, dst_name):
+    return {
+        "src_name": name,
+        "edge_id": 0,
+        "rel_name": "link",
+        "dst_name": dst_name,
+        "truth": 1.0,
+        "shadow": -1,
+        "is_rdf": False,
+        "labels": None,
+        "props": "",
+    }
+
+
+def make_partitions ():
+    # partition 0 links its local nodes to shadows of the nodes local
+    # to partition 1
+    rows_0 = [
+        node_row("a"),
+        edge_row("a", "x"),
+        edge_row("a", "y"),
+        node_row("x", 1),
+        node_row("y", 1),
+        node_row("z", 1),
+    ]
+
+    rows_1 = [
+        node_row("x"),
+        node_row("y"),
+    ]
+
+    part_0 = Partition(part_id = 0)
+    part_0.parse_rows(enumerate(rows_0))
+
+    part_1 = Partition(part_id = 1)
+    part_1.parse_rows(enumerate(rows_1))
+
+    return part_0, part_1, rows_0
+
+
+def test_shadow_refs ():
+    part_0, part_1, rows_0 = make_partitions()
+
+    assert part_0.shadow_refs == { "x": 1, "y": 1, "z": 1 }
+    assert part_1.shadow_refs == {}
+
+    # the bulk builder collects the same references
+    table = pa.Table.from_pylist(rows_0, schema=NOCK_SCHEMA)
+    assert Partition.from_arrow(table, part_id=0) == part_0
+
+
+class CountingBackend (ShadowBackend):
+    def __init__ (self, partitions):
+        self.registry = LocalRegistry(partitions)
+        self.calls = []
+
+    async def lookup_nodes (self, part_id, node_names):
+        self.calls.append(( part_id, list(node_names) ))
+        await asyncio.sleep(0)
+        return await self.registry.lookup_nodes(part_id, node_names)
+
+
+def test_shadow_resolve ():
+    part_0, part_1, _ = make_partitions()
+    backend = CountingBackend({ 0: part_0, 1: part_1 })
+    resolver = ShadowResolver(backend, batch_size=2)
+
+    resolved = resolver.resolve_partition(part_0)
+
+    assert resolved["x"] is part_1.lookup_node("x")
+    assert resolved["y"] is part_1.lookup_node("y")
+    assert resolved["z"] is None
+    assert sorted(len(names) for _, names in backend.calls) == [ 1, 2 ]
+
+    # repeated references get served from the cache
+    assert resolver.resolve_partition(part_0) == resolved
+    assert resolver.num_lookups == 3
+    assert len(backend.calls) == 2
+
+
+def test_shadow_resolve_concurrent ():
+    part_0, part_1, _ = make_partitions()
+    backend = CountingBackend({ 1: part_1 })
+    resolver = ShadowResolver(backend)
+
+    async def resolve_twice ():
+        return await asyncio.gather(
+            resolver.resolve_refs(part_0.shadow_refs),
+            resolver.resolve_refs({ "x": 1 }),
+        )
+
+    first, second = asyncio.run(resolve_twice())
+
+    assert second["x"] is first["x"]
+    assert isinstance(first["x"], Node)
+    assert resolver.num_lookups == 3
+
+
+def test_shadow_backend_abstract ():
+    class IncompleteBackend (ShadowBackend):  # pylint: disable=R0903
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()  # pylint: disable=E0110
+
+
+def test_shadow_resolve_running_loop ():
+    part_0, part_1, _ = make_partitions()
+    resolver = ShadowResolver(LocalRegistry({ 1: part_1 }))
+
+    # e.g., within a notebook, which already runs an event loop
+    async def resolve_in_loop ():
+        return resolver.resolve_partition(part_0)
+
+    resolved = asyncio.run(resolve_in_loop())
+    assert resolved["x"] is part_1.lookup_node("x")
+    assert resolved["z"] is None
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Sidecar index files for Parquet partitions
+
+  * write the index alongside the Parquet file, sorted by node name
+  * open a view from the index, with the node ids and relations of the saved partition
+  * invalidate the index when the Parquet file gets rewritten
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import Partition, PartitionView, index_path, read_index
+
+
+@pytest.mark.parametrize("nested", [ False, True ])
+def test_sidecar_index (nested):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(load_path, batch_size=7, nested=nested, index=True)
+        assert index_path(load_path).exists()
+
+        sidecar = read_index(load_path)
+        assert sidecar is not None
+
+        table, edge_rels = sidecar
+        assert table.num_rows == len(part.nodes)
+        assert table["name"].to_pylist() == sorted(part.node_names)
+        assert edge_rels == part.edge_rels
+
+        view: PartitionView = PartitionView(load_path, part_id=0)
+        assert view.indexed
+        assert view.node_names == part.node_names
+        assert view.edge_rels == part.edge_rels
+
+        for node in part.nodes.values():
+            assert view.lookup_node(node.name) == node
+
+        # a view which ignores the index assigns its own node ids
+        assert not PartitionView(load_path, part_id=0, index=False).indexed
+
+
+def test_sidecar_stale ():
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(load_path, batch_size=7, index=True)
+        assert read_index(load_path) is not None
+
+        # rewriting the Parquet file without its index makes it stale
+        part.save_file_parquet(load_path, batch_size=11)
+        assert index_path(load_path).exists()
+        assert read_index(load_path) is None
+
+        view: PartitionView = PartitionView(load_path, part_id=0)
+        assert not view.indexed
+        assert view.num_nodes == len(part.nodes)
+
+        for node in part.nodes.values():
+            view_node = view.lookup_node(node.name)
+            assert view_node is not None
+            assert view_node.prop_map == node.prop_map
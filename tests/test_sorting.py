@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Sorted output
+
+  * sort the generated rows on node name ranks
+  * external merge sort of a Parquet file, spilling sorted runs
+  * the local node row sorts after its shadow rows, across runs
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import CompactPartition, NOCK_SCHEMA, Partition, sort_file_parquet, sort_key
+
+
+@pytest.mark.parametrize("part_class", [ Partition, CompactPartition ])
+def test_gen_rows_sorted (part_class):
+    part: Partition = part_class.from_arrow(pq.read_table("dat/recipes.parq"))
+    rows: list = list(part.iter_gen_rows(sort=True))
+
+    # the previous sort order, looking up the dst name per edge
+    node_names: list = [ row["src_name"] for row in rows if row["edge_id"] < 0 ]
+    assert node_names == sorted(part.node_names)
+
+    for i, row in enumerate(rows[1:], start=1):
+        prev: dict = rows[i - 1]
+
+        if row["edge_id"] > 0 and row["rel_name"] == prev["rel_name"]:
+            assert prev["dst_name"] <= row["dst_name"]
+
+    assert rows == list(Partition.from_arrow(pq.read_table("dat/recipes.parq")).iter_gen_rows(sort=True))
+
+
+def test_sort_file_parquet ():
+    load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath("dat/recipes.parq")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_mem: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "mem.parq"
+        save_ext: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "ext.parq"
+
+        assert sort_file_parquet([ load_path ], save_mem) == 1
+
+        # spill runs which split the node groups
+        assert sort_file_parquet([ load_path ], save_ext, run_size=50, batch_size=16) > 1
+
+        table = pq.read_table(save_ext.as_posix())
+        rows: list = table.to_pylist()
+
+        assert table.schema.equals(NOCK_SCHEMA)
+        assert table.to_pylist() == pq.read_table(save_mem.as_posix()).to_pylist()
+        assert rows == sorted(rows, key=sort_key)
+
+        # edge ids get renumbered within each node group
+        edge_id: int = -1
+
+        for row in rows:
+            edge_id = -1 if row["edge_id"] < 0 else edge_id + 1
+            assert row["edge_id"] == edge_id
+
+        # the sorted file loads as the same graph
+        part: Partition = Partition.from_arrow(pq.read_table(load_path.as_posix()))
+        assert Partition.from_arrow(table).to_arrow(sort=True).equals(part.to_arrow(sort=True))
+
+
+@pytest.mark.parametrize("local_first", [ True, False ])
+def test_sort_shadow_runs (local_first):
+    def _node_row (name: str, shadow: int) -> dict:
+        return {
+            "src_name": name, "edge_id": -1, "rel_name": None, "dst_name": None,
+            "truth": 1.0, "shadow": shadow, "is_rdf": False, "labels": "", "props": "",
+        }
+
+    local_row: dict = _node_row("x", -1)
+    shadow_row: dict = _node_row("x", 2)
+    fillers: list = [ _node_row(name, -1) for name in [ "a", "b", "c" ] ]
+
+    # the local and shadow node rows land in different runs
+    rows: list = [ local_row ] + fillers + [ shadow_row ]
+
+    if not local_first:
+        rows.reverse()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "input.parq"
+        save_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "sorted.parq"
+        pq.write_table(pa.Table.from_pylist(rows, schema=NOCK_SCHEMA), load_path.as_posix())
+
+        assert sort_file_parquet([ load_path ], save_path, run_size=2, batch_size=2) > 1
+
+        table: pa.Table = pq.read_table(save_path.as_posix())
+        assert table.filter(pc.equal(table["src_name"], "x"))["shadow"].to_pylist() == [ 2, -1 ]
+
+        # so the local node row wins on load
+        assert Partition.from_arrow(table).lookup_node("x").shadow == -1
+
+        part: Partition = Partition(part_id = 0)
+        part.parse_batches(enumerate(table.to_batches()))
+        assert part.lookup_node("x").shadow == -1
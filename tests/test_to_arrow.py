@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Partition => Arrow, pandas
+
+  * build an Arrow table from the partition internals
+  * compare with the generated rows, sorted or not
+  * convert to a DataFrame with nullable dtypes
+"""
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import CompactPartition, NOCK_SCHEMA, Partition
+
+
+@pytest.mark.parametrize("part_class", [ Partition, CompactPartition ])
+@pytest.mark.parametrize("sort", [ False, True ])
+def test_to_arrow (part_class, sort):
+    for load_parq in [ "dat/tiny.parq", "dat/recipes.parq" ]:
+        part: Partition = part_class.from_arrow(pq.read_table(load_parq))
+        table: pa.Table = part.to_arrow(sort=sort)
+
+        assert table.schema.equals(NOCK_SCHEMA)
+
+        exp_table: pa.Table = pa.Table.from_pylist(
+            list(part.iter_gen_rows(sort=sort)),
+            schema = NOCK_SCHEMA,
+        )
+
+        assert table.to_pylist() == exp_table.to_pylist()
+
+    assert part_class(part_id = 0).to_arrow().num_rows == 0
+
+
+def test_to_df ():
+    part: Partition = Partition.from_arrow(pq.read_table("dat/tiny.parq"))
+    df: pd.DataFrame = part.to_df(sort=True)
+
+    assert list(df.columns) == NOCK_SCHEMA.names
+    assert df["edge_id"].dtype == pd.Int32Dtype()
+    assert df["is_rdf"].dtype == pd.BooleanDtype()
+    assert df["rel_name"].isna().sum() == len(part.node_names)
+    assert df["src_name"].tolist() == sorted(df["src_name"].tolist())
+
+    df_arrow: pd.DataFrame = part.to_df(types_mapper=pd.ArrowDtype)
+    assert isinstance(df_arrow["truth"].dtype, pd.ArrowDtype)
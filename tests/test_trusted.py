@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Trusted input
+
+  * construct nodes and edges without pydantic validation
+  * compare with the validated partition, for each load path
+"""
+
+import pyarrow.parquet as pq  # type: ignore
+
+from pynock import Edge, Node, Partition
+
+
+def same_graph (part_a: Partition, part_b: Partition) -> bool:
+    return part_a.model_dump(exclude={"trusted"}) == part_b.model_dump(exclude={"trusted"})
+
+
+def test_trusted_from_arrow ():
+    for load_parq in [ "dat/tiny.parq", "dat/recipes.parq" ]:
+        table = pq.read_table(load_parq)
+        part: Partition = Partition.from_arrow(table, part_id=0)
+        part_fast: Partition = Partition.from_arrow(table, part_id=0, trusted=True)
+
+        assert part_fast.trusted
+        assert same_graph(part_fast, part)
+        assert list(part_fast.iter_gen_rows(sort=True)) == list(part.iter_gen_rows(sort=True))
+
+        node: Node = part_fast.nodes[0]
+        assert isinstance(node, Node)
+        assert node == part.nodes[0]
+        assert all(isinstance(edge, Edge) for edge_list in node.edge_map.values() for edge in edge_list)
+
+
+def test_trusted_parse_batches ():
+    parq_file: pq.ParquetFile = pq.ParquetFile("dat/recipes.parq")
+
+    part: Partition = Partition(part_id = 0)
+    part.parse_batches(part.iter_batch_parquet(parq_file))
+
+    part_fast: Partition = Partition(part_id = 0, trusted = True)
+    part_fast.parse_batches(part_fast.iter_batch_parquet(parq_file))
+
+    assert same_graph(part_fast, part)
+
+    # the trusted nodes still support assignment
+    node: Node = part_fast.find_or_create_node("new node")
+    node.truth = 0.5
+
+    assert part_fast.lookup_node("new node").truth == 0.5
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Round trips of `truth` values through the `float32` Parquet column
+
+  * load values which are not exact in binary, e.g., `0.9`, as written
+  * write these unchanged into CSV output
+"""
+
+import tempfile
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+
+from pynock import CompactPartition, Partition, PartitionView
+
+
+def _build () -> Partition:
+    part: Partition = Partition(part_id = 0)
+
+    src = part.find_or_create_node("src")
+    src.truth = 0.9
+
+    dst = part.find_or_create_node("dst")
+    dst.truth = 0.3
+
+    edge = part.create_edge(src, "rel", dst)
+    edge.truth = 0.7
+
+    return part
+
+
+def test_truth_round_trip ():
+    part: Partition = _build()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+        part.save_file_parquet(load_path)
+
+        part_rows: Partition = Partition(part_id = 0)
+        part_rows.parse_rows(part_rows.iter_load_parquet(pq.ParquetFile(load_path.as_posix())))
+
+        part_batches: Partition = Partition(part_id = 0)
+        part_batches.parse_batches(part_batches.iter_batch_parquet(pq.ParquetFile(load_path.as_posix())))
+
+        loaded = [
+            part_rows,
+            part_batches,
+            Partition.load_file_parquet(load_path, part_id = 0),
+            CompactPartition.from_arrow(pq.read_table(load_path.as_posix()), part_id = 0),
+        ]
+
+        for load_part in loaded:
+            assert load_part.lookup_node("src").truth == 0.9
+
+            edges = [ edge for edge_list in load_part.lookup_node("src").edge_map.values() for edge in edge_list ]
+            assert [ edge.truth for edge in edges ] == [ 0.7 ]
+
+            save_csv: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.csv"
+            load_part.save_file_csv(save_csv, sort = True)
+            csv_text: str = save_csv.read_text()
+
+            assert "0.9," in csv_text
+            assert "0.7," in csv_text
+            assert "0.89999" not in csv_text and "0.69999" not in csv_text
+
+        assert PartitionView(load_path, index = False).lookup_node("src").truth == 0.9
+        assert part_batches.to_df()["truth"].tolist()[:1] == [ 0.9 ]
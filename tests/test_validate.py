@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Validation report
+
+  * vectorized checks over record batches, collecting errors
+  * skip the bad rows while parsing, rather than exiting
+  * stop once the errors exceed the error budget
+  * report the CSV rows which fail to convert, through either engine and the CLI
+  * the same range checks on truth and shadow, whether parsing rows or batches
+"""
+
+import tempfile
+import typing
+
+from typer.testing import CliRunner
+import cloudpathlib
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from cli import APP
+from pynock import Partition, ValidationReport
+
+
+def bad_table () -> pa.Table:
+    table: pa.Table = pq.read_table("dat/tiny.parq")
+    rows: list = table.to_pylist()
+
+    rows[2]["truth"] = 1.5
+    rows[4]["dst_name"] = None
+    rows[3]["src_name"] = "elsewhere"
+
+    return pa.Table.from_pylist(rows, schema=table.schema)
+
+
+def test_validate_batches ():
+    table: pa.Table = pq.read_table("dat/recipes.parq")
+    report: ValidationReport = Partition.validate_batches(enumerate(table.to_batches()))
+
+    assert report.num_rows == table.num_rows
+    assert report.num_errors == 0
+
+    # the sequencing carries across batches
+    table = bad_table()
+
+    report = Partition.validate_batches(
+        ( row_num, batch )
+        for row_num, batch in zip(range(0, table.num_rows, 3), table.to_batches(max_chunksize=3))
+    )
+
+    assert [ ( issue.row_num, issue.column, issue.reason ) for issue in report.issues ] == [
+        ( 2, "truth", "truth out of range [0.0, 1.0]" ),
+        ( 3, "src_name", "out of sequence" ),
+        ( 4, "dst_name", "node name cannot be null" ),
+    ]
+
+
+def test_parse_batches_report ():
+    table: pa.Table = bad_table()
+    part: Partition = Partition(part_id = 0)
+
+    report = part.parse_batches(
+        enumerate(table.to_batches()),
+        report = ValidationReport(),
+    )
+
+    assert report is not None
+    assert report.summary() == {
+        "truth out of range [0.0, 1.0]": 1,
+        "node name cannot be null": 1,
+        "out of sequence": 1,
+    }
+
+    # only the edges from the good rows got added
+    recipe = part.lookup_node("https://www.food.com/recipe/327593")
+    assert sum(len(edge_list) for edge_list in recipe.edge_map.values()) == 1
+
+    # stop once the errors exceed the budget
+    report = Partition(part_id = 0).parse_batches(
+        enumerate(table.to_batches()),
+        report = ValidationReport(error_budget = 1),
+    )
+
+    assert report.over_budget
+
+
+def test_parse_rows_report ():
+    rows: list = bad_table().to_pylist()
+    rows[0]["src_name"] = ""
+
+    # without the node row, its edge rows are out of sequence, while
+    # the range checks run first, as for batches
+
+    part: Partition = Partition(part_id = 0)
+    report = part.parse_rows(enumerate(rows), report=ValidationReport())
+
+    assert report.issues[0].row_num == 0
+    assert [ ( issue.row_num, issue.column, issue.reason ) for issue in report.issues[1:] ] == [
+        ( 1, "src_name", "out of sequence" ),
+        ( 2, "truth", "truth out of range [0.0, 1.0]" ),
+        ( 3, "src_name", "out of sequence" ),
+        ( 4, "src_name", "out of sequence" ),
+    ]
+
+
+def bad_csv (
+    tmp_csv: typing.IO,
+    ) -> int:
+    """
+Write a copy of `dat/tiny.csv` with a non-numeric `truth` cell in row 2
+and a missing column in row 5, returning the number of data rows.
+    """
+    lines: list = cloudpathlib.AnyPath("dat/tiny.csv").read_text().strip().split("\n")
+    lines[3] = lines[3].replace("1.0", "high", 1)
+    lines[6] = lines[6].rsplit(",", 1)[0]
+    tmp_csv.write("\n".join(lines) + "\n")
+    tmp_csv.flush()
+
+    return len(lines) - 1
+
+
+@pytest.mark.parametrize("engine", [ "python", "arrow" ])
+def test_csv_report (engine):
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+        num_rows: int = bad_csv(tmp_csv)
+
+        part: Partition = Partition(part_id = 0)
+        report: ValidationReport = ValidationReport()
+
+        part.parse_rows(
+            part.iter_load_csv(cloudpathlib.AnyPath(tmp_csv.name), engine=engine, report=report),
+            report = report,
+        )
+
+        assert [ issue.row_num for issue in report.issues ][:2] == [ 2, 5 ]
+        assert report.num_rows == num_rows
+        assert len(part.node_names) > 0
+
+
+def test_csv_validate_cli ():
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+        num_rows: int = bad_csv(tmp_csv)
+        result = CliRunner().invoke(APP, [ "validate", "--file", tmp_csv.name ])
+
+        assert result.exit_code == 1
+        assert result.exception is None or isinstance(result.exception, SystemExit)
+        assert "row 2 truth: cannot convert to double" in result.output
+        assert "row 5 None: expected 9 columns, found 8" in result.output
+        assert f"{ num_rows } rows" in result.output
+
+
+@pytest.mark.parametrize("engine", [ "python", "arrow" ])
+def test_csv_ranges (engine):
+    lines: list = cloudpathlib.AnyPath("dat/tiny.csv").read_text().strip().split("\n")
+    lines[2] = lines[2].replace(",1.0,", ",2.5,")
+    lines[3] = lines[3].replace(",-1,True,", ",-7,True,")
+    lines[7] = lines[7].replace(",1.0,", ",-0.5,")
+
+    expected: list = [
+        ( 1, "truth", "truth out of range [0.0, 1.0]" ),
+        ( 2, "shadow", "shadow out of range" ),
+        ( 6, "truth", "truth out of range [0.0, 1.0]" ),
+    ]
+
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+        tmp_csv.write("\n".join(lines) + "\n")
+        tmp_csv.flush()
+        csv_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_csv.name)
+
+        part_rows: Partition = Partition(part_id = 0)
+        report_rows: ValidationReport = ValidationReport()
+
+        part_rows.parse_rows(
+            part_rows.iter_load_csv(csv_path, engine=engine, report=report_rows),
+            report = report_rows,
+        )
+
+        part_batches: Partition = Partition(part_id = 0)
+        report_batches: ValidationReport = ValidationReport()
+
+        part_batches.parse_batches(
+            part_batches.iter_batch_csv(csv_path, report=report_batches),
+            report = report_batches,
+        )
+
+    for report in [ report_rows, report_batches ]:
+        assert [ ( issue.row_num, issue.column, issue.reason ) for issue in report.issues ] == expected
+        assert report.num_rows == len(lines) - 1
+
+    assert part_rows == part_batches
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit test coverage:
+
+Read-only partition views over memory-mapped Parquet files
+
+  * index the node names without materializing the nodes
+  * materialize nodes and edges on demand, which match a full load
+  * node rows whose edge rows straddle row group boundaries
+  * cache the materialized nodes
+"""
+
+import tempfile
+import typing
+
+import cloudpathlib
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from pynock import Node, Partition, PartitionView
+
+
+def _edge_set (
+    node: Node,
+    edge_rels: typing.List[str],
+    names: typing.Callable[[int], str],
+    ) -> list:
+    return sorted(
+        ( edge_rels[rel], names(edge.node_id), edge.truth, repr(edge.prop_map) )
+        for rel, edges in node.edge_map.items()
+        for edge in edges
+    )
+
+
+@pytest.mark.parametrize("nested,props_map", [ ( False, False ), ( True, False ), ( False, True ), ( True, True ) ])
+def test_view_lookup (nested, props_map):
+    part: Partition = Partition.from_arrow(pq.read_table("dat/recipes.parq"), part_id=0)
+    part_names: typing.Dict[int, str] = { node.node_id: node.name for node in part.nodes.values() }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_path: cloudpathlib.AnyPath = cloudpathlib.AnyPath(tmp_dir) / "part.parq"
+
+        # small row groups, which split the edge rows of some nodes
+        part.save_file_parquet(load_path, batch_size=7, nested=nested, props_map=props_map)
+
+        view: PartitionView = PartitionView(load_path, part_id=0, cache_size=16)
+        assert view.num_nodes == len(part.nodes)
+        assert view.cache_info().currsize == 0
+
+        for node in part.nodes.values():
+            view_node: typing.Optional[Node] = view.lookup_node(node.name)
+            assert view_node is not None
+
+            assert view_node.name == node.name
+            assert view.names[view_node.node_id] == node.name
+            assert view_node.shadow == node.shadow
+            assert view_node.is_rdf == node.is_rdf
+            assert view_node.label_set == node.label_set
+            assert view_node.truth == node.truth
+            assert view_node.prop_map == node.prop_map
+
+            assert _edge_set(view_node, view.edge_rels, view.names.__getitem__) \
+                == _edge_set(node, part.edge_rels, part_names.__getitem__)
+
+        assert view.lookup_node("no such node") is None
+        assert view.get_node(-1) is None
+
+        # repeat lookups get served from the cache
+        name: str = next(iter(part.nodes.values())).name
+        assert view.lookup_node(name) is view.lookup_node(name)
+        assert view.cache_info().hits > 0
+        assert view.cache_info().currsize == 16